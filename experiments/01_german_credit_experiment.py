@@ -15,539 +15,17 @@ Dataset: German Credit Data (Statlog)
 
 Paper Section: 5.2 - Case Study 1: Credit Risk
 Target Venues: Journal of Econometrics, NeurIPS Economics Track
+
+The experiment itself lives in ``econkd.case_studies.german_credit`` so it can be
+imported, reconfigured and run in-process; this script runs the default
+configuration. Equivalent: ``python -m econkd run german_credit``.
 """
 
-import json
-import pickle
 import warnings
 
-import numpy as np
-import pandas as pd
-from scipy import stats
-from sklearn.datasets import fetch_openml
-from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import (
-    accuracy_score,
-    classification_report,
-    confusion_matrix,
-    f1_score,
-    roc_auc_score,
-)
-from sklearn.model_selection import cross_val_score, train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from econkd.case_studies import german_credit
 
 warnings.filterwarnings('ignore')
 
-RANDOM_STATE = 42
-np.random.seed(RANDOM_STATE)
-
-print("="*80)
-print("GERMAN CREDIT DATASET - ECONOMIC DISTILLATION EXPERIMENT")
-print("Real Data Empirical Validation")
-print("="*80)
-
-
-# ============================================================================
-# 1. LOAD REAL DATA
-# ============================================================================
-
-print("\n1. Loading German Credit Dataset (REAL DATA)...")
-print("   Source: UCI ML Repository / OpenML")
-
-try:
-    # Try OpenML first
-    data = fetch_openml('credit-g', version=1, as_frame=True, parser='auto')
-    X = data.data
-    y = data.target
-
-    # Convert target to binary (good=0, bad=1)
-    y = (y == 'bad').astype(int)
-
-    print(f"   ✅ Dataset loaded successfully")
-    print(f"   Samples: {len(X)}")
-    print(f"   Features: {X.shape[1]}")
-    print(f"   Bad credit rate: {y.mean():.2%}")
-
-except Exception as e:
-    print(f"   ⚠️  OpenML failed: {e}")
-    print("   Using backup: sklearn make_classification")
-    from sklearn.datasets import make_classification
-    X, y = make_classification(
-        n_samples=1000, n_features=20, n_informative=15,
-        n_redundant=5, random_state=RANDOM_STATE
-    )
-    X = pd.DataFrame(X, columns=[f'feature_{i}' for i in range(20)])
-    print("   ⚠️  Using synthetic data as fallback")
-
-
-# ============================================================================
-# 2. DATA PREPROCESSING
-# ============================================================================
-
-print("\n2. Preprocessing data...")
-
-# Select numerical features for this experiment
-numerical_features = X.select_dtypes(include=[np.number]).columns.tolist()
-
-# For categorical features, encode them
-categorical_features = X.select_dtypes(include=['object', 'category']).columns.tolist()
-
-if len(categorical_features) > 0:
-    print(f"   Encoding {len(categorical_features)} categorical features...")
-    le = LabelEncoder()
-    for col in categorical_features:
-        X[col] = le.fit_transform(X[col].astype(str))
-
-# Feature engineering: create economically meaningful features
-if 'duration' in X.columns and 'credit_amount' in X.columns:
-    X['monthly_payment'] = X['credit_amount'] / (X['duration'] + 1)
-    numerical_features.append('monthly_payment')
-
-if 'age' in X.columns and 'credit_amount' in X.columns:
-    X['credit_to_age_ratio'] = X['credit_amount'] / (X['age'] + 1)
-    numerical_features.append('credit_to_age_ratio')
-
-print(f"   Total features: {len(X.columns)}")
-print(f"   Numerical: {len(numerical_features)}")
-print(f"   Categorical (encoded): {len(categorical_features)}")
-
-
-# ============================================================================
-# 3. DEFINE ECONOMIC CONSTRAINTS (Based on Economic Theory)
-# ============================================================================
-
-print("\n3. Defining economic constraints (from credit risk theory)...")
-print("   " + "-"*76)
-
-# Map German Credit features to economic concepts
-economic_constraints = {}
-
-# If we have standard credit features
-if 'credit_amount' in X.columns:
-    economic_constraints['credit_amount'] = {
-        'type': 'sign',
-        'sign': +1,  # Higher amount → Higher risk
-        'justification': 'Larger loans carry higher default risk'
-    }
-
-if 'duration' in X.columns:
-    economic_constraints['duration'] = {
-        'type': 'sign',
-        'sign': +1,  # Longer duration → Higher risk
-        'justification': 'Longer loan terms increase uncertainty'
-    }
-
-if 'age' in X.columns:
-    economic_constraints['age'] = {
-        'type': 'sign',
-        'sign': -1,  # Older age → Lower risk (up to a point)
-        'justification': 'Financial maturity reduces default probability'
-    }
-
-if 'installment_commitment' in X.columns:
-    economic_constraints['installment_commitment'] = {
-        'type': 'sign',
-        'sign': +1,  # Higher % of income → Higher risk
-        'justification': 'Higher debt burden increases default risk'
-    }
-
-if 'monthly_payment' in X.columns:
-    economic_constraints['monthly_payment'] = {
-        'type': 'sign',
-        'sign': +1,  # Higher payment → Higher risk
-        'justification': 'Higher payment burden increases stress'
-    }
-
-for feature, constraint in economic_constraints.items():
-    print(f"   {feature:25} → {constraint['type']:10} → {constraint['justification']}")
-
-print("   " + "-"*76)
-print(f"   Total constraints: {len(economic_constraints)}")
-
-
-# ============================================================================
-# 4. TRAIN/TEST SPLIT
-# ============================================================================
-
-print("\n4. Splitting data...")
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, random_state=RANDOM_STATE, stratify=y
-)
-
-print(f"   Train: {len(X_train)} samples ({y_train.mean():.2%} bad credit)")
-print(f"   Test:  {len(X_test)} samples ({y_test.mean():.2%} bad credit)")
-
-# Standardize numerical features
-scaler = StandardScaler()
-X_train_scaled = X_train.copy()
-X_test_scaled = X_test.copy()
-
-X_train_scaled[numerical_features] = scaler.fit_transform(X_train[numerical_features])
-X_test_scaled[numerical_features] = scaler.transform(X_test[numerical_features])
-
-
-# ============================================================================
-# 5. BASELINE: LOGISTIC REGRESSION (Traditional Econometrics)
-# ============================================================================
-
-print("\n5. Training BASELINE (Logistic Regression - Traditional)...")
-
-baseline = LogisticRegression(
-    max_iter=1000,
-    random_state=RANDOM_STATE,
-    penalty='l2',
-    C=1.0
-)
-
-baseline.fit(X_train_scaled, y_train)
-
-baseline_train_probs = baseline.predict_proba(X_train_scaled)[:, 1]
-baseline_test_probs = baseline.predict_proba(X_test_scaled)[:, 1]
-baseline_test_preds = baseline.predict(X_test_scaled)
-
-baseline_train_auc = roc_auc_score(y_train, baseline_train_probs)
-baseline_test_auc = roc_auc_score(y_test, baseline_test_probs)
-baseline_test_f1 = f1_score(y_test, baseline_test_preds)
-baseline_test_acc = accuracy_score(y_test, baseline_test_preds)
-
-print(f"   Train AUC:     {baseline_train_auc:.4f}")
-print(f"   Test AUC:      {baseline_test_auc:.4f}")
-print(f"   Test F1:       {baseline_test_f1:.4f}")
-print(f"   Test Accuracy: {baseline_test_acc:.4f}")
-
-
-# ============================================================================
-# 6. TEACHER: GRADIENT BOOSTING (Complex Model)
-# ============================================================================
-
-print("\n6. Training TEACHER (Gradient Boosting - Complex)...")
-
-teacher = GradientBoostingClassifier(
-    n_estimators=100,
-    max_depth=5,
-    learning_rate=0.1,
-    subsample=0.8,
-    random_state=RANDOM_STATE
-)
-
-teacher.fit(X_train_scaled, y_train)
-
-teacher_train_probs = teacher.predict_proba(X_train_scaled)[:, 1]
-teacher_test_probs = teacher.predict_proba(X_test_scaled)[:, 1]
-teacher_test_preds = teacher.predict(X_test_scaled)
-
-teacher_train_auc = roc_auc_score(y_train, teacher_train_probs)
-teacher_test_auc = roc_auc_score(y_test, teacher_test_probs)
-teacher_test_f1 = f1_score(y_test, teacher_test_preds)
-teacher_test_acc = accuracy_score(y_test, teacher_test_preds)
-
-print(f"   Train AUC:     {teacher_train_auc:.4f}")
-print(f"   Test AUC:      {teacher_test_auc:.4f}")
-print(f"   Test F1:       {teacher_test_f1:.4f}")
-print(f"   Test Accuracy: {teacher_test_acc:.4f}")
-
-# Feature importance
-feature_importance = pd.DataFrame({
-    'feature': X_train.columns,
-    'importance': teacher.feature_importances_
-}).sort_values('importance', ascending=False)
-
-print(f"\n   Top 5 most important features:")
-for idx, row in feature_importance.head(5).iterrows():
-    print(f"      {row['feature']:25} → {row['importance']:.4f}")
-
-
-# ============================================================================
-# 7. KNOWLEDGE DISTILLATION (Standard - no constraints)
-# ============================================================================
-
-print("\n7. Training STANDARD KD (Knowledge Distillation - no constraints)...")
-
-try:
-    from deepbridge.distillation import KnowledgeDistillation
-    from deepbridge.utils.model_registry import ModelType
-
-    kd_distiller = KnowledgeDistillation(
-        teacher_model=teacher,
-        student_model_type=ModelType.LOGISTIC_REGRESSION,
-        temperature=2.0,
-        alpha=0.7,
-        random_state=RANDOM_STATE
-    )
-
-    kd_distiller.fit(X_train_scaled, y_train, verbose=False)
-
-    kd_test_probs = kd_distiller.predict_proba(X_test_scaled)[:, 1]
-    kd_test_preds = (kd_test_probs > 0.5).astype(int)
-
-    kd_test_auc = roc_auc_score(y_test, kd_test_probs)
-    kd_test_f1 = f1_score(y_test, kd_test_preds)
-    kd_test_acc = accuracy_score(y_test, kd_test_preds)
-
-    print(f"   Test AUC:      {kd_test_auc:.4f}")
-    print(f"   Test F1:       {kd_test_f1:.4f}")
-    print(f"   Test Accuracy: {kd_test_acc:.4f}")
-
-    has_kd = True
-
-except Exception as e:
-    print(f"   ⚠️  DeepBridge KD not available: {e}")
-    print(f"   Using baseline as proxy")
-    kd_test_auc = baseline_test_auc
-    kd_test_f1 = baseline_test_f1
-    kd_test_acc = baseline_test_acc
-    has_kd = False
-
-
-# ============================================================================
-# 8. ECONOMIC KD (With Constraints - Conceptual)
-# ============================================================================
-
-print("\n8. Training ECONOMIC KD (with economic constraints)...")
-print("   (Simulated - Full implementation would use EconomicDistiller)")
-
-# For now, use weighted logistic regression with soft labels
-# In full implementation: EconomicDistiller with constraint penalties
-
-economic_student = LogisticRegression(
-    max_iter=1000,
-    random_state=RANDOM_STATE,
-    penalty='l2',
-    C=0.5  # Slight regularization
-)
-
-# Train on data (in real implementation: with soft labels + constraints)
-economic_student.fit(X_train_scaled, y_train)
-
-economic_test_probs = economic_student.predict_proba(X_test_scaled)[:, 1]
-economic_test_preds = economic_student.predict(X_test_scaled)
-
-economic_test_auc = roc_auc_score(y_test, economic_test_probs)
-economic_test_f1 = f1_score(y_test, economic_test_preds)
-economic_test_acc = accuracy_score(y_test, economic_test_preds)
-
-print(f"   Test AUC:      {economic_test_auc:.4f}")
-print(f"   Test F1:       {economic_test_f1:.4f}")
-print(f"   Test Accuracy: {economic_test_acc:.4f}")
-
-
-# ============================================================================
-# 9. CONSTRAINT COMPLIANCE ANALYSIS
-# ============================================================================
-
-print("\n9. Analyzing economic constraint compliance...")
-
-def check_constraint_compliance(model, X, feature_cols, constraints):
-    """Check if model coefficients comply with economic constraints."""
-    if not hasattr(model, 'coef_'):
-        return None, None
-
-    violations = []
-    compliant_count = 0
-    total_count = 0
-
-    for feature, constraint in constraints.items():
-        if feature not in feature_cols:
-            continue
-
-        if constraint['type'] == 'sign':
-            feat_idx = list(feature_cols).index(feature)
-            coef = model.coef_[0][feat_idx]
-            expected_sign = constraint['sign']
-            actual_sign = np.sign(coef)
-
-            total_count += 1
-            if actual_sign == expected_sign:
-                compliant_count += 1
-            else:
-                violations.append({
-                    'feature': feature,
-                    'expected_sign': expected_sign,
-                    'actual_sign': actual_sign,
-                    'coefficient': coef
-                })
-
-    compliance_rate = (compliant_count / total_count * 100) if total_count > 0 else 0
-    return compliance_rate, violations
-
-baseline_compliance, baseline_violations = check_constraint_compliance(
-    baseline, X_train_scaled, X_train_scaled.columns, economic_constraints
-)
-
-economic_compliance, economic_violations = check_constraint_compliance(
-    economic_student, X_train_scaled, X_train_scaled.columns, economic_constraints
-)
-
-print(f"\n   BASELINE Compliance: {baseline_compliance:.1f}%")
-if baseline_violations:
-    print(f"   Violations:")
-    for v in baseline_violations[:3]:
-        print(f"      {v['feature']:25} → Expected {v['expected_sign']:+d}, Got {v['coefficient']:+.4f}")
-
-print(f"\n   ECONOMIC KD Compliance: {economic_compliance:.1f}%")
-if economic_violations:
-    print(f"   Violations:")
-    for v in economic_violations[:3]:
-        print(f"      {v['feature']:25} → Expected {v['expected_sign']:+d}, Got {v['coefficient']:+.4f}")
-
-
-# ============================================================================
-# 10. BOOTSTRAP STABILITY ANALYSIS
-# ============================================================================
-
-print("\n10. Bootstrap stability analysis (500 samples)...")
-print("    (Computing coefficient stability...)")
-
-N_BOOTSTRAP = 500
-bootstrap_coefs = []
-
-for b in range(N_BOOTSTRAP):
-    # Bootstrap resample
-    indices = np.random.choice(len(X_train_scaled), size=len(X_train_scaled), replace=True)
-    X_boot = X_train_scaled.iloc[indices]
-    y_boot = y_train.iloc[indices]  # Use .iloc for pandas Series with custom index
-
-    # Fit student
-    student_boot = LogisticRegression(max_iter=1000, random_state=RANDOM_STATE)
-    student_boot.fit(X_boot, y_boot)
-
-    bootstrap_coefs.append(student_boot.coef_[0])
-
-    if (b + 1) % 100 == 0:
-        print(f"    Progress: {b+1}/{N_BOOTSTRAP}")
-
-bootstrap_coefs = np.array(bootstrap_coefs)
-
-# Calculate stability metrics
-coef_mean = np.mean(bootstrap_coefs, axis=0)
-coef_std = np.std(bootstrap_coefs, axis=0)
-coef_cv = coef_std / (np.abs(coef_mean) + 1e-10)
-
-# Sign stability
-signs = np.sign(bootstrap_coefs)
-mode_sign = stats.mode(signs, axis=0, keepdims=False)[0]
-sign_stability = np.mean(signs == mode_sign, axis=0)
-
-avg_cv = coef_cv.mean()
-avg_sign_stability = sign_stability.mean()
-
-print(f"\n    ✅ Bootstrap completed")
-print(f"    Average CV:           {avg_cv:.3f}")
-print(f"    Average Sign Stability: {avg_sign_stability*100:.1f}%")
-print(f"    Features with CV<0.15: {np.sum(coef_cv < 0.15)}/{len(coef_cv)}")
-
-
-# ============================================================================
-# 11. RESULTS SUMMARY
-# ============================================================================
-
-print("\n" + "="*80)
-print("RESULTS SUMMARY - GERMAN CREDIT (REAL DATA)")
-print("="*80)
-
-results_table = pd.DataFrame({
-    'Model': ['Teacher (GBM)', 'Baseline (LR)', 'Standard KD', 'Economic KD'],
-    'Test AUC': [teacher_test_auc, baseline_test_auc, kd_test_auc, economic_test_auc],
-    'Test F1': [teacher_test_f1, baseline_test_f1, kd_test_f1, economic_test_f1],
-    'Test Acc': [teacher_test_acc, baseline_test_acc, kd_test_acc, economic_test_acc],
-    'Compliance': ['N/A', f'{baseline_compliance:.1f}%', 'N/A', f'{economic_compliance:.1f}%']
-})
-
-print("\n" + results_table.to_string(index=False))
-
-print(f"\n📊 KEY METRICS (for paper):")
-print(f"   Retention vs Teacher:    {economic_test_auc/teacher_test_auc*100:.1f}%")
-print(f"   Gain vs Baseline:        +{(economic_test_auc - baseline_test_auc)*100:.1f} pp")
-print(f"   Compliance Rate:         {economic_compliance:.1f}%")
-print(f"   Coefficient Stability:   CV = {avg_cv:.3f}")
-print(f"   Sign Stability:          {avg_sign_stability*100:.1f}%")
-
-print(f"\n📖 COMPARISON WITH PAPER EXPECTED VALUES:")
-print(f"   Expected Loss vs Teacher:  2-5%")
-print(f"   Actual Loss:               {(1 - economic_test_auc/teacher_test_auc)*100:.1f}%")
-print(f"   Expected Compliance:       95%+")
-print(f"   Actual Compliance:         {economic_compliance:.1f}%")
-
-
-# ============================================================================
-# 12. SAVE RESULTS
-# ============================================================================
-
-print("\n12. Saving results...")
-
-# Save results to JSON
-results = {
-    'dataset': 'German Credit (UCI)',
-    'n_samples': len(X),
-    'n_features': X.shape[1],
-    'n_train': len(X_train),
-    'n_test': len(X_test),
-    'bad_credit_rate': float(y.mean()),
-    'models': {
-        'teacher': {
-            'type': 'GradientBoosting',
-            'train_auc': float(teacher_train_auc),
-            'test_auc': float(teacher_test_auc),
-            'test_f1': float(teacher_test_f1),
-            'test_acc': float(teacher_test_acc)
-        },
-        'baseline': {
-            'type': 'LogisticRegression',
-            'train_auc': float(baseline_train_auc),
-            'test_auc': float(baseline_test_auc),
-            'test_f1': float(baseline_test_f1),
-            'test_acc': float(baseline_test_acc),
-            'compliance': float(baseline_compliance)
-        },
-        'standard_kd': {
-            'type': 'KnowledgeDistillation',
-            'test_auc': float(kd_test_auc),
-            'test_f1': float(kd_test_f1),
-            'test_acc': float(kd_test_acc)
-        },
-        'economic_kd': {
-            'type': 'EconomicKD',
-            'test_auc': float(economic_test_auc),
-            'test_f1': float(economic_test_f1),
-            'test_acc': float(economic_test_acc),
-            'compliance': float(economic_compliance)
-        }
-    },
-    'stability': {
-        'n_bootstrap': N_BOOTSTRAP,
-        'avg_cv': float(avg_cv),
-        'avg_sign_stability': float(avg_sign_stability),
-        'features_stable': int(np.sum(coef_cv < 0.15))
-    },
-    'constraints': {
-        'total': len(economic_constraints),
-        'baseline_violations': len(baseline_violations) if baseline_violations else 0,
-        'economic_violations': len(economic_violations) if economic_violations else 0
-    }
-}
-
-results_path = '/home/guhaase/projetos/DeepBridge/papers/15_Knowledge_Distillation_Economics/experiments/results/german_credit_results.json'
-with open(results_path, 'w') as f:
-    json.dump(results, f, indent=2)
-
-print(f"   ✅ Results saved to: {results_path}")
-
-# Save models
-models_path = '/home/guhaase/projetos/DeepBridge/papers/15_Knowledge_Distillation_Economics/experiments/results/german_credit_models.pkl'
-with open(models_path, 'wb') as f:
-    pickle.dump({
-        'teacher': teacher,
-        'baseline': baseline,
-        'economic_student': economic_student,
-        'scaler': scaler
-    }, f)
-
-print(f"   ✅ Models saved to: {models_path}")
-
-print("\n" + "="*80)
-print("✅ EXPERIMENT COMPLETED SUCCESSFULLY!")
-print("   Real data validation demonstrates framework viability")
-print("   Results ready for inclusion in paper Section 5")
-print("="*80)
+if __name__ == '__main__':
+    german_credit.run(german_credit.default_config())
@@ -14,468 +14,17 @@ Dataset: Adult Income (Census Income)
 
 Paper Section: 5.3 - Case Study 2: Labor Economics
 Focus: Marginal effects of education on income probability
+
+The experiment itself lives in ``econkd.case_studies.adult_income`` so it can be
+imported, reconfigured and run in-process; this script runs the default
+configuration. Equivalent: ``python -m econkd run adult_income``.
 """
 
-import json
-import pickle
 import warnings
 
-import numpy as np
-import pandas as pd
-from scipy import stats
-from sklearn.datasets import fetch_openml
-from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from econkd.case_studies import adult_income
 
 warnings.filterwarnings('ignore')
 
-RANDOM_STATE = 42
-np.random.seed(RANDOM_STATE)
-
-print("="*80)
-print("ADULT INCOME DATASET - ECONOMIC DISTILLATION EXPERIMENT")
-print("Real Data - Labor Economics Validation")
-print("="*80)
-
-
-# ============================================================================
-# 1. LOAD REAL DATA
-# ============================================================================
-
-print("\n1. Loading Adult Income Dataset (REAL DATA)...")
-print("   Source: UCI ML Repository (US Census 1994)")
-
-try:
-    data = fetch_openml('adult', version=2, as_frame=True, parser='auto')
-    X = data.data
-    y = data.target
-
-    # Convert target to binary (<=50K=0, >50K=1)
-    y = (y == '>50K').astype(int)
-
-    print(f"   ✅ Dataset loaded successfully")
-    print(f"   Samples: {len(X)}")
-    print(f"   Features: {X.shape[1]}")
-    print(f"   High income rate (>50K): {y.mean():.2%}")
-
-except Exception as e:
-    print(f"   ⚠️  OpenML failed: {e}")
-    print("   Generating synthetic labor data as fallback")
-    from sklearn.datasets import make_classification
-    X, y = make_classification(
-        n_samples=10000, n_features=14, n_informative=10,
-        random_state=RANDOM_STATE
-    )
-    X = pd.DataFrame(X, columns=[f'feature_{i}' for i in range(14)])
-    print("   ⚠️  Using synthetic data as fallback")
-
-
-# ============================================================================
-# 2. DATA PREPROCESSING
-# ============================================================================
-
-print("\n2. Preprocessing data...")
-
-# Handle categorical variables
-categorical_cols = X.select_dtypes(include=['object', 'category']).columns
-numerical_cols = X.select_dtypes(include=[np.number]).columns
-
-print(f"   Categorical features: {len(categorical_cols)}")
-print(f"   Numerical features: {len(numerical_cols)}")
-
-# Encode categoricals
-if len(categorical_cols) > 0:
-    le = LabelEncoder()
-    for col in categorical_cols:
-        X[col] = le.fit_transform(X[col].astype(str))
-
-# Create education level mapping if exists
-if 'education' in X.columns or 'education-num' in X.columns:
-    education_col = 'education-num' if 'education-num' in X.columns else 'education'
-    print(f"   Using '{education_col}' as education level")
-
-    if education_col == 'education':
-        # Map education to numeric levels
-        education_mapping = {
-            'Preschool': 1, '1st-4th': 2, '5th-6th': 3, '7th-8th': 4,
-            '9th': 5, '10th': 6, '11th': 7, '12th': 8,
-            'HS-grad': 9, 'Some-college': 10, 'Assoc-voc': 11,
-            'Assoc-acdm': 12, 'Bachelors': 13, 'Masters': 14, 'Doctorate': 15
-        }
-        # If not already numeric, map it
-        if X[education_col].dtype == 'object':
-            X['education_level'] = X[education_col].map(education_mapping).fillna(9)
-        else:
-            X['education_level'] = X[education_col]
-    else:
-        X['education_level'] = X[education_col]
-
-print(f"   Total features after preprocessing: {X.shape[1]}")
-
-
-# ============================================================================
-# 3. DEFINE ECONOMIC CONSTRAINTS (Labor Economics Theory)
-# ============================================================================
-
-print("\n3. Defining economic constraints (labor economics theory)...")
-print("   " + "-"*76)
-
-economic_constraints = {}
-
-# Education → Income (POSITIVE - more education = higher income)
-if 'education_level' in X.columns or 'education-num' in X.columns:
-    edu_col = 'education_level' if 'education_level' in X.columns else 'education-num'
-    economic_constraints[edu_col] = {
-        'type': 'monotonicity',
-        'direction': 'increasing',
-        'justification': 'Human capital theory: more education → higher earnings'
-    }
-
-# Age → Income (POSITIVE up to retirement)
-if 'age' in X.columns:
-    economic_constraints['age'] = {
-        'type': 'sign',
-        'sign': +1,  # Generally positive (experience premium)
-        'justification': 'Experience premium in labor markets'
-    }
-
-# Hours per week → Income (POSITIVE)
-if 'hours-per-week' in X.columns:
-    economic_constraints['hours-per-week'] = {
-        'type': 'sign',
-        'sign': +1,
-        'justification': 'More work hours → higher total income'
-    }
-
-# Capital gain → Income (POSITIVE)
-if 'capital-gain' in X.columns:
-    economic_constraints['capital-gain'] = {
-        'type': 'sign',
-        'sign': +1,
-        'justification': 'Capital income indicator of wealth'
-    }
-
-for feature, constraint in economic_constraints.items():
-    print(f"   {feature:25} → {constraint['type']:12} → {constraint['justification']}")
-
-print("   " + "-"*76)
-print(f"   Total constraints: {len(economic_constraints)}")
-
-
-# ============================================================================
-# 4. TRAIN/TEST SPLIT
-# ============================================================================
-
-print("\n4. Splitting data...")
-
-# Use smaller sample for faster processing (optional)
-if len(X) > 20000:
-    X_sample, _, y_sample, _ = train_test_split(
-        X, y, train_size=20000, random_state=RANDOM_STATE, stratify=y
-    )
-    print(f"   Sampled {len(X_sample)} from {len(X)} for faster processing")
-    X, y = X_sample, y_sample
-
-X_train, X_test, y_train, y_test = train_test_split(
-    X, y, test_size=0.3, random_state=RANDOM_STATE, stratify=y
-)
-
-print(f"   Train: {len(X_train)} samples ({y_train.mean():.2%} high income)")
-print(f"   Test:  {len(X_test)} samples ({y_test.mean():.2%} high income)")
-
-# Standardize
-scaler = StandardScaler()
-X_train_scaled = pd.DataFrame(
-    scaler.fit_transform(X_train),
-    columns=X_train.columns,
-    index=X_train.index
-)
-X_test_scaled = pd.DataFrame(
-    scaler.transform(X_test),
-    columns=X_test.columns,
-    index=X_test.index
-)
-
-
-# ============================================================================
-# 5. TEACHER: RANDOM FOREST
-# ============================================================================
-
-print("\n5. Training TEACHER (Random Forest)...")
-
-teacher = RandomForestClassifier(
-    n_estimators=100,
-    max_depth=15,
-    min_samples_split=10,
-    random_state=RANDOM_STATE,
-    n_jobs=-1
-)
-
-teacher.fit(X_train_scaled, y_train)
-
-teacher_test_probs = teacher.predict_proba(X_test_scaled)[:, 1]
-teacher_test_preds = teacher.predict(X_test_scaled)
-
-teacher_auc = roc_auc_score(y_test, teacher_test_probs)
-teacher_f1 = f1_score(y_test, teacher_test_preds)
-teacher_acc = accuracy_score(y_test, teacher_test_preds)
-
-print(f"   Test AUC:      {teacher_auc:.4f}")
-print(f"   Test F1:       {teacher_f1:.4f}")
-print(f"   Test Accuracy: {teacher_acc:.4f}")
-
-
-# ============================================================================
-# 6. BASELINE: LOGISTIC REGRESSION
-# ============================================================================
-
-print("\n6. Training BASELINE (Logistic Regression)...")
-
-baseline = LogisticRegression(max_iter=1000, random_state=RANDOM_STATE)
-baseline.fit(X_train_scaled, y_train)
-
-baseline_test_probs = baseline.predict_proba(X_test_scaled)[:, 1]
-baseline_test_preds = baseline.predict(X_test_scaled)
-
-baseline_auc = roc_auc_score(y_test, baseline_test_probs)
-baseline_f1 = f1_score(y_test, baseline_test_preds)
-baseline_acc = accuracy_score(y_test, baseline_test_preds)
-
-print(f"   Test AUC:      {baseline_auc:.4f}")
-print(f"   Test F1:       {baseline_f1:.4f}")
-print(f"   Test Accuracy: {baseline_acc:.4f}")
-
-
-# ============================================================================
-# 7. ECONOMIC KD
-# ============================================================================
-
-print("\n7. Training ECONOMIC KD (with constraints)...")
-
-economic_student = LogisticRegression(
-    max_iter=1000,
-    random_state=RANDOM_STATE,
-    penalty='l2',
-    C=0.5
-)
-
-economic_student.fit(X_train_scaled, y_train)
-
-economic_test_probs = economic_student.predict_proba(X_test_scaled)[:, 1]
-economic_test_preds = economic_student.predict(X_test_scaled)
-
-economic_auc = roc_auc_score(y_test, economic_test_probs)
-economic_f1 = f1_score(y_test, economic_test_preds)
-economic_acc = accuracy_score(y_test, economic_test_preds)
-
-print(f"   Test AUC:      {economic_auc:.4f}")
-print(f"   Test F1:       {economic_f1:.4f}")
-print(f"   Test Accuracy: {economic_acc:.4f}")
-
-
-# ============================================================================
-# 8. MARGINAL EFFECTS ANALYSIS (Education)
-# ============================================================================
-
-print("\n8. Analyzing marginal effects of EDUCATION...")
-print("   (Key contribution of paper - Section 5.3.3)")
-
-def calculate_marginal_effect_education(model, X_base, education_col):
-    """Calculate average marginal effect of education levels."""
-    if education_col not in X_base.columns:
-        return {}
-
-    # Get unique education levels
-    edu_levels = sorted(X_base[education_col].unique())
-
-    marginal_effects = {}
-
-    for level in edu_levels:
-        X_modified = X_base.copy()
-        X_modified[education_col] = level
-
-        proba = model.predict_proba(X_modified)[:, 1].mean()
-        marginal_effects[level] = proba
-
-    return marginal_effects
-
-# Find education column
-edu_col = None
-for col in ['education_level', 'education-num', 'education']:
-    if col in X_test_scaled.columns:
-        edu_col = col
-        break
-
-if edu_col:
-    marginal_effects = calculate_marginal_effect_education(
-        economic_student, X_test_scaled, edu_col
-    )
-
-    print(f"\n   Marginal effects by education level:")
-    print(f"   (Probability of high income >50K)")
-    print("   " + "-"*60)
-
-    baseline_effect = list(marginal_effects.values())[0]
-    for level, effect in marginal_effects.items():
-        diff = effect - baseline_effect
-        print(f"   Level {int(level):2d} → P(>50K) = {effect:.3f}  (+{diff*100:+.1f} pp)")
-
-    # Check monotonicity
-    effects_list = list(marginal_effects.values())
-    is_monotonic = all(effects_list[i] <= effects_list[i+1]
-                       for i in range(len(effects_list)-1))
-
-    print("   " + "-"*60)
-    print(f"   ✅ Monotonicity preserved: {is_monotonic}")
-else:
-    print("   ⚠️  Education column not found for marginal effects")
-    is_monotonic = None
-
-
-# ============================================================================
-# 9. COMPLIANCE ANALYSIS
-# ============================================================================
-
-print("\n9. Constraint compliance analysis...")
-
-def check_sign_compliance(model, feature_cols, constraints):
-    """Check if coefficients comply with sign constraints."""
-    if not hasattr(model, 'coef_'):
-        return None
-
-    compliant = 0
-    total = 0
-    violations = []
-
-    for feature, constraint in constraints.items():
-        if feature not in feature_cols or constraint['type'] != 'sign':
-            continue
-
-        feat_idx = list(feature_cols).index(feature)
-        coef = model.coef_[0][feat_idx]
-        expected = constraint['sign']
-        actual = np.sign(coef)
-
-        total += 1
-        if actual == expected:
-            compliant += 1
-        else:
-            violations.append({
-                'feature': feature,
-                'expected': expected,
-                'actual_coef': coef
-            })
-
-    rate = (compliant / total * 100) if total > 0 else 0
-    return rate, violations
-
-baseline_compliance, baseline_viol = check_sign_compliance(
-    baseline, X_train_scaled.columns, economic_constraints
-)
-
-economic_compliance, economic_viol = check_sign_compliance(
-    economic_student, X_train_scaled.columns, economic_constraints
-)
-
-if baseline_compliance is not None:
-    print(f"   Baseline compliance:    {baseline_compliance:.1f}%")
-if economic_compliance is not None:
-    print(f"   Economic KD compliance: {economic_compliance:.1f}%")
-
-
-# ============================================================================
-# 10. RESULTS SUMMARY
-# ============================================================================
-
-print("\n" + "="*80)
-print("RESULTS SUMMARY - ADULT INCOME (REAL DATA)")
-print("="*80)
-
-results_table = pd.DataFrame({
-    'Model': ['Teacher (RF)', 'Baseline (LR)', 'Economic KD'],
-    'Test AUC': [teacher_auc, baseline_auc, economic_auc],
-    'Test F1': [teacher_f1, baseline_f1, economic_f1],
-    'Compliance': ['N/A',
-                   f'{baseline_compliance:.1f}%' if baseline_compliance else 'N/A',
-                   f'{economic_compliance:.1f}%' if economic_compliance else 'N/A']
-})
-
-print("\n" + results_table.to_string(index=False))
-
-print(f"\n📊 KEY METRICS (for paper):")
-print(f"   Retention vs Teacher:    {economic_auc/teacher_auc*100:.1f}%")
-print(f"   Gain vs Baseline:        +{(economic_auc - baseline_auc)*100:.1f} pp")
-if economic_compliance:
-    print(f"   Compliance Rate:         {economic_compliance:.1f}%")
-if is_monotonic is not None:
-    print(f"   Education Monotonicity:  {'✅ Preserved' if is_monotonic else '❌ Violated'}")
-
-print(f"\n📖 COMPARISON WITH PAPER (Section 5.3):")
-print(f"   Expected Retention:      97.8%")
-print(f"   Expected Compliance:     96%")
-print(f"   Expected Monotonicity:   100% (bootstrap)")
-
-
-# ============================================================================
-# 11. SAVE RESULTS
-# ============================================================================
-
-print("\n11. Saving results...")
-
-results = {
-    'dataset': 'Adult Income (UCI Census)',
-    'n_samples': len(X),
-    'n_train': len(X_train),
-    'n_test': len(X_test),
-    'high_income_rate': float(y.mean()),
-    'models': {
-        'teacher': {
-            'type': 'RandomForest',
-            'test_auc': float(teacher_auc),
-            'test_f1': float(teacher_f1)
-        },
-        'baseline': {
-            'type': 'LogisticRegression',
-            'test_auc': float(baseline_auc),
-            'test_f1': float(baseline_f1),
-            'compliance': float(baseline_compliance) if baseline_compliance else None
-        },
-        'economic_kd': {
-            'type': 'EconomicKD',
-            'test_auc': float(economic_auc),
-            'test_f1': float(economic_f1),
-            'compliance': float(economic_compliance) if economic_compliance else None
-        }
-    },
-    'marginal_effects': {
-        'education_monotonic': bool(is_monotonic) if is_monotonic is not None else None,
-        'effects': {str(k): float(v) for k, v in marginal_effects.items()} if marginal_effects else None
-    }
-}
-
-results_path = '/home/guhaase/projetos/DeepBridge/papers/15_Knowledge_Distillation_Economics/experiments/results/adult_income_results.json'
-with open(results_path, 'w') as f:
-    json.dump(results, f, indent=2)
-
-print(f"   ✅ Results saved to: {results_path}")
-
-# Save models
-models_path = '/home/guhaase/projetos/DeepBridge/papers/15_Knowledge_Distillation_Economics/experiments/results/adult_income_models.pkl'
-with open(models_path, 'wb') as f:
-    pickle.dump({
-        'teacher': teacher,
-        'baseline': baseline,
-        'economic_student': economic_student,
-        'scaler': scaler
-    }, f)
-
-print(f"   ✅ Models saved to: {models_path}")
-
-print("\n" + "="*80)
-print("✅ EXPERIMENT COMPLETED SUCCESSFULLY!")
-print("   Labor economics validation with real Census data")
-print("   Education monotonicity and marginal effects analyzed")
-print("="*80)
+if __name__ == '__main__':
+    adult_income.run(adult_income.default_config())
@@ -0,0 +1,77 @@
+"""
+econkd - Economic Knowledge Distillation toolkit
+================================================
+
+Reusable building blocks shared by the case-study experiments in this
+directory (German Credit, Adult Income).
+
+Names are imported lazily on first access, so ``from econkd.artifacts
+import load_models`` or ``econkd.compile_scorer`` in a scoring process does
+not pay for the serving, benchmark, sweep or cross-validation modules.
+"""
+
+import importlib
+from typing import Any, Dict, Tuple
+
+# Public names by submodule
+_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    'artifacts': ('ModelArtifact', 'load_models', 'save_models'),
+    'benchmark': ('BenchmarkReport', 'compare_reports', 'run_benchmarks'),
+    'bootstrap': (
+        'BootstrapResult', 'bootstrap_coefficients', 'coefficient_statistics',
+        'draw_bootstrap_indices', 'draw_bootstrap_weights',
+    ),
+    'datasets': (
+        'CachedDataset', 'DatasetUnavailableError', 'load_cached', 'load_openml_dataset',
+        'store_frame',
+    ),
+    'constraints': ('ComplianceReport', 'ConstraintSet'),
+    'crossval': ('CrossValResult', 'cross_validate_case_study', 'cross_validate_distiller'),
+    'distiller': ('EconomicDistiller',),
+    'gam': ('GAMDistiller',),
+    'experiment': (
+        'ExperimentConfig', 'ExperimentResult', 'PreparedData', 'build_estimator', 'prepare_data',
+        'save_results', 'teacher_soft_targets',
+    ),
+    'marginal_effects': ('MarginalEffects', 'logistic_covariance', 'marginal_effects'),
+    'pipeline': ('PipelineReport', 'Stage', 'StageResult', 'python_stage', 'run_pipeline'),
+    'preprocessing': ('FeaturePipeline',),
+    'profiling': ('PeakMemory', 'StageProfiler'),
+    'scoring': ('CompiledScorer', 'compile_scorer'),
+    'serving': ('LoadReport', 'MicroBatcher', 'ScoringServer', 'run_load'),
+    'synthetic': (
+        'SyntheticSpec', 'SyntheticTruth', 'coefficient_recovery', 'generate_frame',
+        'iter_synthetic_chunks', 'load_synthetic_extras', 'write_synthetic',
+    ),
+    'soft_targets': ('SoftTargetStore', 'SoftTargets', 'teacher_fingerprint'),
+    'structural_breaks': (
+        'ChowResult', 'ChowScan', 'CusumResult', 'RollingCoefficients', 'chow_scan',
+        'rolling_coefficients', 'sup_f_pvalue',
+    ),
+    'teacher_inference': (
+        'CompiledEnsemble', 'as_compiled', 'compile_teacher', 'teacher_probabilities',
+    ),
+    'sweep': (
+        'DEFAULT_SPACE', 'SweepResult', 'pareto_mask', 'sweep_case_study', 'sweep_distiller',
+    ),
+    'streaming': (
+        'iter_array_chunks', 'iter_csv_chunks', 'iter_generator_chunks', 'iter_parquet_chunks',
+    ),
+}
+
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = [name for names in _EXPORTS.values() for name in names]
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,341 @@
+"""
+Model Artifacts
+===============
+
+Versioned on-disk format for the fitted models of a case study, replacing
+the single ``<case_study>_models.pkl`` dict. Each component is stored on its
+own next to a ``manifest.json``, in a version directory named by the digest of
+the manifest, ``<case_study>_models/<sha256>/``:
+
+- linear students and baselines (``EconomicDistiller``,
+  ``LogisticRegression``): hyperparameters and scalar attributes as JSON,
+  ``coef_`` / ``intercept_`` / ``classes_`` as raw ``.npy`` (loaded with
+  ``allow_pickle=False``)
+- the ``FeaturePipeline``: its JSON state
+- anything else (the teacher ensemble, a ``GAMDistiller``): ``joblib``,
+  loaded with ``mmap_mode='r'`` so large arrays stay on disk until touched
+
+The manifest records the format version, each component's kind and class,
+and the size and SHA-256 of every file. ``load_models`` returns a read-only
+mapping that loads a component on first access, so a scoring process that
+only needs the student never deserializes the teacher. Only the classes
+listed in ``LINEAR_CLASSES`` are rebuilt from JSON; the joblib files are
+pickles and should only be loaded from trusted directories.
+
+As in the dataset cache, a ``CURRENT`` file names the version to read.
+``save_models`` writes the new version completely and then replaces the
+pointer in one rename: readers see either the old or the new artifact, never
+a missing or half-written one. An open ``ModelArtifact`` keeps reading the
+version it opened. The version replaced by a save is kept, and older ones are
+removed.
+
+Example:
+    >>> save_models(result.models, 'results/german_credit_models')
+    >>> models = load_models('results/german_credit_models')
+    >>> student = models['economic_student']    # reads JSON + three small .npy files
+    >>> models.loaded                           # ['economic_student']
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .constraints import ConstraintSet
+
+FORMAT_NAME = 'econkd-models'
+FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+CURRENT_FILE = 'CURRENT'
+
+# Resolved on first use, so opening an artifact does not import sklearn
+LINEAR_CLASSES = (
+    'econkd.distiller.EconomicDistiller',
+    'sklearn.linear_model.LogisticRegression',
+)
+PIPELINE_CLASS = 'econkd.preprocessing.FeaturePipeline'
+LINEAR_ARRAYS = ('coef_', 'intercept_', 'classes_')
+LINEAR_SCALARS = ('n_iter_', 'loss_', 'converged_')
+
+
+def _class_path(obj: Any) -> str:
+    cls = type(obj)
+    module = cls.__module__
+    # sklearn's private submodules are not part of its public import path
+    if module.startswith('sklearn.'):
+        module = '.'.join(part for part in module.split('.') if not part.startswith('_'))
+    return f'{module}.{cls.__qualname__}'
+
+
+def _import_class(path: str) -> type:
+    module, _, name = path.rpartition('.')
+    if module.startswith('econkd.'):
+        module = module[len('econkd'):]
+        return getattr(importlib.import_module(module, __package__), name)
+    return getattr(importlib.import_module(module), name)
+
+
+def _sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def _json_ready(value: Any) -> bool:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _kind(obj: Any) -> str:
+    if _class_path(obj) == PIPELINE_CLASS:
+        return 'pipeline'
+    if (_class_path(obj) in LINEAR_CLASSES and hasattr(obj, 'coef_')
+            and _json_ready(obj.get_params(deep=False))):
+        return 'linear'
+    return 'joblib'
+
+
+# ----------------------------------------------------------------------
+# Writing
+# ----------------------------------------------------------------------
+
+def _write_linear(name: str, model, directory: Path) -> Dict[str, str]:
+    files = {}
+    for attr in LINEAR_ARRAYS:
+        files[attr] = f'{name}.{attr.rstrip("_")}.npy'
+        np.save(directory / files[attr], np.asarray(getattr(model, attr)), allow_pickle=False)
+
+    scalars = {}
+    for attr in LINEAR_SCALARS:
+        if hasattr(model, attr):
+            value = getattr(model, attr)
+            scalars[attr] = value.tolist() if isinstance(value, np.ndarray) else value
+    state = {
+        'params': model.get_params(deep=False),
+        'attributes': scalars,
+        'feature_names_in': (list(model.feature_names_in_)
+                             if hasattr(model, 'feature_names_in_') else None),
+    }
+    files['state'] = f'{name}.json'
+    with open(directory / files['state'], 'w') as f:
+        json.dump(state, f, indent=2)
+    return files
+
+
+def _current_version(directory: Path) -> Optional[str]:
+    pointer = directory / CURRENT_FILE
+    return pointer.read_text().strip() if pointer.exists() else None
+
+
+def _write_pointer(directory: Path, digest: str) -> None:
+    fd, path = tempfile.mkstemp(dir=directory, prefix=f'.{CURRENT_FILE}-')
+    with os.fdopen(fd, 'w') as f:
+        f.write(digest)
+    os.chmod(path, 0o644)  # mkstemp creates the file private
+    os.replace(path, directory / CURRENT_FILE)
+
+
+def _prune(directory: Path, keep: Sequence[Optional[str]]) -> None:
+    """Remove versions (and pre-pointer top-level files) other than ``keep``."""
+    for entry in directory.iterdir():
+        # Dot entries are staging directories of concurrent saves
+        if entry.name == CURRENT_FILE or entry.name in keep or entry.name.startswith('.'):
+            continue
+        if entry.is_dir():
+            shutil.rmtree(entry, ignore_errors=True)
+        else:
+            entry.unlink()
+
+
+def save_models(models: Mapping, directory: Union[str, Path]) -> Path:
+    """
+    Write each fitted component to a new version of the artifact in ``directory``.
+
+    The version is staged inside ``directory``, renamed to its digest and
+    then published by replacing the ``CURRENT`` pointer, so readers never see
+    a half-written artifact. The version it replaces is kept for readers that
+    opened it; older versions are removed.
+
+    Args:
+        models: Components by name (e.g. 'teacher', 'economic_student',
+            'preprocessor'); None values are skipped
+        directory: Artifact directory
+
+    Returns:
+        The artifact directory
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=directory, prefix='.staging-'))
+    try:
+        components = {}
+        for name, model in models.items():
+            if model is None:
+                continue
+            kind = _kind(model)
+            if kind == 'linear':
+                files = _write_linear(name, model, staging)
+            elif kind == 'pipeline':
+                files = {'state': f'{name}.json'}
+                model.save(staging / files['state'])
+            else:
+                import joblib
+
+                files = {'model': f'{name}.joblib'}
+                joblib.dump(model, staging / files['model'])
+
+            components[name] = {
+                'kind': kind,
+                'class': _class_path(model),
+                'files': {role: {'path': path,
+                                 'bytes': (staging / path).stat().st_size,
+                                 'sha256': _sha256(staging / path)}
+                          for role, path in files.items()},
+            }
+
+        with open(staging / MANIFEST_FILE, 'w') as f:
+            json.dump({'format': FORMAT_NAME, 'version': FORMAT_VERSION,
+                       'created': time.time(), 'components': components}, f, indent=2)
+
+        # Content address: every file's checksum, not the creation time
+        digest = hashlib.sha256(json.dumps(components, sort_keys=True).encode()).hexdigest()
+        os.chmod(staging, 0o755)  # mkdtemp creates the directory private
+        if not (directory / digest).exists():
+            os.replace(staging, directory / digest)
+        previous = _current_version(directory)
+        _write_pointer(directory, digest)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    _prune(directory, keep=(digest, previous))
+    return directory
+
+
+# ----------------------------------------------------------------------
+# Reading
+# ----------------------------------------------------------------------
+
+class ModelArtifact(Mapping):
+    """
+    Lazily loaded, read-only view of a saved artifact.
+
+    Behaves like the old models dict: ``artifact['teacher']`` loads (and
+    caches) that component on first access; ``loaded`` lists what has been
+    read so far. The version named by ``CURRENT`` is resolved once, when the
+    artifact is opened, so components loaded later come from the same
+    version as the manifest even if a newer one has been saved since.
+
+    Args:
+        directory: Artifact directory written by ``save_models``
+        verify: Check each file's SHA-256 against the manifest before loading
+        mmap_mode: Passed to ``joblib.load`` for joblib components
+    """
+
+    def __init__(self, directory: Union[str, Path], verify: bool = False,
+                 mmap_mode: Optional[str] = 'r'):
+        self.directory = Path(directory)
+        self.verify = verify
+        self.mmap_mode = mmap_mode
+        # Directories saved before the pointer hold the files themselves
+        self.digest = _current_version(self.directory)
+        self.path = self.directory / self.digest if self.digest else self.directory
+        with open(self.path / MANIFEST_FILE) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format') != FORMAT_NAME:
+            raise ValueError(f'{self.directory} is not an {FORMAT_NAME} artifact')
+        if self.manifest['version'] > FORMAT_VERSION:
+            raise ValueError(
+                f"Artifact format version {self.manifest['version']} is newer than "
+                f"the supported version {FORMAT_VERSION}"
+            )
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def components(self) -> Dict[str, Dict[str, Any]]:
+        return self.manifest['components']
+
+    @property
+    def loaded(self) -> List[str]:
+        return list(self._cache)
+
+    def size(self, name: Optional[str] = None) -> int:
+        """Bytes on disk of one component (or of all of them)."""
+        names = [name] if name is not None else list(self.components)
+        return sum(entry['bytes'] for n in names
+                   for entry in self.components[n]['files'].values())
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._cache:
+            if name not in self.components:
+                raise KeyError(name)
+            self._cache[name] = self._load(name, self.components[name])
+        return self._cache[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.components)
+
+    def __len__(self) -> int:
+        return len(self.components)
+
+    def __repr__(self) -> str:
+        return (f'ModelArtifact({str(self.directory)!r}, components={list(self.components)}, '
+                f'loaded={self.loaded})')
+
+    def _path(self, name: str, component: Mapping[str, Any], role: str) -> Path:
+        entry = component['files'][role]
+        path = self.path / entry['path']
+        if self.verify and _sha256(path) != entry['sha256']:
+            raise ValueError(f'Checksum mismatch for {name} ({entry["path"]})')
+        return path
+
+    def _load(self, name: str, component: Mapping[str, Any]) -> Any:
+        kind = component['kind']
+        if kind == 'pipeline':
+            return _import_class(PIPELINE_CLASS).load(self._path(name, component, 'state'))
+        if kind == 'joblib':
+            import joblib
+
+            return joblib.load(self._path(name, component, 'model'), mmap_mode=self.mmap_mode)
+        if kind != 'linear':
+            raise ValueError(f'Unknown component kind {kind!r} for {name}')
+
+        if component['class'] not in LINEAR_CLASSES:
+            raise ValueError(f"Class {component['class']} cannot be rebuilt from JSON")
+        cls = _import_class(component['class'])
+        with open(self._path(name, component, 'state')) as f:
+            state = json.load(f)
+
+        model = cls(**state['params'])
+        for attr in LINEAR_ARRAYS:
+            setattr(model, attr, np.load(self._path(name, component, attr), allow_pickle=False))
+        for attr, value in state['attributes'].items():
+            setattr(model, attr, np.asarray(value) if isinstance(value, list) else value)
+        model.n_features_in_ = model.coef_.shape[1]
+
+        feature_names = state['feature_names_in']
+        if feature_names is not None:
+            model.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        if component['class'] == 'econkd.distiller.EconomicDistiller':
+            model.constraint_set_ = ConstraintSet.compile(
+                model.constraints or {},
+                feature_names or [f'x{j}' for j in range(model.n_features_in_)],
+            )
+        return model
+
+
+def load_models(directory: Union[str, Path], verify: bool = False,
+                mmap_mode: Optional[str] = 'r') -> ModelArtifact:
+    """Open an artifact written by ``save_models`` (components load lazily)."""
+    return ModelArtifact(directory, verify=verify, mmap_mode=mmap_mode)
@@ -0,0 +1,497 @@
+"""
+Benchmark Harness
+=================
+
+Times every stage of the distillation pipeline and records its memory, so
+cost regressions can be compared between commits:
+
+    load → preprocess → teacher_fit → soft_targets → student_fit
+         → compliance → marginal_effects → bootstrap
+
+Datasets are the two case studies (``german_credit``, ``adult_income``,
+served from the local dataset cache) and synthetic scale-ups named
+``'<rows>x<features>'`` (e.g. ``'1e6x100'``): standardized Gaussian features
+with a planted logistic model whose first ``min(5, p)`` coefficients carry
+sign constraints. ``SUITES`` lists the default grids; ``'full'`` reaches
+10^7 rows and 500 features and is meant for dedicated machines.
+
+Each dataset runs in a fresh spawned process (``isolate=True``), so the
+memory left behind by earlier datasets does not leak into its numbers, and
+the libraries every stage needs are imported before the first stage is
+timed, so import costs never do. Within it the stages run in order, each ``repeat`` times on the
+same inputs (asv style: the minimum is the headline number). Per stage the
+harness records wall time, CPU time of the benchmark process, and peak
+resident memory, sampled from ``/proc/self/statm`` by a background thread
+(falling back to the ``ru_maxrss`` high-water mark elsewhere). Memory and
+CPU time of joblib worker processes (teacher ``n_jobs``, bootstrap) are not
+included.
+
+Reports are plain JSON (``BenchmarkReport.save``) with the git commit and
+library versions; ``compare_reports`` lines two of them up stage by stage.
+
+Example:
+    >>> report = run_benchmarks(['german_credit', '1e5x50'], repeat=3)
+    >>> report.save('benchmarks/abc1234.json')
+    >>> compare_reports(BenchmarkReport.load('benchmarks/old.json'), report)
+"""
+
+import importlib
+import json
+import os
+import platform
+import re
+import subprocess
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .profiling import PeakMemory
+
+STAGES = ('load', 'preprocess', 'teacher_fit', 'soft_targets', 'student_fit',
+          'compliance', 'marginal_effects', 'bootstrap')
+# Everything the stage functions import, loaded before the first stage is timed
+STAGE_IMPORTS = ('.case_studies', '.datasets', '.preprocessing', '.experiment',
+                 '.teacher_inference', '.distiller', '.constraints', '.marginal_effects',
+                 '.bootstrap', 'sklearn.model_selection', 'sklearn.ensemble',
+                 'sklearn.linear_model')
+REQUIRES = {
+    'load': (),
+    'preprocess': ('load',),
+    'teacher_fit': ('preprocess',),
+    'soft_targets': ('teacher_fit',),
+    'student_fit': ('soft_targets',),
+    'compliance': ('student_fit',),
+    'marginal_effects': ('student_fit',),
+    'bootstrap': ('preprocess',),
+}
+CASE_STUDY_DATASETS = ('german_credit', 'adult_income')
+SUITES = {
+    'quick': CASE_STUDY_DATASETS + ('1e4x20', '1e5x100'),
+    'full': CASE_STUDY_DATASETS + ('1e4x20', '1e5x20', '1e5x100', '1e5x500',
+                                   '1e6x20', '1e6x100', '1e7x20'),
+}
+SYNTHETIC_TEACHER = {
+    'type': 'RandomForestClassifier',
+    'params': {'n_estimators': 50, 'max_depth': 8, 'n_jobs': -1},
+}
+# Rows the synthetic teacher sees per tree, so teacher_fit stays bounded
+SYNTHETIC_TEACHER_ROWS = 200_000
+MARGINAL_GRID_SIZE = 20
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent.parent / 'benchmarks'
+# Rough number of float64 copies of X alive at the peak (raw frame,
+# scaled train/test, bootstrap resample, ...), used to skip datasets that
+# cannot fit in memory
+MEMORY_COPIES = 6
+
+_SYNTHETIC = re.compile(r'^(\d+(?:\.\d+)?(?:e\d+)?)x(\d+)$')
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+@dataclass
+class StageResult:
+    """Timings and memory of one stage on one dataset."""
+
+    dataset: str
+    stage: str
+    n_rows: int
+    n_features: int
+    wall_s: List[float]
+    cpu_s: List[float]
+    peak_rss_mb: float
+    rss_growth_mb: float
+
+    @property
+    def best_s(self) -> float:
+        return min(self.wall_s)
+
+    @property
+    def median_s(self) -> float:
+        return float(np.median(self.wall_s))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), 'best_s': self.best_s, 'median_s': self.median_s}
+
+
+# ----------------------------------------------------------------------
+# Datasets
+# ----------------------------------------------------------------------
+
+def parse_synthetic(name: str):
+    """``'1e6x100'`` → (1000000, 100), or None for non-synthetic names."""
+    match = _SYNTHETIC.match(name)
+    if match is None:
+        return None
+    return int(float(match.group(1))), int(match.group(2))
+
+
+def synthetic_frame(n_rows: int, n_features: int, random_state: int = 0):
+    """
+    Gaussian features with a planted logistic model.
+
+    Returns:
+        (X DataFrame, y Series, true coefficients, constraints dict)
+    """
+    rng = np.random.default_rng(random_state)
+    columns = [f'x{j}' for j in range(n_features)]
+    X = rng.standard_normal((n_rows, n_features))
+    coef = rng.normal(0.0, 1.0 / np.sqrt(n_features), n_features)
+    n_constrained = min(5, n_features)
+    coef[:n_constrained] = np.abs(coef[:n_constrained]) * np.where(
+        np.arange(n_constrained) % 2 == 0, 1.0, -1.0)
+    y = (rng.random(n_rows) < 1.0 / (1.0 + np.exp(-(X @ coef)))).astype(int)
+    constraints = {columns[j]: {'type': 'sign', 'sign': 1 if coef[j] > 0 else -1}
+                   for j in range(n_constrained)}
+    return pd.DataFrame(X, columns=columns), pd.Series(y), coef, constraints
+
+
+def _available_memory() -> Optional[int]:
+    try:
+        return os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+# ----------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------
+
+def _stage_load(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .case_studies import get_case_study
+    from .datasets import load_openml_dataset
+
+    shape = parse_synthetic(ctx['dataset'])
+    if shape is not None:
+        X, y, coef, constraints = synthetic_frame(*shape, random_state=ctx['random_state'])
+        return {'X': X, 'y': y, 'true_coef': coef, 'constraints': constraints,
+                'config': None, 'module': None}
+
+    module = get_case_study(ctx['dataset'])
+    config = module.default_config()
+    dataset = load_openml_dataset(config.dataset, version=config.dataset_version,
+                                  cache_dir=config.cache_dir, offline=True)
+    y = (dataset.y == config.positive_label).astype(int)
+    return {'X': dataset.X, 'y': y, 'config': config, 'module': module}
+
+
+def _stage_preprocess(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from sklearn.model_selection import train_test_split
+
+    from .preprocessing import FeaturePipeline
+
+    X, y, module, config = ctx['X'], ctx['y'], ctx['module'], ctx['config']
+    if module is None:
+        # Synthetic rows are i.i.d., so a positional 70/30 split is random
+        n_train = int(0.7 * len(X))
+        X_train, X_test = X.iloc[:n_train], X.iloc[n_train:]
+        y_train, y_test = y.iloc[:n_train], y.iloc[n_train:]
+        preprocessor = FeaturePipeline(scale='all')
+        constraints = ctx['constraints']
+    else:
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=config.test_size, random_state=config.random_state, stratify=y)
+        preprocessor = module.build_preprocessor(X)
+        constraints = (module.default_constraints(preprocessor.output_columns(X.columns))
+                       if config.constraints is None else config.constraints)
+    preprocessor.set_params(dtype=ctx['dtype'])
+    return {
+        'X_train': preprocessor.fit_transform_frame(X_train),
+        'X_test': preprocessor.transform_frame(X_test),
+        'y_train': y_train,
+        'y_test': y_test,
+        'constraints': constraints,
+    }
+
+
+def _stage_teacher_fit(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .experiment import build_estimator
+
+    if ctx['config'] is None:
+        params = dict(SYNTHETIC_TEACHER['params'])
+        if len(ctx['X_train']) > SYNTHETIC_TEACHER_ROWS:
+            params['max_samples'] = SYNTHETIC_TEACHER_ROWS
+        spec = {**SYNTHETIC_TEACHER, 'params': params}
+    else:
+        spec = ctx['config'].teacher
+    teacher = build_estimator(spec, ctx['random_state'])
+    return {'teacher': teacher.fit(ctx['X_train'], ctx['y_train'])}
+
+
+def _stage_soft_targets(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .teacher_inference import teacher_probabilities
+
+    return {'teacher_probs': teacher_probabilities(ctx['teacher'], ctx['X_train'], n_jobs=-1)}
+
+
+def _stage_student_fit(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .distiller import EconomicDistiller
+
+    params = ctx['config'].student if ctx['config'] is not None else {}
+    student = EconomicDistiller(constraints=ctx['constraints'], **params)
+    return {'student': student.fit(ctx['X_train'], ctx['y_train'], ctx['teacher_probs'])}
+
+
+def _stage_compliance(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .constraints import ConstraintSet
+
+    constraint_set = ConstraintSet.compile(ctx['constraints'], list(ctx['X_train'].columns))
+    return {'compliance': constraint_set.evaluate(ctx['student'].coef_[0])}
+
+
+def _stage_marginal_effects(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .marginal_effects import logistic_covariance, marginal_effects
+
+    student, X_test = ctx['student'], ctx['X_test']
+    feature = next(iter(ctx['constraints']))
+    values = np.unique(np.quantile(X_test[feature], np.linspace(0, 1, MARGINAL_GRID_SIZE)))
+    cov = logistic_covariance(student, ctx['X_train'])
+    return {'marginal_effects': marginal_effects(student, X_test, feature, values, cov=cov)}
+
+
+def _stage_bootstrap(ctx: Dict[str, Any]) -> Dict[str, Any]:
+    from .bootstrap import bootstrap_coefficients
+
+    config = ctx['config']
+    params = {'max_iter': 1000, **(config.baseline if config is not None else {})}
+    result = bootstrap_coefficients(
+        ctx['X_train'], ctx['y_train'], n_bootstrap=ctx['n_bootstrap'],
+        student_params=params, random_state=ctx['random_state'],
+        constraints=ctx['constraints'],
+    )
+    return {'bootstrap': result}
+
+
+STAGE_FUNCTIONS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    'load': _stage_load,
+    'preprocess': _stage_preprocess,
+    'teacher_fit': _stage_teacher_fit,
+    'soft_targets': _stage_soft_targets,
+    'student_fit': _stage_student_fit,
+    'compliance': _stage_compliance,
+    'marginal_effects': _stage_marginal_effects,
+    'bootstrap': _stage_bootstrap,
+}
+
+
+def _with_requirements(stages: Sequence[str]) -> List[str]:
+    needed = set()
+    pending = list(stages)
+    while pending:
+        stage = pending.pop()
+        if stage not in needed:
+            needed.add(stage)
+            pending.extend(REQUIRES[stage])
+    return [stage for stage in STAGES if stage in needed]
+
+
+def _stage_rows(stage: str, ctx: Mapping[str, Any]) -> int:
+    if stage == 'load':
+        return len(ctx['X'])
+    if stage == 'marginal_effects':
+        return len(ctx['X_test'])
+    if stage == 'compliance':
+        return len(ctx['constraints'])
+    return len(ctx['X_train'])
+
+
+def benchmark_dataset(dataset: str, stages: Sequence[str] = STAGES, repeat: int = 1,
+                      n_bootstrap: int = 50, random_state: int = 0,
+                      dtype: str = 'float64') -> List[Dict[str, Any]]:
+    """
+    Run the selected stages (plus their prerequisites) on one dataset.
+
+    Prerequisites that were not selected run once and are not reported.
+    ``dtype`` is the ``FeaturePipeline`` output dtype of the preprocess stage.
+
+    Returns:
+        One ``StageResult.to_dict()`` per selected stage
+    """
+    # The stages import their libraries lazily; importing them all up front
+    # keeps the import time and memory of sklearn / pandas out of the first
+    # stage's numbers, also when the dataset is not isolated
+    for module in STAGE_IMPORTS:
+        importlib.import_module(module, __package__)
+
+    ctx: Dict[str, Any] = {'dataset': dataset, 'n_bootstrap': n_bootstrap,
+                           'random_state': random_state, 'dtype': dtype}
+    results = []
+    for stage in _with_requirements(stages):
+        reported = stage in stages
+        wall, cpu = [], []
+        with PeakMemory() as memory, warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            for _ in range(repeat if reported else 1):
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                output = STAGE_FUNCTIONS[stage](ctx)
+                wall.append(time.perf_counter() - wall_start)
+                cpu.append(time.process_time() - cpu_start)
+        ctx.update(output)
+        if reported:
+            X = ctx.get('X_train', ctx['X'])
+            results.append(StageResult(
+                dataset=dataset, stage=stage, n_rows=_stage_rows(stage, ctx),
+                n_features=X.shape[1], wall_s=wall, cpu_s=cpu,
+                peak_rss_mb=memory.peak / 2**20,
+                rss_growth_mb=memory.growth / 2**20,
+            ).to_dict())
+    return results
+
+
+# ----------------------------------------------------------------------
+# Reports
+# ----------------------------------------------------------------------
+
+def _git_commit() -> Dict[str, Any]:
+    root = Path(__file__).resolve().parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--', '.'], cwd=root,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {'commit': None, 'dirty': None}
+    return {'commit': commit, 'dirty': dirty}
+
+
+def environment() -> Dict[str, Any]:
+    """Commit, interpreter, library versions and machine of this run."""
+    import scipy
+    import sklearn
+
+    return {
+        **_git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'sklearn': sklearn.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+@dataclass
+class BenchmarkReport:
+    """Results of one ``run_benchmarks`` call."""
+
+    environment: Dict[str, Any]
+    settings: Dict[str, Any]
+    results: List[Dict[str, Any]] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)
+
+    def to_frame(self) -> pd.DataFrame:
+        columns = ['dataset', 'stage', 'n_rows', 'n_features', 'best_s', 'median_s',
+                   'peak_rss_mb', 'rss_growth_mb']
+        return pd.DataFrame(self.results, columns=columns + ['wall_s', 'cpu_s'])[columns]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def save(self, path: Union[str, Path]) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'BenchmarkReport':
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def default_path(self, directory: Union[str, Path, None] = None) -> Path:
+        label = self.environment.get('commit') or 'local'
+        if self.environment.get('dirty'):
+            label += '-dirty'
+        if self.settings.get('dtype', 'float64') != 'float64':
+            label += f"-{self.settings['dtype']}"
+        return Path(directory or DEFAULT_OUTPUT_DIR) / f'{label}.json'
+
+
+def run_benchmarks(datasets: Sequence[str] = SUITES['quick'], stages: Sequence[str] = STAGES,
+                   repeat: int = 1, n_bootstrap: int = 50, random_state: int = 0,
+                   dtype: str = 'float64', isolate: bool = True,
+                   verbose: bool = True) -> BenchmarkReport:
+    """
+    Benchmark ``stages`` on each of ``datasets``.
+
+    Args:
+        datasets: Case-study names and/or synthetic ``'<rows>x<features>'``
+        stages: Stages to report (prerequisites run unreported)
+        repeat: Timed runs per stage
+        n_bootstrap: Replicates in the bootstrap stage
+        random_state: Seed for synthetic data, splits and models
+        dtype: Preprocessed feature dtype ('float64', 'float32' or 'compact')
+        isolate: Run each dataset in a fresh spawned process
+        verbose: Print one line per stage
+
+    Returns:
+        BenchmarkReport
+    """
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f'Unknown stages {unknown}; choose from {STAGES}')
+
+    report = BenchmarkReport(
+        environment=environment(),
+        settings={'datasets': list(datasets), 'stages': list(stages), 'repeat': repeat,
+                  'n_bootstrap': n_bootstrap, 'random_state': random_state,
+                  'dtype': dtype, 'isolate': isolate},
+    )
+    available = _available_memory()
+    for dataset in datasets:
+        shape = parse_synthetic(dataset)
+        if shape is None and dataset not in CASE_STUDY_DATASETS:
+            raise ValueError(f'Unknown dataset {dataset!r}')
+        if shape is not None and available is not None:
+            needed = shape[0] * shape[1] * 8 * MEMORY_COPIES
+            if needed > available:
+                report.skipped[dataset] = (f'needs ~{needed / 2**30:.1f} GiB, '
+                                           f'{available / 2**30:.1f} GiB available')
+                if verbose:
+                    print(f"{dataset}: skipped ({report.skipped[dataset]})")
+                continue
+
+        args = (dataset, stages, repeat, n_bootstrap, random_state, dtype)
+        if isolate:
+            with ProcessPoolExecutor(1, mp_context=get_context('spawn')) as pool:
+                results = pool.submit(benchmark_dataset, *args).result()
+        else:
+            results = benchmark_dataset(*args)
+        report.results.extend(results)
+        if verbose:
+            for r in results:
+                print(f"{dataset:15} {r['stage']:17} {r['best_s']:9.3f}s  "
+                      f"peak {r['peak_rss_mb']:8.1f} MB  (+{r['rss_growth_mb']:.1f})")
+    return report
+
+
+def compare_reports(baseline: BenchmarkReport, current: BenchmarkReport,
+                    threshold: float = 0.10) -> pd.DataFrame:
+    """
+    Stage-by-stage comparison of two reports on their common (dataset, stage).
+
+    ``status`` is 'slower' / 'faster' when the best time moved by more than
+    ``threshold`` (relative), else 'same'; ``rss_ratio`` compares peak RSS.
+    """
+    keys = ['dataset', 'stage']
+    old = baseline.to_frame()[keys + ['best_s', 'peak_rss_mb']]
+    new = current.to_frame()[keys + ['best_s', 'peak_rss_mb']]
+    table = old.merge(new, on=keys, suffixes=('_baseline', '_current'))
+    table['time_ratio'] = table['best_s_current'] / table['best_s_baseline']
+    table['rss_ratio'] = table['peak_rss_mb_current'] / table['peak_rss_mb_baseline']
+    table['status'] = np.select(
+        [table['time_ratio'] > 1 + threshold, table['time_ratio'] < 1 - threshold],
+        ['slower', 'faster'], 'same',
+    )
+    return table
@@ -0,0 +1,344 @@
+"""
+Bootstrap Stability Engine
+==========================
+
+Parallel bootstrap of student coefficients for the stability analysis
+described in docs/METHODOLOGY.md (Section "Stability Analysis").
+
+All resample index matrices are drawn up front from a single seeded
+generator, replicates are fitted in batches across a process pool, and
+every fit is warm-started from the full-data coefficients so L-BFGS only
+has to travel the (small) distance between the full-sample optimum and the
+bootstrap optimum.
+
+Two sampling schemes are available:
+
+- ``'resample'``: classic row resampling (``X[indices]`` per replicate)
+- ``'multinomial'`` / ``'poisson'``: weighted bootstrap. Each replicate is a
+  ``sample_weight`` vector over one shared, read-only memory-mapped copy of
+  the training matrix, so memory stays at n x p regardless of B. Multinomial
+  counts give exactly the same objective as row resampling; Poisson(1)
+  weights are the usual large-n approximation.
+
+A float32 (or compact, see ``FeaturePipeline(dtype='compact')``) training
+matrix stays float32 throughout: the lbfgs solver fits it natively, so the
+shared copy and the per-replicate row gathers are half the float64 size.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.linear_model import LogisticRegression
+
+from .constraints import ConstraintSet
+from .preprocessing import as_design_matrix
+
+DEFAULT_STUDENT_PARAMS: Dict[str, Any] = {'max_iter': 1000}
+
+BOOTSTRAP_METHODS = ('resample', 'multinomial', 'poisson')
+
+
+@dataclass
+class BootstrapResult:
+    """
+    Coefficient draws and stability statistics from a bootstrap run.
+
+    All per-feature statistics are arrays of shape (n_features,).
+    """
+
+    coefs: np.ndarray
+    intercepts: np.ndarray
+    coef_mean: np.ndarray
+    coef_std: np.ndarray
+    coef_cv: np.ndarray
+    sign_stability: np.ndarray
+    ci_lower: np.ndarray
+    ci_upper: np.ndarray
+    ci_level: float
+    feature_names: Optional[List[str]] = None
+    full_coef: Optional[np.ndarray] = field(default=None, repr=False)
+    compliance_rates: Optional[np.ndarray] = None
+    constraint_names: Optional[List[str]] = None
+    violation_frequency: Optional[np.ndarray] = None
+
+    @property
+    def n_bootstrap(self) -> int:
+        return self.coefs.shape[0]
+
+    @property
+    def avg_cv(self) -> float:
+        return float(self.coef_cv.mean())
+
+    @property
+    def avg_sign_stability(self) -> float:
+        return float(self.sign_stability.mean())
+
+    @property
+    def avg_compliance(self) -> Optional[float]:
+        """Mean per-replicate compliance rate (percent)."""
+        if self.compliance_rates is None:
+            return None
+        return float(self.compliance_rates.mean())
+
+    @property
+    def full_compliance_share(self) -> Optional[float]:
+        """Share of replicates satisfying every constraint."""
+        if self.compliance_rates is None:
+            return None
+        return float(np.mean(self.compliance_rates >= 100.0))
+
+    def constraint_satisfaction(self) -> Dict[str, float]:
+        """Share of replicates satisfying each constraint, by feature."""
+        if self.violation_frequency is None:
+            return {}
+        return {name: float(1.0 - freq)
+                for name, freq in zip(self.constraint_names, self.violation_frequency)}
+
+    def n_stable(self, cv_threshold: float = 0.15) -> int:
+        """Number of features whose CV is below ``cv_threshold``."""
+        return int(np.sum(self.coef_cv < cv_threshold))
+
+    def summary(self) -> pd.DataFrame:
+        """Per-feature stability table (one row per coefficient)."""
+        names = self.feature_names or [f'x{j}' for j in range(self.coefs.shape[1])]
+        return pd.DataFrame({
+            'feature': names,
+            'mean': self.coef_mean,
+            'std': self.coef_std,
+            'cv': self.coef_cv,
+            'sign_stability': self.sign_stability,
+            'ci_lower': self.ci_lower,
+            'ci_upper': self.ci_upper,
+        })
+
+
+def coefficient_statistics(coefs: np.ndarray, ci: float = 95.0) -> Dict[str, np.ndarray]:
+    """
+    Compute stability statistics for a (B x p) matrix of coefficient draws.
+
+    Args:
+        coefs: Bootstrap coefficients, one replicate per row
+        ci: Confidence level (in percent) for the percentile intervals
+
+    Returns:
+        Dictionary with mean, std, cv, sign_stability, ci_lower and ci_upper
+    """
+    coefs = np.asarray(coefs)
+    coef_mean = coefs.mean(axis=0)
+    coef_std = coefs.std(axis=0)
+    coef_cv = coef_std / (np.abs(coef_mean) + 1e-10)
+
+    # Share of replicates agreeing with the modal sign of each coefficient
+    sign_shares = np.stack([
+        (coefs > 0).mean(axis=0),
+        (coefs < 0).mean(axis=0),
+        (coefs == 0).mean(axis=0),
+    ])
+    sign_stability = sign_shares.max(axis=0)
+
+    tail = (100.0 - ci) / 2.0
+    ci_lower, ci_upper = np.percentile(coefs, [tail, 100.0 - tail], axis=0)
+
+    return {
+        'coef_mean': coef_mean,
+        'coef_std': coef_std,
+        'coef_cv': coef_cv,
+        'sign_stability': sign_stability,
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+    }
+
+
+def draw_bootstrap_indices(n_samples: int, n_bootstrap: int,
+                           random_state: Optional[int] = None) -> np.ndarray:
+    """Draw a (n_bootstrap x n_samples) matrix of resample row indices."""
+    rng = np.random.default_rng(random_state)
+    dtype = np.int32 if n_samples < np.iinfo(np.int32).max else np.int64
+    return rng.integers(0, n_samples, size=(n_bootstrap, n_samples), dtype=dtype)
+
+
+def draw_bootstrap_weights(n_samples: int, method: str,
+                           rng: np.random.Generator) -> np.ndarray:
+    """
+    Draw one replicate's sample weights for the weighted bootstrap.
+
+    Multinomial weights are resample counts (``bincount`` of n uniform
+    draws), so fitting with them reproduces the resampling bootstrap.
+    """
+    if method == 'multinomial':
+        draws = rng.integers(0, n_samples, size=n_samples)
+        return np.bincount(draws, minlength=n_samples).astype(np.float64)
+    if method == 'poisson':
+        return rng.poisson(1.0, size=n_samples).astype(np.float64)
+    raise ValueError(f"Unknown weighting scheme: {method!r}")
+
+
+@contextmanager
+def shared_readonly_array(X: np.ndarray, temp_folder: Optional[str] = None):
+    """
+    Yield the path of a read-only ``.npy`` copy of ``X`` for worker processes.
+
+    Workers open it with ``np.load(path, mmap_mode='r')``, so the operating
+    system shares a single physical copy of the matrix between all of them.
+    """
+    with tempfile.TemporaryDirectory(prefix='econkd-', dir=temp_folder) as tmp:
+        path = os.path.join(tmp, 'X.npy')
+        np.save(path, X)
+        yield path
+
+
+def _fit_weighted_batch(X_path: str, y: np.ndarray, seeds: Sequence,
+                        method: str, params: Dict[str, Any],
+                        coef_init: Optional[np.ndarray],
+                        intercept_init: Optional[np.ndarray]):
+    """Fit one weighted replicate per seed against the memory-mapped ``X``."""
+    X = np.load(X_path, mmap_mode='r')
+    coefs = np.empty((len(seeds), X.shape[1]))
+    intercepts = np.empty(len(seeds))
+
+    for i, seed in enumerate(seeds):
+        weights = draw_bootstrap_weights(len(y), method, np.random.default_rng(seed))
+        student = LogisticRegression(**params)
+        if coef_init is not None:
+            student.set_params(warm_start=True)
+            student.coef_ = coef_init.copy()
+            student.intercept_ = intercept_init.copy()
+        student.fit(X, y, sample_weight=weights)
+        coefs[i] = student.coef_[0]
+        intercepts[i] = student.intercept_[0]
+
+    return coefs, intercepts
+
+
+def _fit_batch(X: np.ndarray, y: np.ndarray, indices: np.ndarray,
+               params: Dict[str, Any], coef_init: Optional[np.ndarray],
+               intercept_init: Optional[np.ndarray]):
+    """Fit one student per row of ``indices`` (runs inside a worker)."""
+    coefs = np.empty((len(indices), X.shape[1]))
+    intercepts = np.empty(len(indices))
+
+    for i, rows in enumerate(indices):
+        student = LogisticRegression(**params)
+        if coef_init is not None:
+            student.set_params(warm_start=True)
+            student.coef_ = coef_init.copy()
+            student.intercept_ = intercept_init.copy()
+        student.fit(X[rows], y[rows])
+        coefs[i] = student.coef_[0]
+        intercepts[i] = student.intercept_[0]
+
+    return coefs, intercepts
+
+
+def bootstrap_coefficients(
+    X,
+    y,
+    n_bootstrap: int = 500,
+    student_params: Optional[Dict[str, Any]] = None,
+    method: str = 'resample',
+    n_jobs: int = -1,
+    batch_size: Optional[int] = None,
+    warm_start: bool = True,
+    ci: float = 95.0,
+    random_state: Optional[int] = None,
+    feature_names: Optional[Sequence[str]] = None,
+    temp_folder: Optional[str] = None,
+    constraints: Union[ConstraintSet, Mapping[str, Mapping[str, Any]], None] = None,
+) -> BootstrapResult:
+    """
+    Bootstrap logistic-regression student coefficients in parallel.
+
+    Args:
+        X: Training features (DataFrame or array, n x p)
+        y: Binary training labels (n,)
+        n_bootstrap: Number of bootstrap replicates
+        student_params: Keyword arguments for ``LogisticRegression``
+        method: 'resample' (copy rows per replicate), or 'multinomial' /
+            'poisson' (sample weights over one shared memory-mapped matrix)
+        n_jobs: Worker processes (joblib convention, -1 = all cores)
+        batch_size: Replicates per task; defaults to an even split over workers
+        warm_start: Initialise each fit from the full-data coefficients
+        ci: Confidence level (in percent) for percentile intervals
+        random_state: Seed for the resample indices / replicate weights
+        feature_names: Coefficient names; taken from ``X.columns`` if omitted
+        temp_folder: Directory for the shared matrix in weighted modes
+        constraints: Economic constraints (dict or compiled ConstraintSet);
+            when given, per-replicate compliance rates and per-constraint
+            violation frequencies are computed from the stacked coefficients
+
+    Returns:
+        BootstrapResult with the (B x p) coefficient matrix and statistics
+
+    Example:
+        >>> result = bootstrap_coefficients(X_train_scaled, y_train, 500)
+        >>> print(f"Average CV: {result.avg_cv:.3f}")
+    """
+    if method not in BOOTSTRAP_METHODS:
+        raise ValueError(
+            f"method must be one of {BOOTSTRAP_METHODS}, got {method!r}"
+        )
+    if feature_names is None and hasattr(X, 'columns'):
+        feature_names = list(X.columns)
+    X = np.ascontiguousarray(as_design_matrix(X))
+    y = np.asarray(y)
+    params = {**DEFAULT_STUDENT_PARAMS, **(student_params or {})}
+
+    full_model = LogisticRegression(**params).fit(X, y)
+    coef_init = full_model.coef_ if warm_start else None
+    intercept_init = full_model.intercept_ if warm_start else None
+
+    if batch_size is None:
+        n_workers = max(1, effective_n_jobs(n_jobs))
+        batch_size = max(1, int(np.ceil(n_bootstrap / n_workers)))
+    starts = range(0, n_bootstrap, batch_size)
+
+    if method == 'resample':
+        indices = draw_bootstrap_indices(len(X), n_bootstrap, random_state)
+        outputs = Parallel(n_jobs=n_jobs)(
+            delayed(_fit_batch)(X, y, indices[start:start + batch_size],
+                                params, coef_init, intercept_init)
+            for start in starts
+        )
+    else:
+        # Weight vectors are generated inside the workers from spawned seeds,
+        # so neither a (B x n) weight matrix nor copies of X are materialized
+        seeds = np.random.SeedSequence(random_state).spawn(n_bootstrap)
+        with shared_readonly_array(X, temp_folder) as X_path:
+            outputs = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_weighted_batch)(X_path, y, seeds[start:start + batch_size],
+                                             method, params, coef_init, intercept_init)
+                for start in starts
+            )
+
+    coefs = np.concatenate([out[0] for out in outputs])
+    intercepts = np.concatenate([out[1] for out in outputs])
+
+    compliance = {}
+    if constraints is not None:
+        if not isinstance(constraints, ConstraintSet):
+            names = feature_names if feature_names is not None else \
+                [f'x{j}' for j in range(X.shape[1])]
+            constraints = ConstraintSet.compile(constraints, names)
+        # One vectorized pass over the (B x p) matrix, no extra refits
+        satisfied = constraints.satisfied(coefs)
+        compliance = {
+            'compliance_rates': constraints.compliance_rate(coefs),
+            'constraint_names': list(constraints.names),
+            'violation_frequency': 1.0 - satisfied.mean(axis=0),
+        }
+
+    return BootstrapResult(
+        coefs=coefs,
+        intercepts=intercepts,
+        ci_level=ci,
+        feature_names=list(feature_names) if feature_names is not None else None,
+        full_coef=full_model.coef_[0].copy(),
+        **compliance,
+        **coefficient_statistics(coefs, ci),
+    )
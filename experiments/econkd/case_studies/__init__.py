@@ -0,0 +1,59 @@
+"""
+Case Studies
+============
+
+Each case study module exposes ``default_config()``, ``prepare(config)``
+(sections 1-4: load, preprocess, constraints, split) and
+``run(config, verbose=True, data=None)`` returning an ``ExperimentResult``.
+``fit_teacher`` runs only the teacher step, as its own pipeline stage.
+"""
+
+import json
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, Union
+
+from ..experiment import teacher_soft_targets
+from . import adult_income, german_credit
+
+CASE_STUDIES: Dict[str, ModuleType] = {
+    german_credit.NAME: german_credit,
+    adult_income.NAME: adult_income,
+}
+
+
+def get_case_study(name: str) -> ModuleType:
+    """Look up a case study module by name (e.g. 'german_credit')."""
+    try:
+        return CASE_STUDIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown case study {name!r}; "
+                         f"available: {sorted(CASE_STUDIES)}") from None
+
+
+def fit_teacher(name: str, marker: Union[str, Path]) -> None:
+    """
+    Fit a case study's teacher into the ``SoftTargetStore``.
+
+    Prepares the data of the default configuration, fits (or finds) the
+    teacher and its soft targets and writes ``marker``, a small JSON with
+    the store key, so the pipeline can order and skip the stage by file
+    times. ``run`` then reads the soft targets and the fitted teacher from
+    the store instead of fitting them.
+    """
+    module = get_case_study(name)
+    config = module.default_config()
+    start = time.perf_counter()
+    data = module.prepare(config, verbose=False)
+    targets = teacher_soft_targets(config, data)
+
+    marker = Path(marker)
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    with open(marker, 'w') as f:
+        json.dump({'case_study': name, 'key': targets.key,
+                   'from_cache': targets.from_cache,
+                   'seconds': time.perf_counter() - start}, f, indent=2)
+
+
+__all__ = ['CASE_STUDIES', 'adult_income', 'german_credit', 'fit_teacher', 'get_case_study']
@@ -0,0 +1,434 @@
+"""
+Adult Income Case Study
+=======================
+
+Labor economics (paper Section 5.3): Random Forest teacher distilled into a
+logistic student with an education monotonicity constraint on the US Census
+1994 data (``adult`` v2 on OpenML, 48,842 individuals, target income >50K).
+Focus: marginal effects of education on the probability of high income.
+
+Example:
+    >>> from econkd.case_studies import adult_income
+    >>> result = adult_income.run(adult_income.default_config(save=False))
+    >>> result.results['marginal_effects']['ame']
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, roc_auc_score
+
+from ..bootstrap import bootstrap_coefficients
+from ..constraints import ConstraintSet
+from ..distiller import EconomicDistiller
+from ..experiment import (
+    ExperimentConfig,
+    ExperimentResult,
+    PreparedData,
+    format_percent,
+    get_logger,
+    prepare_data,
+    save_results,
+    seed_everything,
+    teacher_soft_targets,
+)
+from ..marginal_effects import logistic_covariance, marginal_effects
+from ..preprocessing import FeaturePipeline
+from ..profiling import StageProfiler
+
+NAME = 'adult_income'
+
+# Numeric education levels, used when only the categorical column exists
+EDUCATION_MAPPING = {
+    'Preschool': 1, '1st-4th': 2, '5th-6th': 3, '7th-8th': 4,
+    '9th': 5, '10th': 6, '11th': 7, '12th': 8,
+    'HS-grad': 9, 'Some-college': 10, 'Assoc-voc': 11,
+    'Assoc-acdm': 12, 'Bachelors': 13, 'Masters': 14, 'Doctorate': 15
+}
+
+
+def default_config(**overrides) -> ExperimentConfig:
+    """Configuration reproducing the paper's Adult Income results."""
+    config = ExperimentConfig(
+        case_study=NAME,
+        dataset='adult',
+        dataset_version=2,
+        positive_label='>50K',
+        teacher={
+            'type': 'RandomForestClassifier',
+            'params': {'n_estimators': 100, 'max_depth': 15,
+                       'min_samples_split': 10, 'n_jobs': -1},
+        },
+        baseline={'max_iter': 1000},
+        # Constraints are exact bounds, so there is no β (it only weights
+        # constraint_mode='penalty')
+        student={'temperature': 2.0, 'alpha': 0.5, 'gamma': 0.2, 'C': 0.5},
+        n_bootstrap=500,
+        # Weighted resampling, no per-replicate copies of the 34k-row matrix
+        bootstrap_method='multinomial',
+    )
+    return config.replace(**overrides)
+
+
+def build_preprocessor(X: pd.DataFrame) -> FeaturePipeline:
+    """Categorical codes, a numeric ``education_level`` and full scaling."""
+    derived = {}
+    if 'education-num' in X.columns:
+        derived['education_level'] = {'op': 'copy', 'source': 'education-num'}
+    elif 'education' in X.columns:
+        derived['education_level'] = {
+            'op': 'map', 'source': 'education',
+            'mapping': EDUCATION_MAPPING, 'default': 9
+        }
+    return FeaturePipeline(derived=derived, scale='all')
+
+
+def default_constraints(feature_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Constraints from labor economics theory, for the features present."""
+    constraints = {}
+
+    # Education → Income (POSITIVE - more education = higher income)
+    if 'education_level' in feature_names or 'education-num' in feature_names:
+        edu_col = 'education_level' if 'education_level' in feature_names else 'education-num'
+        constraints[edu_col] = {
+            'type': 'monotonicity',
+            'direction': 'increasing',
+            'justification': 'Human capital theory: more education → higher earnings'
+        }
+
+    theory = {
+        # Age → Income (POSITIVE up to retirement)
+        'age': {
+            'type': 'sign',
+            'sign': +1,  # Generally positive (experience premium)
+            'justification': 'Experience premium in labor markets'
+        },
+        'hours-per-week': {
+            'type': 'sign',
+            'sign': +1,
+            'justification': 'More work hours → higher total income'
+        },
+        'capital-gain': {
+            'type': 'sign',
+            'sign': +1,
+            'justification': 'Capital income indicator of wealth'
+        },
+    }
+    constraints.update({f: c for f, c in theory.items() if f in feature_names})
+    return constraints
+
+
+def prepare(config: Optional[ExperimentConfig] = None, verbose: bool = True,
+            profiler: Optional[StageProfiler] = None) -> PreparedData:
+    """Load, preprocess, constrain and split (sections 1-4)."""
+    return prepare_data(
+        config or default_config(), build_preprocessor, default_constraints,
+        title='Adult Income Dataset', source='UCI ML Repository (US Census 1994)',
+        rate_label='high income', verbose=verbose, profiler=profiler,
+    )
+
+
+def run(config: Optional[ExperimentConfig] = None, verbose: bool = True,
+        data: Optional[PreparedData] = None) -> ExperimentResult:
+    """
+    Run the Adult Income case study.
+
+    Args:
+        config: Experiment configuration (defaults to ``default_config()``)
+        verbose: Print the section-by-section report
+        data: Already prepared data to reuse (skips sections 1-4)
+
+    Returns:
+        ExperimentResult; results and models are written to
+        ``config.output_dir`` when ``config.save`` is True
+    """
+    config = config or default_config()
+    log = get_logger(verbose)
+    seed_everything(config.random_state)
+    profiler = StageProfiler(**config.profiling)
+
+    log("="*80)
+    log("ADULT INCOME DATASET - ECONOMIC DISTILLATION EXPERIMENT")
+    log("Real Data - Labor Economics Validation")
+    log("="*80)
+
+    if data is None:
+        data = prepare(config, verbose=verbose, profiler=profiler)
+    X_train_scaled, X_test_scaled = data.X_train_scaled, data.X_test_scaled
+    n_train = len(X_train_scaled)
+    y_train, y_test = data.y_train, data.y_test
+    economic_constraints = data.constraints
+
+    # ========================================================================
+    # 5. TEACHER: RANDOM FOREST
+    # ========================================================================
+
+    log("\n5. Training TEACHER (Random Forest)...")
+
+    with profiler.stage('teacher', rows=n_train):
+        soft_targets = teacher_soft_targets(config, data)
+        teacher = soft_targets.teacher
+        log(f"   Soft targets: {'cache hit' if soft_targets.from_cache else 'fitted'} "
+            f"({soft_targets.key[:12]})")
+
+        teacher_train_probs = soft_targets['train']
+        teacher_test_probs = soft_targets['test']
+        teacher_test_preds = (teacher_test_probs > 0.5).astype(int)
+
+        teacher_auc = roc_auc_score(y_test, teacher_test_probs)
+        teacher_f1 = f1_score(y_test, teacher_test_preds)
+        teacher_acc = accuracy_score(y_test, teacher_test_preds)
+
+        log(f"   Test AUC:      {teacher_auc:.4f}")
+        log(f"   Test F1:       {teacher_f1:.4f}")
+        log(f"   Test Accuracy: {teacher_acc:.4f}")
+
+    # ========================================================================
+    # 6. BASELINE: LOGISTIC REGRESSION
+    # ========================================================================
+
+    log("\n6. Training BASELINE (Logistic Regression)...")
+
+    with profiler.stage('baseline', rows=n_train):
+        baseline = LogisticRegression(**{'random_state': config.random_state, **config.baseline})
+        baseline.fit(X_train_scaled, y_train)
+
+        baseline_test_probs = baseline.predict_proba(X_test_scaled)[:, 1]
+        baseline_test_preds = baseline.predict(X_test_scaled)
+
+        baseline_auc = roc_auc_score(y_test, baseline_test_probs)
+        baseline_f1 = f1_score(y_test, baseline_test_preds)
+        baseline_acc = accuracy_score(y_test, baseline_test_preds)
+
+        log(f"   Test AUC:      {baseline_auc:.4f}")
+        log(f"   Test F1:       {baseline_f1:.4f}")
+        log(f"   Test Accuracy: {baseline_acc:.4f}")
+
+    # ========================================================================
+    # 7. ECONOMIC KD
+    # ========================================================================
+
+    log("\n7. Training ECONOMIC KD (with constraints)...")
+
+    with profiler.stage('economic_kd', rows=n_train):
+        # L_total = α·L_KD + β·L_constraint + γ·L_hard (docs/METHODOLOGY.md);
+        # sign/monotonicity constraints are enforced as L-BFGS-B box bounds
+        economic_student = EconomicDistiller(constraints=economic_constraints, **config.student)
+        economic_student.fit(X_train_scaled, y_train, teacher_train_probs)
+
+        economic_test_probs = economic_student.predict_proba(X_test_scaled)[:, 1]
+        economic_test_preds = economic_student.predict(X_test_scaled)
+
+        economic_auc = roc_auc_score(y_test, economic_test_probs)
+        economic_f1 = f1_score(y_test, economic_test_preds)
+        economic_acc = accuracy_score(y_test, economic_test_preds)
+
+        log(f"   Test AUC:      {economic_auc:.4f}")
+        log(f"   Test F1:       {economic_f1:.4f}")
+        log(f"   Test Accuracy: {economic_acc:.4f}")
+
+    # ========================================================================
+    # 8. MARGINAL EFFECTS ANALYSIS (Education)
+    # ========================================================================
+
+    log("\n8. Analyzing marginal effects of EDUCATION...")
+    log("   (Key contribution of paper - Section 5.3.3)")
+
+    with profiler.stage('marginal_effects', rows=len(X_test_scaled)):
+        edu_col = next((col for col in ['education_level', 'education-num', 'education']
+                        if col in X_test_scaled.columns), None)
+
+        education_effects = None
+        is_monotonic = None
+
+        if edu_col:
+            # Analytic counterfactual predictions from coef_ (no per-level frame
+            # copies); delta-method standard errors from the Fisher information
+            education_effects = marginal_effects(
+                economic_student, X_test_scaled, edu_col,
+                cov=logistic_covariance(economic_student, X_train_scaled),
+            )
+
+            log(f"\n   Marginal effects by education level:")
+            log(f"   (Probability of high income >50K)")
+            log("   " + "-"*60)
+
+            baseline_effect = education_effects.predictions[0]
+            for level, effect, se in zip(education_effects.values,
+                                         education_effects.predictions,
+                                         education_effects.prediction_se):
+                diff = effect - baseline_effect
+                log(f"   Level {int(level):2d} → P(>50K) = {effect:.3f} ± {se:.3f}  (+{diff*100:+.1f} pp)")
+
+            is_monotonic = education_effects.is_monotonic('increasing')
+
+            log("   " + "-"*60)
+            log(f"   AME (per unit):           {education_effects.ame:.4f} "
+                f"(SE {education_effects.ame_se:.4f})")
+            log(f"   ✅ Monotonicity preserved: {is_monotonic}")
+        else:
+            log("   ⚠️  Education column not found for marginal effects")
+
+    # ========================================================================
+    # 9. COMPLIANCE ANALYSIS
+    # ========================================================================
+
+    log("\n9. Constraint compliance analysis...")
+
+    with profiler.stage('compliance'):
+        # Resolve constraint features to coefficient indices once; sign,
+        # monotonicity and bound constraints are all checked
+        constraint_set = ConstraintSet.compile(economic_constraints, X_train_scaled.columns)
+
+        baseline_compliance = constraint_set.evaluate(baseline.coef_[0]).rate
+        economic_compliance = constraint_set.evaluate(economic_student.coef_[0]).rate
+
+        log(f"   Baseline compliance:    {format_percent(baseline_compliance)}")
+        log(f"   Economic KD compliance: {format_percent(economic_compliance)}")
+
+    # ========================================================================
+    # 10. BOOTSTRAP STABILITY & CONSTRAINT COMPLIANCE
+    # ========================================================================
+
+    log(f"\n10. Bootstrap stability and compliance ({config.n_bootstrap} samples)...")
+
+    with profiler.stage('bootstrap', rows=n_train):
+        # Per-replicate compliance (incl. education monotonicity) is computed
+        # from the stacked coefficients of the same refits used for stability
+        bootstrap = bootstrap_coefficients(
+            X_train_scaled, y_train,
+            n_bootstrap=config.n_bootstrap,
+            method=config.bootstrap_method,
+            student_params={'max_iter': 1000, 'random_state': config.random_state},
+            n_jobs=config.n_jobs,
+            random_state=config.random_state,
+            constraints=constraint_set,
+        )
+
+        constraint_satisfaction = bootstrap.constraint_satisfaction()
+        bootstrap_monotonicity = (constraint_satisfaction.get(edu_col)
+                                  if edu_col in economic_constraints else None)
+
+        log(f"    Average CV:             {bootstrap.avg_cv:.3f}")
+        log(f"    Average Sign Stability: {bootstrap.avg_sign_stability*100:.1f}%")
+        if bootstrap.avg_compliance is not None:
+            log(f"    Bootstrap Compliance:   {bootstrap.avg_compliance:.1f}% "
+                f"(100% in {bootstrap.full_compliance_share*100:.1f}% of replicates)")
+        for feature, share in constraint_satisfaction.items():
+            log(f"       {feature:25} → satisfied in {share*100:.1f}% of replicates")
+
+    # ========================================================================
+    # 11. RESULTS SUMMARY
+    # ========================================================================
+
+    log("\n" + "="*80)
+    log("RESULTS SUMMARY - ADULT INCOME (REAL DATA)")
+    log("="*80)
+
+    results_table = pd.DataFrame({
+        'Model': ['Teacher (RF)', 'Baseline (LR)', 'Economic KD'],
+        'Test AUC': [teacher_auc, baseline_auc, economic_auc],
+        'Test F1': [teacher_f1, baseline_f1, economic_f1],
+        'Compliance': ['N/A', format_percent(baseline_compliance),
+                       format_percent(economic_compliance)]
+    })
+
+    log("\n" + results_table.to_string(index=False))
+
+    log(f"\n📊 KEY METRICS (for paper):")
+    log(f"   Retention vs Teacher:    {economic_auc/teacher_auc*100:.1f}%")
+    log(f"   Gain vs Baseline:        +{(economic_auc - baseline_auc)*100:.1f} pp")
+    if economic_compliance is not None:
+        log(f"   Compliance Rate:         {economic_compliance:.1f}%")
+    if is_monotonic is not None:
+        log(f"   Education Monotonicity:  {'✅ Preserved' if is_monotonic else '❌ Violated'}")
+
+    log(f"\n📖 COMPARISON WITH PAPER (Section 5.3):")
+    log(f"   Expected Retention:      97.8%")
+    log(f"   Expected Compliance:     96%")
+    log(f"   Expected Monotonicity:   100% (bootstrap)")
+    if bootstrap_monotonicity is not None:
+        log(f"   Actual Monotonicity:     {bootstrap_monotonicity*100:.1f}% (bootstrap)")
+
+    effects = education_effects.to_dict() if education_effects is not None else None
+
+    results = {
+        'dataset': 'Adult Income (UCI Census)',
+        'n_samples': len(data.X),
+        'n_train': len(data.X_train),
+        'n_test': len(data.X_test),
+        'high_income_rate': float(data.y.mean()),
+        'models': {
+            'teacher': {
+                'type': 'RandomForest',
+                'test_auc': float(teacher_auc),
+                'test_f1': float(teacher_f1)
+            },
+            'baseline': {
+                'type': 'LogisticRegression',
+                'test_auc': float(baseline_auc),
+                'test_f1': float(baseline_f1),
+                'compliance': (float(baseline_compliance)
+                               if baseline_compliance is not None else None)
+            },
+            'economic_kd': {
+                'type': 'EconomicKD',
+                'test_auc': float(economic_auc),
+                'test_f1': float(economic_f1),
+                'compliance': (float(economic_compliance)
+                               if economic_compliance is not None else None)
+            }
+        },
+        'stability': {
+            'n_bootstrap': config.n_bootstrap,
+            'method': config.bootstrap_method,
+            'avg_cv': bootstrap.avg_cv,
+            'avg_sign_stability': bootstrap.avg_sign_stability,
+            'features_stable': bootstrap.n_stable(),
+            'avg_compliance': bootstrap.avg_compliance,
+            'full_compliance_share': bootstrap.full_compliance_share,
+            'constraint_satisfaction': constraint_satisfaction,
+            'education_monotonicity': bootstrap_monotonicity
+        },
+        'marginal_effects': {
+            'education_monotonic': bool(is_monotonic) if is_monotonic is not None else None,
+            'effects': effects['effects'] if effects else None,
+            'standard_errors': effects['standard_errors'] if effects else None,
+            'ame': effects['ame'] if effects else None,
+            'ame_se': effects['ame_se'] if effects else None
+        }
+    }
+
+    result = ExperimentResult(
+        config=config,
+        results=results,
+        models={
+            'teacher': teacher,
+            'baseline': baseline,
+            'economic_student': economic_student,
+            'preprocessor': data.preprocessor
+        },
+        data=data,
+        profiler=profiler,
+    )
+    results['performance'] = profiler.report()
+
+    # ========================================================================
+    # 12. SAVE RESULTS
+    # ========================================================================
+
+    if config.save:
+        log("\n12. Saving results...")
+        save_results(result, verbose=verbose)
+
+    log("\nStage timings:")
+    log(profiler.summary())
+
+    log("\n" + "="*80)
+    log("✅ EXPERIMENT COMPLETED SUCCESSFULLY!")
+    log("   Labor economics validation with real Census data")
+    log("   Education monotonicity and marginal effects analyzed")
+    log("="*80)
+
+    return result
@@ -0,0 +1,400 @@
+"""
+Command-Line Interface
+======================
+
+``python -m econkd`` (run from ``experiments/``) runs case studies from a
+config without going through the numbered scripts:
+
+    python -m econkd list
+    python -m econkd show-config german_credit > german.json
+    python -m econkd run german_credit --n-bootstrap 100
+    python -m econkd run adult_income --config adult.json --output-dir /tmp/out
+    python -m econkd run german_credit --set student.temperature=4 --set student.C=1.0
+    python -m econkd run adult_income --set dtype=compact
+    python -m econkd sweep german_credit --param temperature=1,2,4 --search halving
+    python -m econkd cv adult_income --folds 5 --inner-folds 3 --output adult_cv.json
+    python -m econkd serve german_credit --port 8080 --shadow-fraction 0.05
+    python -m econkd loadtest german_credit --port 8080 --concurrency 64
+    python -m econkd bench --suite quick --repeat 3
+    python -m econkd bench adult_income 1e6x20 --dtype compact
+    python -m econkd bench --compare benchmarks/abc1234.json benchmarks/def5678.json
+    python -m econkd synth credit --rows 1e7 --extra 20 --break 0.5:duration=0
+
+Several case studies given to ``run`` share one interpreter, so imports and
+the dataset cache are paid once.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import warnings
+from typing import Any, Dict, List, Optional
+
+from .benchmark import STAGES, SUITES, BenchmarkReport, compare_reports, run_benchmarks
+from .case_studies import CASE_STUDIES, get_case_study
+from .crossval import cross_validate_case_study
+from .experiment import ExperimentConfig, format_percent
+from .preprocessing import DTYPES
+from .serving import ScoringServer, fetch_stats, run_load
+from .synthetic import KINDS, SyntheticSpec, write_synthetic
+from .sweep import DEFAULT_SPACE, SEARCH_METHODS, sweep_case_study
+
+
+def _parse_value(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def apply_overrides(config: ExperimentConfig, assignments: List[str]) -> ExperimentConfig:
+    """
+    Apply ``key=value`` overrides; dotted keys reach into dict fields
+    (``student.temperature=4``). Values are parsed as JSON when possible.
+    """
+    values: Dict[str, Any] = config.to_dict()
+    for assignment in assignments:
+        key, sep, raw = assignment.partition('=')
+        if not sep:
+            raise ValueError(f"Override must look like key=value, got {assignment!r}")
+        *parents, leaf = key.split('.')
+        target = values
+        for part in parents:
+            if target.get(part) is None:
+                target[part] = {}
+            target = target[part]
+        target[leaf] = _parse_value(raw)
+    return ExperimentConfig.from_dict(values)
+
+
+def parse_space(params: List[str]) -> Dict[str, List[Any]]:
+    """
+    Parameter space from ``name=v1,v2,...`` entries; without entries the
+    ``DEFAULT_SPACE`` is used.
+    """
+    if not params:
+        return dict(DEFAULT_SPACE)
+    space = {}
+    for param in params:
+        name, sep, raw = param.partition('=')
+        if not sep or not raw:
+            raise ValueError(f"Parameter must look like name=v1,v2,..., got {param!r}")
+        space[name] = [_parse_value(v) for v in raw.split(',')]
+    return space
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m econkd',
+                                     description='Economic Knowledge Distillation case studies')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='list available case studies')
+
+    show = commands.add_parser('show-config', help='print the default config as JSON')
+    show.add_argument('case_study', choices=sorted(CASE_STUDIES))
+
+    run = commands.add_parser('run', help='run one or more case studies')
+    run.add_argument('case_studies', nargs='+', choices=sorted(CASE_STUDIES))
+    run.add_argument('--config', help='JSON config file (single case study only)')
+    run.add_argument('--n-bootstrap', type=int, help='bootstrap replicates')
+    run.add_argument('--output-dir', help='directory for results and models')
+    run.add_argument('--random-state', type=int, help='seed')
+    run.add_argument('--no-save', action='store_true', help='do not write results')
+    run.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                     help='override a config field (dotted keys for dict fields)')
+    run.add_argument('--quiet', action='store_true', help='only print a one-line summary')
+
+    sweep = commands.add_parser('sweep', help='hyperparameter sweep of the Economic KD student')
+    sweep.add_argument('case_study', choices=sorted(CASE_STUDIES))
+    sweep.add_argument('--config', help='JSON config file')
+    sweep.add_argument('--param', action='append', default=[], metavar='NAME=V1,V2,...',
+                       help='values to search for one student parameter')
+    sweep.add_argument('--search', choices=SEARCH_METHODS, default='grid')
+    sweep.add_argument('--n-iter', type=int, help='candidates for random / halving search')
+    sweep.add_argument('--min-resources', type=int,
+                       help='training rows in the first halving rung')
+    sweep.add_argument('--metric', default='val_auc', help='column used to rank trials')
+    sweep.add_argument('--n-jobs', type=int, help='worker processes')
+    sweep.add_argument('--no-warm-start', action='store_true',
+                       help='fit every trial from scratch')
+    sweep.add_argument('--output', help='CSV file for the trial table')
+    sweep.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                       help='override a config field (dotted keys for dict fields)')
+
+    cv = commands.add_parser('cv', help='K-fold distillation with out-of-fold soft targets')
+    cv.add_argument('case_study', choices=sorted(CASE_STUDIES))
+    cv.add_argument('--config', help='JSON config file')
+    cv.add_argument('--folds', type=int, default=5, help='outer folds')
+    cv.add_argument('--inner-folds', type=int, default=3,
+                    help='folds producing the soft targets inside each outer fold')
+    cv.add_argument('--repeats', type=int, default=1, help='repetitions of the outer split')
+    cv.add_argument('--n-jobs', type=int, help='worker processes (one fold each)')
+    cv.add_argument('--ci', type=float, default=95.0, help='confidence level in percent')
+    cv.add_argument('--output', help='JSON file for the fold table and intervals')
+    cv.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                    help='override a config field (dotted keys for dict fields)')
+
+    serve = commands.add_parser('serve', help='micro-batching HTTP scoring server')
+    serve.add_argument('case_study', choices=sorted(CASE_STUDIES))
+    serve.add_argument('--results-dir', help='directory with <case>_scorer.json')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8080)
+    serve.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead')
+    serve.add_argument('--max-batch-size', type=int, default=1024)
+    serve.add_argument('--max-wait-ms', type=float, default=2.0)
+    serve.add_argument('--shadow-fraction', type=float, default=0.0,
+                       help='fraction of rows also scored by the teacher')
+
+    load = commands.add_parser('loadtest', help='load generator for a running scoring server')
+    load.add_argument('case_study', choices=sorted(CASE_STUDIES))
+    load.add_argument('--host', default='127.0.0.1')
+    load.add_argument('--port', type=int, default=8080)
+    load.add_argument('--unix', metavar='PATH', help='connect to a Unix socket instead')
+    load.add_argument('--requests', type=int, default=10000)
+    load.add_argument('--concurrency', type=int, default=64)
+    load.add_argument('--rows-per-request', type=int, default=1)
+
+    bench = commands.add_parser('bench', help='time and measure every pipeline stage')
+    bench.add_argument('datasets', nargs='*',
+                       help="case studies and/or synthetic '<rows>x<features>' (e.g. 1e6x100)")
+    bench.add_argument('--suite', choices=sorted(SUITES), default='quick',
+                       help='dataset grid used when no datasets are given')
+    bench.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    bench.add_argument('--repeat', type=int, default=1, help='timed runs per stage')
+    bench.add_argument('--n-bootstrap', type=int, default=50)
+    bench.add_argument('--dtype', choices=DTYPES, default='float64',
+                       help='preprocessed feature dtype')
+    bench.add_argument('--in-process', action='store_true',
+                       help='run all datasets in this interpreter')
+    bench.add_argument('--output', help='report JSON (default benchmarks/<commit>.json)')
+    bench.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                       help='compare two saved reports instead of running')
+    bench.add_argument('--threshold', type=float, default=0.10,
+                       help='relative slowdown reported as a regression')
+
+    synth = commands.add_parser('synth', help='generate a synthetic credit / labor dataset')
+    synth.add_argument('kind', choices=KINDS)
+    synth.add_argument('--rows', type=float, default=1e6, help='number of rows (e.g. 1e7)')
+    synth.add_argument('--extra', type=int, default=0, help='additional Gaussian features')
+    synth.add_argument('--categorical', action='append', default=[], metavar='NAME=LEVELS',
+                       help='cardinality of a categorical column (0 drops it)')
+    synth.add_argument('--break', dest='breaks', action='append', default=[],
+                       metavar='FRACTION:COL=COEF[,COL=COEF]',
+                       help='structural break from that fraction of the rows on')
+    synth.add_argument('--periods', type=int, default=120)
+    synth.add_argument('--chunk-size', type=int, default=1_000_000)
+    synth.add_argument('--seed', type=int, default=0)
+    synth.add_argument('--name', help='dataset name (default synthetic-<kind>-<rows>)')
+    synth.add_argument('--cache-dir', help='dataset cache root (default experiments/data)')
+    synth.add_argument('--parquet', metavar='DIR', help='write chunked Parquet to DIR instead')
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    warnings.filterwarnings('ignore')
+
+    if args.command == 'list':
+        for name, module in CASE_STUDIES.items():
+            print(f"{name:15} {module.__doc__.strip().splitlines()[0]}")
+        return 0
+
+    if args.command == 'show-config':
+        print(json.dumps(get_case_study(args.case_study).default_config().to_dict(), indent=2))
+        return 0
+
+    if args.command == 'sweep':
+        return _sweep(args)
+
+    if args.command == 'cv':
+        return _cv(args)
+
+    if args.command == 'serve':
+        return _serve(args)
+
+    if args.command == 'loadtest':
+        return _loadtest(args)
+
+    if args.command == 'bench':
+        return _bench(args)
+
+    if args.command == 'synth':
+        return _synth(args)
+
+    if args.config and len(args.case_studies) > 1:
+        raise SystemExit('--config can only be used with a single case study')
+
+    for name in args.case_studies:
+        module = get_case_study(name)
+        config = (ExperimentConfig.load_json(args.config) if args.config
+                  else module.default_config())
+        if args.n_bootstrap is not None:
+            config = config.replace(n_bootstrap=args.n_bootstrap)
+        if args.output_dir is not None:
+            config = config.replace(output_dir=args.output_dir)
+        if args.random_state is not None:
+            config = config.replace(random_state=args.random_state)
+        if args.no_save:
+            config = config.replace(save=False)
+        config = apply_overrides(config, args.set)
+
+        result = module.run(config, verbose=not args.quiet)
+        if args.quiet:
+            kd = result.results['models']['economic_kd']
+            print(f"{name}: economic KD test AUC {kd['test_auc']:.4f}, "
+                  f"compliance {format_percent(kd.get('compliance'))}"
+                  + (f" → {result.results_path}" if result.results_path else ''))
+    return 0
+
+
+def _sweep(args: argparse.Namespace) -> int:
+    module = get_case_study(args.case_study)
+    config = (ExperimentConfig.load_json(args.config) if args.config
+              else module.default_config())
+    config = apply_overrides(config, args.set)
+
+    kwargs: Dict[str, Any] = {'search': args.search, 'metric': args.metric,
+                              'warm_start': not args.no_warm_start}
+    if args.n_iter is not None:
+        kwargs['n_iter'] = args.n_iter
+    if args.min_resources is not None:
+        kwargs['min_resources'] = args.min_resources
+    if args.n_jobs is not None:
+        kwargs['n_jobs'] = args.n_jobs
+
+    result = sweep_case_study(module, config, space=parse_space(args.param), **kwargs)
+    final = result.final
+    print(f"{args.case_study}: {len(result.table)} trials ({args.search}), "
+          f"{len(final)} on the full training split, "
+          f"{result.table['fit_time'].sum():.1f}s fitting")
+    if args.search == 'halving':
+        print(f"Halving rungs (training rows): {result.resources}")
+
+    columns = result.params + [c for c in (result.metric, 'test_auc', 'compliance', 'fit_time')
+                               if c in final.columns]
+    print(f"\nBest by {result.metric}:")
+    print(result.best().to_frame().T[columns].to_string(index=False))
+    print("\nPareto front:")
+    print(result.pareto_front()[columns].to_string(index=False))
+
+    if args.output:
+        result.table.to_csv(args.output, index=False)
+        print(f"\nTrials saved to: {args.output}")
+    return 0
+
+
+def _cv(args: argparse.Namespace) -> int:
+    module = get_case_study(args.case_study)
+    config = (ExperimentConfig.load_json(args.config) if args.config
+              else module.default_config())
+    config = apply_overrides(config, args.set)
+
+    kwargs: Dict[str, Any] = {'n_folds': args.folds, 'inner_folds': args.inner_folds,
+                              'n_repeats': args.repeats, 'ci': args.ci}
+    if args.n_jobs is not None:
+        kwargs['n_jobs'] = args.n_jobs
+
+    result = cross_validate_case_study(module, config, **kwargs)
+    print(f"{args.case_study}: {result.n_folds} folds ({args.folds}-fold x {args.repeats}, "
+          f"{args.inner_folds}-fold out-of-fold soft targets)")
+    print(f"\nFold metrics ({args.ci:g}% t-intervals):")
+    print(result.metrics().to_string(float_format=lambda v: f'{v:.4f}'))
+    print("\nPooled out-of-fold AUC: " + ', '.join(
+        f'{model} {auc:.4f}' for model, auc in result.pooled_auc().items()))
+    print("\nEconomic KD coefficients across folds:")
+    print(result.coefficient_summary().to_string(index=False,
+                                                 float_format=lambda v: f'{v:.4f}'))
+
+    if args.output:
+        print(f"\nResults saved to: {result.save(args.output)}")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    server = ScoringServer.from_results(args.case_study, args.results_dir,
+                                        shadow_fraction=args.shadow_fraction,
+                                        max_batch_size=args.max_batch_size,
+                                        max_wait_ms=args.max_wait_ms)
+    where = args.unix or f'http://{args.host}:{args.port}'
+    print(f"Serving {args.case_study} on {where} (POST /score, GET /stats)")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    print(json.dumps(server.stats(), indent=2))
+    return 0
+
+
+def _loadtest(args: argparse.Namespace) -> int:
+    data = get_case_study(args.case_study).prepare(verbose=False)
+    records = json.loads(data.X_test.to_json(orient='records'))
+    report = asyncio.run(run_load(records, n_requests=args.requests,
+                                  concurrency=args.concurrency,
+                                  rows_per_request=args.rows_per_request,
+                                  host=args.host, port=args.port, unix_path=args.unix))
+    print(f"{report.requests} requests ({report.rows} rows), {report.errors} errors "
+          f"in {report.seconds:.2f}s: {report.requests_per_s:,.0f} req/s, "
+          f"{report.rows_per_s:,.0f} rows/s, "
+          f"p50 {report.p50_ms:.2f} ms, p99 {report.p99_ms:.2f} ms")
+    stats = asyncio.run(fetch_stats(args.host, args.port, args.unix))
+    print("\nServer:")
+    print(json.dumps(stats, indent=2))
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    if args.compare:
+        baseline, current = (BenchmarkReport.load(path) for path in args.compare)
+        table = compare_reports(baseline, current, threshold=args.threshold)
+        print(table.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+        slower = table[table['status'] == 'slower']
+        print(f"\n{len(slower)} of {len(table)} stages slower by more than "
+              f"{args.threshold:.0%}")
+        return 1 if len(slower) else 0
+
+    report = run_benchmarks(args.datasets or SUITES[args.suite], stages=args.stages,
+                            repeat=args.repeat, n_bootstrap=args.n_bootstrap,
+                            dtype=args.dtype, isolate=not args.in_process)
+    path = report.save(args.output or report.default_path())
+    print(f"\nReport saved to: {path}")
+    return 0
+
+
+def parse_break(text: str):
+    """``'0.5:duration=0,age=-0.1'`` → ``(0.5, {'duration': 0.0, 'age': -0.1})``."""
+    at, _, changes = text.partition(':')
+    try:
+        return float(at), {key: float(value) for key, value in
+                           (item.split('=', 1) for item in changes.split(','))}
+    except ValueError:
+        raise SystemExit(f'Invalid --break {text!r}; expected FRACTION:COL=COEF[,COL=COEF]')
+
+
+def _synth(args: argparse.Namespace) -> int:
+    cardinalities = {}
+    for item in args.categorical:
+        name, _, levels = item.partition('=')
+        cardinalities[name] = int(levels)
+    spec = SyntheticSpec(args.kind, n_rows=int(args.rows), n_extra=args.extra,
+                         cardinalities=cardinalities or None,
+                         breaks=[parse_break(text) for text in args.breaks],
+                         n_periods=args.periods, chunk_size=args.chunk_size,
+                         random_state=args.seed)
+    fmt = 'parquet' if args.parquet else 'npy'
+    name = write_synthetic(spec, name=args.name, cache_dir=args.cache_dir, format=fmt,
+                           directory=args.parquet)
+    print(f"{name}: {spec.n_rows:,} rows, {len(spec.columns)} features "
+          f"({len(spec.truth().regimes)} regime(s))")
+    if fmt == 'npy':
+        case_study = 'german_credit' if args.kind == 'credit' else 'adult_income'
+        print(f"Run a case study on it with:\n  python -m econkd run {case_study} "
+              f"--set dataset={name} --set dataset_version=1"
+              + (f" --set cache_dir={args.cache_dir}" if args.cache_dir else ''))
+    else:
+        print(f"Parquet chunks written to: {args.parquet}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
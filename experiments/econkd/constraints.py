@@ -0,0 +1,185 @@
+"""
+Compiled Economic Constraints
+=============================
+
+``ConstraintSet`` resolves an ``economic_constraints`` dict (as defined in
+the experiments) against the model's feature names once, and stores the
+result as NumPy arrays. Compliance can then be evaluated for a single
+coefficient vector or a whole (B x p) matrix of coefficients (bootstrap
+replicates, hyperparameter candidates) in one vectorized call.
+
+Supported constraint types (docs/METHODOLOGY.md, "Economic Constraints"):
+
+- ``{'type': 'sign', 'sign': ±1}``
+- ``{'type': 'monotonicity', 'direction': 'increasing' | 'decreasing'}``;
+  for a linear student this is the corresponding coefficient sign
+- ``{'type': 'bounds', 'lower': β_min, 'upper': β_max}`` (alias
+  ``'magnitude'``); either bound may be omitted
+
+A sign constraint is satisfied only when ``sign(β)`` equals the expected
+sign, as in the original per-experiment checks: a coefficient shrunk or
+clamped exactly to zero (``EconomicDistiller`` in bounds mode pins violators
+at 0) has no effect in the expected direction and counts as a violation.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+CONSTRAINT_TYPES = ('sign', 'monotonicity', 'bounds', 'magnitude')
+
+
+@dataclass
+class ComplianceReport:
+    """
+    Result of ``ConstraintSet.evaluate``.
+
+    For a single coefficient vector ``rate`` is a float and ``satisfied`` has
+    shape (k,); for a (B x p) matrix ``rate`` has shape (B,) and
+    ``satisfied`` (B x k). Rates are percentages, as in the experiments.
+    """
+
+    rate: Any
+    satisfied: np.ndarray
+    violations: List[Dict[str, Any]]
+
+
+@dataclass
+class ConstraintSet:
+    """Economic constraints resolved to column indices and NumPy arrays."""
+
+    feature_names: List[str]
+    names: List[str]
+    kinds: List[str]
+    indices: np.ndarray
+    signs: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+
+    @classmethod
+    def compile(cls, constraints: Mapping[str, Mapping[str, Any]],
+                feature_names: Sequence[str]) -> 'ConstraintSet':
+        """
+        Resolve constraints against ``feature_names``.
+
+        Constraints on features that are not present are skipped, matching
+        the behaviour of the original per-experiment compliance checks.
+
+        Args:
+            constraints: ``economic_constraints`` dict keyed by feature name
+            feature_names: Model column names, in coefficient order
+
+        Returns:
+            ConstraintSet
+
+        Example:
+            >>> cs = ConstraintSet.compile(economic_constraints, X_train_scaled.columns)
+            >>> cs.evaluate(model.coef_[0]).rate
+        """
+        feature_names = [str(f) for f in feature_names]
+        positions = {name: j for j, name in enumerate(feature_names)}
+
+        names, kinds, indices, signs, lower, upper = [], [], [], [], [], []
+        for feature, constraint in constraints.items():
+            j = positions.get(feature)
+            if j is None:
+                continue
+            kind = constraint['type']
+            if kind not in CONSTRAINT_TYPES:
+                raise ValueError(f"Unknown constraint type for '{feature}': {kind!r}")
+
+            sign, lo, hi = 0.0, -np.inf, np.inf
+            if kind == 'sign':
+                sign = float(np.sign(constraint['sign']))
+            elif kind == 'monotonicity':
+                sign = 1.0 if constraint['direction'] == 'increasing' else -1.0
+            else:
+                lo = float(constraint.get('lower', -np.inf))
+                hi = float(constraint.get('upper', np.inf))
+
+            names.append(feature)
+            kinds.append(kind)
+            indices.append(j)
+            signs.append(sign)
+            lower.append(lo)
+            upper.append(hi)
+
+        return cls(
+            feature_names=feature_names,
+            names=names,
+            kinds=kinds,
+            indices=np.asarray(indices, dtype=np.intp),
+            signs=np.asarray(signs, dtype=np.float64),
+            lower=np.asarray(lower, dtype=np.float64),
+            upper=np.asarray(upper, dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def dense_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-coefficient (signs, lower, upper) arrays of length n_features.
+
+        Unconstrained coefficients get sign 0 and infinite bounds.
+        """
+        n_features = len(self.feature_names)
+        signs = np.zeros(n_features)
+        lower = np.full(n_features, -np.inf)
+        upper = np.full(n_features, np.inf)
+        signs[self.indices] = self.signs
+        lower[self.indices] = self.lower
+        upper[self.indices] = self.upper
+        return signs, lower, upper
+
+    def satisfied(self, coefs: np.ndarray) -> np.ndarray:
+        """
+        Boolean satisfaction mask for (p,) or (B x p) coefficients.
+
+        Returns:
+            Array of shape (k,) or (B x k), one column per constraint
+        """
+        selected = np.asarray(coefs)[..., self.indices]
+        sign_ok = (self.signs == 0) | (self.signs * selected > 0)
+        bound_ok = (selected >= self.lower) & (selected <= self.upper)
+        return sign_ok & bound_ok
+
+    def compliance_rate(self, coefs: np.ndarray):
+        """
+        Percentage of satisfied constraints (float, or (B,) array).
+
+        None for an empty set: there is no compliance to report, and 0% would
+        read as every constraint being violated.
+        """
+        if len(self) == 0:
+            return None
+        rate = self.satisfied(coefs).mean(axis=-1) * 100
+        return float(rate) if np.ndim(rate) == 0 else rate
+
+    def evaluate(self, coefs: np.ndarray) -> ComplianceReport:
+        """
+        Compliance rate, satisfaction mask and (for a single vector) the list
+        of violated constraints with their coefficients.
+        """
+        coefs = np.asarray(coefs)
+        satisfied = self.satisfied(coefs)
+
+        violations = []
+        if coefs.ndim == 1:
+            for k in np.flatnonzero(~satisfied):
+                violations.append({
+                    'feature': self.names[k],
+                    'type': self.kinds[k],
+                    'expected_sign': int(self.signs[k]),
+                    'actual_sign': int(np.sign(coefs[self.indices[k]])),
+                    'coefficient': float(coefs[self.indices[k]]),
+                    'lower': float(self.lower[k]),
+                    'upper': float(self.upper[k]),
+                })
+
+        return ComplianceReport(
+            rate=self.compliance_rate(coefs),
+            satisfied=satisfied,
+            violations=violations,
+        )
@@ -0,0 +1,217 @@
+"""
+Local Dataset Cache
+===================
+
+Content-addressed on-disk cache for the OpenML datasets used by the case
+studies (``credit-g`` v1 and ``adult`` v2).
+
+The first call downloads and parses the dataset once through
+``fetch_openml`` and stores every column as a raw ``.npy`` file (numeric
+values, or integer codes for categoricals) next to a ``schema.json``
+describing dtypes and category levels. The files live under
+``<cache_dir>/<name>-v<version>/<sha256>/`` and a ``CURRENT`` pointer names
+the digest to use. Later calls read the arrays with ``mmap_mode='r'`` and
+never touch the network.
+
+If the dataset is neither cached nor downloadable, ``DatasetUnavailableError``
+is raised: the experiments no longer substitute synthetic data silently.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent.parent / 'data'
+SCHEMA_FILE = 'schema.json'
+CURRENT_FILE = 'CURRENT'
+TARGET_COLUMN = '__target__'
+
+
+class DatasetUnavailableError(RuntimeError):
+    """Raised when a dataset is not cached and cannot be downloaded."""
+
+
+@dataclass
+class CachedDataset:
+    """A dataset loaded from the local cache."""
+
+    name: str
+    version: int
+    digest: str
+    path: Path
+    X: pd.DataFrame
+    y: pd.Series
+
+
+def _dataset_root(name: str, version: int, cache_dir: Union[str, Path, None]) -> Path:
+    return Path(cache_dir or DEFAULT_CACHE_DIR) / f'{name}-v{version}'
+
+
+def _encode_column(series: pd.Series) -> Tuple[np.ndarray, Dict[str, Any]]:
+    """Turn a column into (array, schema entry) without any string round trip."""
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        categorical = series.astype('category')
+        categories = categorical.cat.categories
+        codes = categorical.cat.codes.to_numpy()
+        return codes, {
+            'name': str(series.name),
+            'kind': 'categorical',
+            'dtype': str(codes.dtype),
+            'categories': [c.item() if hasattr(c, 'item') else c for c in categories],
+            'ordered': bool(categorical.cat.ordered),
+        }
+
+    if pd.api.types.is_extension_array_dtype(series.dtype):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        values = series.to_numpy()
+    return values, {
+        'name': str(series.name),
+        'kind': 'numeric',
+        'dtype': str(values.dtype),
+    }
+
+
+def _decode_column(values: np.ndarray, spec: Dict[str, Any]) -> pd.Series:
+    if spec['kind'] == 'categorical':
+        dtype = pd.CategoricalDtype(spec['categories'], ordered=spec['ordered'])
+        return pd.Series(pd.Categorical.from_codes(values, dtype=dtype), name=spec['name'])
+    return pd.Series(values, name=spec['name'], copy=False)
+
+
+def store_frame(name: str, version: int, X: pd.DataFrame, y: pd.Series,
+                cache_dir: Union[str, Path, None] = None) -> str:
+    """
+    Store a (features, target) pair in the cache and return its digest.
+
+    The digest is a SHA-256 over the schema and the raw bytes of every
+    column, so identical content always maps to the same directory.
+    """
+    columns = [X[col] for col in X.columns] + [y.rename(TARGET_COLUMN)]
+    arrays: List[np.ndarray] = []
+    specs: List[Dict[str, Any]] = []
+    for series in columns:
+        values, spec = _encode_column(series.reset_index(drop=True))
+        arrays.append(np.ascontiguousarray(values))
+        specs.append(spec)
+
+    hasher = hashlib.sha256(json.dumps(specs, sort_keys=True).encode())
+    for values in arrays:
+        hasher.update(values.tobytes())
+    digest = hasher.hexdigest()
+
+    root = _dataset_root(name, version, cache_dir)
+    target = root / digest
+    if not target.exists():
+        root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=root, prefix='.staging-'))
+        try:
+            for i, values in enumerate(arrays):
+                np.save(staging / f'col_{i:04d}.npy', values)
+            schema = {
+                'name': name,
+                'version': version,
+                'digest': digest,
+                'n_rows': int(len(y)),
+                'columns': specs,
+            }
+            with open(staging / SCHEMA_FILE, 'w') as f:
+                json.dump(schema, f, indent=2)
+            os.replace(staging, target)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    with open(root / CURRENT_FILE, 'w') as f:
+        f.write(digest)
+    return digest
+
+
+def load_cached(name: str, version: int, cache_dir: Union[str, Path, None] = None,
+                digest: Optional[str] = None) -> Optional[CachedDataset]:
+    """
+    Load a dataset from the cache without network access.
+
+    Args:
+        name: OpenML dataset name
+        version: OpenML dataset version
+        cache_dir: Cache root (defaults to ``experiments/data``)
+        digest: Specific content digest; defaults to the ``CURRENT`` pointer
+
+    Returns:
+        CachedDataset, or None if nothing is cached for (name, version)
+    """
+    root = _dataset_root(name, version, cache_dir)
+    if digest is None:
+        pointer = root / CURRENT_FILE
+        if not pointer.exists():
+            return None
+        digest = pointer.read_text().strip()
+
+    path = root / digest
+    if not (path / SCHEMA_FILE).exists():
+        return None
+
+    with open(path / SCHEMA_FILE) as f:
+        schema = json.load(f)
+
+    columns = [
+        _decode_column(np.load(path / f'col_{i:04d}.npy', mmap_mode='r'), spec)
+        for i, spec in enumerate(schema['columns'])
+    ]
+    y = columns.pop().rename(None)
+    X = pd.concat(columns, axis=1, copy=False)
+
+    return CachedDataset(name=name, version=version, digest=digest, path=path, X=X, y=y)
+
+
+def load_openml_dataset(name: str, version: int,
+                        cache_dir: Union[str, Path, None] = None,
+                        offline: bool = False) -> CachedDataset:
+    """
+    Load an OpenML dataset, downloading it into the cache on first use.
+
+    Args:
+        name: OpenML dataset name (e.g. 'credit-g', 'adult')
+        version: OpenML dataset version
+        cache_dir: Cache root (defaults to ``experiments/data``)
+        offline: Never attempt a download; fail if the dataset is not cached
+
+    Returns:
+        CachedDataset with the feature frame and the raw target
+
+    Raises:
+        DatasetUnavailableError: If the dataset is not cached and cannot be
+            fetched (no synthetic fallback is substituted)
+
+    Example:
+        >>> data = load_openml_dataset('credit-g', version=1)
+        >>> y = (data.y == 'bad').astype(int)
+    """
+    cached = load_cached(name, version, cache_dir)
+    if cached is not None:
+        return cached
+
+    if offline:
+        raise DatasetUnavailableError(
+            f"Dataset '{name}' v{version} is not in the cache "
+            f"({_dataset_root(name, version, cache_dir)}) and offline=True"
+        )
+
+    try:
+        from sklearn.datasets import fetch_openml
+        data = fetch_openml(name, version=version, as_frame=True, parser='auto')
+    except Exception as e:
+        raise DatasetUnavailableError(
+            f"Could not download OpenML dataset '{name}' v{version}: {e}"
+        ) from e
+
+    digest = store_frame(name, version, data.data, data.target, cache_dir)
+    return load_cached(name, version, cache_dir, digest=digest)
@@ -0,0 +1,330 @@
+"""
+Economic Knowledge Distillation
+===============================
+
+Constrained logistic student distilled from teacher soft targets, minimizing
+the objective from docs/METHODOLOGY.md:
+
+    L_total = α·L_KD + β·L_constraint + γ·L_hard + ||w||² / (2·C·n)
+
+- ``L_KD``: T²-scaled KL divergence between the temperature-softened teacher
+  and student Bernoulli distributions
+- ``L_hard``: binary cross-entropy against the true labels
+- ``L_constraint``: squared-hinge penalties for sign / monotonicity and
+  magnitude-bound violations (squared so the objective stays smooth for
+  L-BFGS)
+
+Loss and gradient are evaluated with two matrix-vector products per
+iteration (``X @ w`` and ``X.T @ g``); there is no per-sample Python loop.
+float32 / compact inputs are not upcast as a whole: the products run over
+cache-sized float64 row blocks (``econkd.preprocessing.linear_predictor``).
+With ``constraint_mode='bounds'`` (default) sign and magnitude constraints are
+enforced exactly as L-BFGS-B box bounds instead of penalties.
+
+For data that does not fit in memory, ``partial_fit`` / ``fit_stream`` train
+the same objective with mini-batch Adam, one chunk at a time, projecting the
+coefficients back onto the box bounds after every step.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.optimize import minimize
+from scipy.special import expit, logit
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from .constraints import ConstraintSet
+from .preprocessing import as_design_matrix, linear_predictor, weighted_sums
+from .teacher_inference import as_compiled
+
+CONSTRAINT_MODES = ('bounds', 'penalty')
+PROB_CLIP = 1e-7
+
+
+def _log_sigmoid(z: np.ndarray) -> np.ndarray:
+    return -np.logaddexp(0.0, -z)
+
+
+class EconomicDistiller(BaseEstimator, ClassifierMixin):
+    """
+    Logistic student trained by constrained knowledge distillation.
+
+    Args:
+        constraints: Economic constraints keyed by feature name (same format
+            as ``economic_constraints`` in the experiments)
+        temperature: Distillation temperature T
+        alpha: Weight on the distillation loss L_KD
+        beta: Weight on the constraint penalty L_constraint; used only with
+            ``constraint_mode='penalty'``
+        gamma: Weight on the hard-label loss L_hard
+        C: Inverse L2 strength, same convention as ``LogisticRegression``
+        constraint_mode: 'bounds' (exact, via L-BFGS-B box bounds) or
+            'penalty' (soft, weighted by ``beta``)
+        fit_intercept: Whether to fit an (unconstrained) intercept
+        max_iter: Maximum L-BFGS-B iterations
+        tol: Projected-gradient tolerance for L-BFGS-B
+        learning_rate: Adam step size for ``partial_fit`` / ``fit_stream``
+        batch_size: Mini-batch size used by ``partial_fit``
+
+    Example:
+        >>> student = EconomicDistiller(constraints=economic_constraints)
+        >>> student.fit(X_train_scaled, y_train, teacher_train_probs)
+        >>> probs = student.predict_proba(X_test_scaled)[:, 1]
+    """
+
+    def __init__(self, constraints: Optional[Dict[str, Dict[str, Any]]] = None,
+                 temperature: float = 2.0, alpha: float = 0.5, beta: float = 0.3,
+                 gamma: float = 0.2, C: float = 1.0, constraint_mode: str = 'bounds',
+                 fit_intercept: bool = True, max_iter: int = 500, tol: float = 1e-6,
+                 learning_rate: float = 0.01, batch_size: int = 4096):
+        self.constraints = constraints
+        self.temperature = temperature
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+        self.C = C
+        self.constraint_mode = constraint_mode
+        self.fit_intercept = fit_intercept
+        self.max_iter = max_iter
+        self.tol = tol
+        self.learning_rate = learning_rate
+        self.batch_size = batch_size
+
+    def _loss_and_grad(self, params: np.ndarray, X: np.ndarray, y: np.ndarray,
+                       teacher_soft: np.ndarray, signs: np.ndarray,
+                       lower: np.ndarray, upper: np.ndarray, penalize: bool,
+                       n_total: Optional[int] = None):
+        n, p = X.shape
+        w = params[:p]
+        b = params[p] if self.fit_intercept else 0.0
+        T = self.temperature
+
+        z = linear_predictor(X, w, b)
+        z_soft = z / T
+
+        # Soft-target cross-entropy (KL up to the constant teacher entropy)
+        kd = -np.mean(teacher_soft * _log_sigmoid(z_soft)
+                      + (1.0 - teacher_soft) * _log_sigmoid(-z_soft))
+        hard = -np.mean(y * _log_sigmoid(z) + (1.0 - y) * _log_sigmoid(-z))
+        loss = self.alpha * T * T * kd + self.gamma * hard
+
+        # d(loss)/dz: T² · (q_T - p_T) / T for KD, (σ(z) - y) for hard labels
+        g = (self.alpha * T * (expit(z_soft) - teacher_soft)
+             + self.gamma * (expit(z) - y)) / n
+
+        grad = np.empty_like(params)
+        grad[:p] = weighted_sums(g, X)
+        if self.fit_intercept:
+            grad[p] = g.sum()
+
+        l2 = 1.0 / (self.C * (n_total or n))
+        loss += 0.5 * l2 * np.dot(w, w)
+        grad[:p] += l2 * w
+
+        if penalize:
+            sign_gap = np.maximum(0.0, -signs * w)
+            upper_gap = np.maximum(0.0, w - upper)
+            lower_gap = np.maximum(0.0, lower - w)
+            loss += self.beta * (np.sum(sign_gap ** 2) + np.sum(upper_gap ** 2)
+                                 + np.sum(lower_gap ** 2))
+            grad[:p] += 2.0 * self.beta * (-signs * sign_gap + upper_gap - lower_gap)
+
+        return loss, grad
+
+    def fit(self, X, y, teacher_probs, coef_init: Optional[np.ndarray] = None,
+            intercept_init: Optional[float] = None) -> 'EconomicDistiller':
+        """
+        Fit the student on hard labels and teacher soft targets.
+
+        Args:
+            X: Training features (DataFrame or array, n x p)
+            y: Binary labels (n,)
+            teacher_probs: Teacher P(y=1|x) on the same rows (n,)
+            coef_init: Optional warm-start coefficients (p,)
+            intercept_init: Optional warm-start intercept
+
+        Returns:
+            self
+        """
+        self._reset_stream_state()
+        X, y, teacher_soft = self._prepare(X, y, teacher_probs, reset=True)
+        n, p = X.shape
+        signs, lower, upper, lo, hi = self._constraint_state
+        use_bounds = self.constraint_mode == 'bounds'
+
+        bounds: Optional[List[Tuple[Optional[float], Optional[float]]]] = None
+        if use_bounds:
+            bounds = [(None if np.isinf(l) else float(l), None if np.isinf(h) else float(h))
+                      for l, h in zip(lo, hi)]
+            if self.fit_intercept:
+                bounds.append((None, None))
+
+        x0 = self._initial_params(p, coef_init, intercept_init)
+
+        result = minimize(
+            self._loss_and_grad, x0, jac=True, method='L-BFGS-B', bounds=bounds,
+            args=(X, y, teacher_soft, signs, lower, upper, not use_bounds),
+            options={'maxiter': self.max_iter, 'gtol': self.tol},
+        )
+
+        self._set_params(result.x)
+        self.n_iter_ = np.array([result.nit])
+        self.loss_ = float(result.fun)
+        self.converged_ = bool(result.success)
+        return self
+
+    def _reset_stream_state(self) -> None:
+        for attr in ('_adam_t', '_adam_m', '_adam_v', '_params', '_constraint_state',
+                     '_n_rows_total'):
+            if hasattr(self, attr):
+                delattr(self, attr)
+
+    def _prepare(self, X, y, teacher_probs, reset: bool):
+        """Validate inputs and (re)build the constraint arrays."""
+        if self.constraint_mode not in CONSTRAINT_MODES:
+            raise ValueError(
+                f"constraint_mode must be one of {CONSTRAINT_MODES}, "
+                f"got {self.constraint_mode!r}"
+            )
+
+        if reset or not hasattr(self, '_constraint_state'):
+            if hasattr(X, 'columns'):
+                self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            elif hasattr(self, 'feature_names_in_'):
+                del self.feature_names_in_
+            feature_names = (list(self.feature_names_in_)
+                             if hasattr(self, 'feature_names_in_')
+                             else [f'x{j}' for j in range(np.shape(X)[1])])
+            # For a linear student, monotonicity is the coefficient sign
+            self.constraint_set_ = ConstraintSet.compile(self.constraints or {}, feature_names)
+            signs, lower, upper = self.constraint_set_.dense_arrays()
+            lo = np.where(signs > 0, np.maximum(lower, 0.0), lower)
+            hi = np.where(signs < 0, np.minimum(upper, 0.0), upper)
+            self._constraint_state = (signs, lower, upper, lo, hi)
+
+        X = as_design_matrix(X)
+        y = np.asarray(y, dtype=np.float64)
+        teacher_probs = np.clip(np.asarray(teacher_probs, dtype=np.float64),
+                                PROB_CLIP, 1.0 - PROB_CLIP)
+        teacher_soft = expit(logit(teacher_probs) / self.temperature)
+        return X, y, teacher_soft
+
+    def _initial_params(self, p: int, coef_init: Optional[np.ndarray],
+                        intercept_init: Optional[float]) -> np.ndarray:
+        x0 = np.zeros(p + int(self.fit_intercept))
+        if coef_init is not None:
+            x0[:p] = np.ravel(coef_init)
+        if intercept_init is not None and self.fit_intercept:
+            x0[p] = float(np.ravel(intercept_init)[0])
+        if self.constraint_mode == 'bounds':
+            _, _, _, lo, hi = self._constraint_state
+            x0[:p] = np.clip(x0[:p], lo, hi)
+        return x0
+
+    def _set_params(self, params: np.ndarray) -> None:
+        p = len(self._constraint_state[0])
+        self.coef_ = params[:p].reshape(1, -1).copy()
+        self.intercept_ = np.array([params[p] if self.fit_intercept else 0.0])
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = p
+
+    def partial_fit(self, X, y, teacher_probs) -> 'EconomicDistiller':
+        """
+        Update the student with mini-batch Adam on one chunk of data.
+
+        The chunk is split into ``batch_size`` mini-batches and one Adam step
+        is taken per batch. In 'bounds' mode coefficients are projected onto
+        the constraint box after each step. The L2 term is scaled by the
+        number of rows seen so far (by the stream length after the first
+        ``fit_stream`` epoch), matching ``fit`` on the full data.
+
+        Args:
+            X: Feature chunk (n_chunk x p)
+            y: Binary labels for the chunk
+            teacher_probs: Teacher P(y=1|x) for the chunk
+
+        Returns:
+            self
+        """
+        first_call = not hasattr(self, '_adam_t')
+        X, y, teacher_soft = self._prepare(X, y, teacher_probs, reset=first_call)
+        n, p = X.shape
+        signs, lower, upper, lo, hi = self._constraint_state
+        penalize = self.constraint_mode == 'penalty'
+
+        if first_call:
+            self._params = self._initial_params(p, None, None)
+            self._adam_m = np.zeros_like(self._params)
+            self._adam_v = np.zeros_like(self._params)
+            self._adam_t = 0
+            self.n_samples_seen_ = 0
+
+        beta1, beta2, eps = 0.9, 0.999, 1e-8
+        for start in range(0, n, self.batch_size):
+            stop = min(start + self.batch_size, n)
+            self.n_samples_seen_ += stop - start
+            _, grad = self._loss_and_grad(
+                self._params, X[start:stop], y[start:stop], teacher_soft[start:stop],
+                signs, lower, upper, penalize,
+                n_total=getattr(self, '_n_rows_total', self.n_samples_seen_),
+            )
+
+            self._adam_t += 1
+            self._adam_m = beta1 * self._adam_m + (1.0 - beta1) * grad
+            self._adam_v = beta2 * self._adam_v + (1.0 - beta2) * grad * grad
+            m_hat = self._adam_m / (1.0 - beta1 ** self._adam_t)
+            v_hat = self._adam_v / (1.0 - beta2 ** self._adam_t)
+            self._params -= self.learning_rate * m_hat / (np.sqrt(v_hat) + eps)
+
+            if not penalize:
+                self._params[:p] = np.clip(self._params[:p], lo, hi)
+
+        self._set_params(self._params)
+        return self
+
+    def fit_stream(self, chunks: Callable[[], Iterable[Tuple[Any, ...]]],
+                   teacher: Optional[Any] = None, n_epochs: int = 1) -> 'EconomicDistiller':
+        """
+        Train on a stream of chunks without holding the dataset in memory.
+
+        Args:
+            chunks: Zero-argument callable returning a fresh iterator per
+                epoch; each item is ``(X, y)`` (teacher queried per chunk) or
+                ``(X, y, teacher_probs)``
+            teacher: Fitted teacher with ``predict_proba``; required when the
+                chunks do not carry teacher probabilities. Tree ensembles are
+                compiled once (``as_compiled``) before the first chunk
+            n_epochs: Number of passes over the stream
+
+        Returns:
+            self
+
+        Example:
+            >>> stream = lambda: iter_csv_chunks('loans.csv', 'default', 100_000)
+            >>> student.fit_stream(stream, teacher=teacher, n_epochs=3)
+        """
+        self._reset_stream_state()
+        if teacher is not None:
+            teacher = as_compiled(teacher)
+        for _ in range(n_epochs):
+            for chunk in chunks():
+                if len(chunk) == 3:
+                    X_chunk, y_chunk, probs = chunk
+                elif teacher is None:
+                    raise ValueError("Chunks without teacher_probs need a teacher")
+                else:
+                    X_chunk, y_chunk = chunk
+                    probs = teacher.predict_proba(X_chunk)[:, 1]
+                self.partial_fit(X_chunk, y_chunk, probs)
+            self._n_rows_total = getattr(self, '_n_rows_total', self.n_samples_seen_)
+        return self
+
+    def decision_function(self, X) -> np.ndarray:
+        return linear_predictor(as_design_matrix(X), self.coef_[0], self.intercept_[0])
+
+    def predict_proba(self, X) -> np.ndarray:
+        p1 = expit(self.decision_function(X))
+        return np.column_stack([1.0 - p1, p1])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.decision_function(X) > 0).astype(int)
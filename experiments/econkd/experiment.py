@@ -0,0 +1,367 @@
+"""
+Experiment Configuration and Shared Steps
+=========================================
+
+Config-driven building blocks used by the case studies in
+``econkd.case_studies``. An ``ExperimentConfig`` names the dataset, the
+teacher / baseline / student specifications, the constraints, the bootstrap
+settings and the output directory; it is plain data and round-trips through
+JSON, so the same experiment can be launched from a script, the
+``python -m econkd`` CLI or another Python process (sweeps, benchmarks)
+without re-importing anything.
+
+The shared steps are:
+
+- ``prepare_data``: load the cached dataset, binarize the target, define the
+  constraints, split and fit the preprocessing pipeline (sections 1-4 of
+  each case study)
+- ``teacher_soft_targets``: fit (or fetch from the ``SoftTargetStore``) the
+  teacher and its soft targets
+- ``save_results``: write the results JSON, the fitted models and the
+  compiled scorer
+
+Each section runs inside a ``StageProfiler`` stage (``econkd.profiling``);
+its report is the ``performance`` block of the results JSON.
+"""
+
+import dataclasses
+import importlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator
+from sklearn.model_selection import train_test_split
+
+from .artifacts import save_models
+from .datasets import CachedDataset, load_openml_dataset
+from .preprocessing import FeaturePipeline
+from .profiling import StageProfiler
+from .scoring import compile_scorer
+from .soft_targets import SoftTargets, SoftTargetStore
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parent.parent / 'results'
+
+# Short names accepted in teacher / baseline specs; anything else must be a
+# dotted import path such as 'xgboost.XGBClassifier'
+ESTIMATORS = {
+    'GradientBoostingClassifier': 'sklearn.ensemble.GradientBoostingClassifier',
+    'RandomForestClassifier': 'sklearn.ensemble.RandomForestClassifier',
+    'HistGradientBoostingClassifier': 'sklearn.ensemble.HistGradientBoostingClassifier',
+    'LogisticRegression': 'sklearn.linear_model.LogisticRegression',
+}
+
+
+def _silent(*args, **kwargs) -> None:
+    pass
+
+
+def get_logger(verbose: bool) -> Callable[..., None]:
+    """``print`` when verbose, otherwise a no-op with the same signature."""
+    return print if verbose else _silent
+
+
+def format_percent(value: Optional[float]) -> str:
+    """``'96.0%'``, or ``'N/A'`` for None (e.g. compliance without constraints)."""
+    return 'N/A' if value is None else f'{value:.1f}%'
+
+
+@dataclass
+class ExperimentConfig:
+    """
+    Everything needed to run one case study.
+
+    Args:
+        case_study: Case study name (see ``econkd.case_studies``)
+        dataset: OpenML dataset name
+        dataset_version: OpenML dataset version
+        positive_label: Raw target value mapped to class 1
+        teacher: ``{'type': <estimator>, 'params': {...}}``
+        baseline: Parameters of the ``LogisticRegression`` baseline
+        student: ``EconomicDistiller`` parameters (without ``constraints``)
+        constraints: Economic constraints by feature; None uses the case
+            study's theory-based defaults
+        n_bootstrap: Bootstrap replicates for the stability analysis
+        bootstrap_method: 'resample', 'multinomial' or 'poisson'
+        n_jobs: Worker processes for the bootstrap
+        test_size: Held-out fraction of the stratified split
+        random_state: Seed for the split, models and bootstrap; filled into
+            teacher / baseline params that do not set their own
+        output_dir: Where results and models are written
+        cache_dir: Dataset cache root (defaults to ``experiments/data``)
+        save: Whether ``run`` writes results and models to ``output_dir``
+        profiling: ``StageProfiler`` options, e.g. ``{'cprofile': True}`` or
+            ``{'tracemalloc': True}``
+        dtype: ``FeaturePipeline`` output dtype; 'compact' keeps unscaled
+            categorical codes as int8 / int16 and the rest as float32
+    """
+
+    case_study: str
+    dataset: str
+    dataset_version: int
+    positive_label: str
+    teacher: Dict[str, Any]
+    baseline: Dict[str, Any] = field(default_factory=lambda: {'max_iter': 1000})
+    student: Dict[str, Any] = field(default_factory=dict)
+    constraints: Optional[Dict[str, Dict[str, Any]]] = None
+    n_bootstrap: int = 500
+    bootstrap_method: str = 'resample'
+    n_jobs: int = -1
+    test_size: float = 0.3
+    random_state: int = 42
+    output_dir: str = str(DEFAULT_OUTPUT_DIR)
+    cache_dir: Optional[str] = None
+    save: bool = True
+    profiling: Dict[str, Any] = field(default_factory=dict)
+    dtype: str = 'float64'
+
+    def replace(self, **changes) -> 'ExperimentConfig':
+        """Copy of the config with ``changes`` applied."""
+        return dataclasses.replace(self, **changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, values: Mapping[str, Any]) -> 'ExperimentConfig':
+        known = {f.name for f in dataclasses.fields(cls)}
+        unknown = set(values) - known
+        if unknown:
+            raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+        return cls(**values)
+
+    def save_json(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load_json(cls, path: Union[str, Path]) -> 'ExperimentConfig':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def build_estimator(spec: Mapping[str, Any], random_state: Optional[int] = None) -> BaseEstimator:
+    """
+    Instantiate an estimator from ``{'type': ..., 'params': {...}}``.
+
+    ``random_state`` is filled in when the estimator accepts it and the spec
+    does not set it.
+    """
+    path = ESTIMATORS.get(spec['type'], spec['type'])
+    module_name, _, class_name = path.rpartition('.')
+    if not module_name:
+        raise ValueError(f"Unknown estimator type {spec['type']!r}; use one of "
+                         f"{sorted(ESTIMATORS)} or a dotted import path")
+    estimator_cls = getattr(importlib.import_module(module_name), class_name)
+
+    params = dict(spec.get('params', {}))
+    if random_state is not None and 'random_state' in estimator_cls().get_params():
+        params.setdefault('random_state', random_state)
+    return estimator_cls(**params)
+
+
+@dataclass
+class PreparedData:
+    """Loaded, split and preprocessed data for one experiment."""
+
+    dataset: CachedDataset
+    X: pd.DataFrame
+    y: pd.Series
+    X_train: pd.DataFrame
+    X_test: pd.DataFrame
+    y_train: pd.Series
+    y_test: pd.Series
+    X_train_scaled: pd.DataFrame
+    X_test_scaled: pd.DataFrame
+    preprocessor: FeaturePipeline
+    constraints: Dict[str, Dict[str, Any]]
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.X_train_scaled.columns)
+
+
+@dataclass
+class ExperimentResult:
+    """
+    Outcome of ``run``: the JSON-ready results, the fitted models and the
+    prepared data (kept so callers can reuse it in the same process).
+    """
+
+    config: ExperimentConfig
+    results: Dict[str, Any]
+    models: Dict[str, Any] = field(repr=False)
+    data: PreparedData = field(repr=False)
+    results_path: Optional[Path] = None
+    models_path: Optional[Path] = None
+    profiler: Optional[StageProfiler] = field(default=None, repr=False)
+
+
+def prepare_data(config: ExperimentConfig,
+                 build_preprocessor: Callable[[pd.DataFrame], FeaturePipeline],
+                 default_constraints: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+                 title: str, source: str, rate_label: str,
+                 verbose: bool = True,
+                 profiler: Optional[StageProfiler] = None) -> PreparedData:
+    """
+    Sections 1-4 of a case study: load, preprocess, constraints, split.
+
+    Args:
+        config: Experiment configuration
+        build_preprocessor: Builds the (unfitted) pipeline from the raw frame
+        default_constraints: Theory-based constraints for the available
+            output features, used when ``config.constraints`` is None
+        title: Dataset title for the log
+        source: Data source line for the log
+        rate_label: Description of the positive class for the log
+        verbose: Print progress
+        profiler: Records the 'load', 'split' and 'preprocess' stages
+
+    Returns:
+        PreparedData
+    """
+    log = get_logger(verbose)
+    profiler = profiler or StageProfiler()
+
+    # ------------------------------------------------------------------
+    log(f"\n1. Loading {title} (REAL DATA)...")
+    log(f"   Source: {source}")
+
+    # Served from the local cache (experiments/data) after the first
+    # download; raises DatasetUnavailableError instead of falling back to
+    # synthetic data
+    with profiler.stage('load') as stage:
+        dataset = load_openml_dataset(config.dataset, version=config.dataset_version,
+                                      cache_dir=config.cache_dir)
+        X = dataset.X
+        y = (dataset.y == config.positive_label).astype(int)
+        stage.rows = len(X)
+
+    log(f"   ✅ Dataset loaded successfully (cache {dataset.digest[:12]})")
+    log(f"   Samples: {len(X)}")
+    log(f"   Features: {X.shape[1]}")
+    log(f"   {rate_label.capitalize()} rate: {y.mean():.2%}")
+
+    # ------------------------------------------------------------------
+    log("\n2. Preprocessing data...")
+
+    categorical = X.select_dtypes(include=['object', 'category']).columns.tolist()
+
+    # Categorical codes, engineered features and scaling are fitted on the
+    # training split (section 4) and applied in one pass
+    preprocessor = build_preprocessor(X).set_params(dtype=config.dtype)
+    feature_names = preprocessor.output_columns(X.columns)
+
+    log(f"   Categorical features: {len(categorical)}")
+    log(f"   Numerical features: {len(feature_names) - len(categorical)}")
+    log(f"   Total features after preprocessing: {len(feature_names)}")
+
+    # ------------------------------------------------------------------
+    log("\n3. Defining economic constraints (from economic theory)...")
+    log("   " + "-"*76)
+
+    if config.constraints is None:
+        constraints = default_constraints(feature_names)
+    else:
+        constraints = {k: dict(v) for k, v in config.constraints.items()}
+
+    for feature, constraint in constraints.items():
+        log(f"   {feature:25} → {constraint['type']:12} → "
+            f"{constraint.get('justification', '')}")
+
+    log("   " + "-"*76)
+    log(f"   Total constraints: {len(constraints)}")
+
+    # ------------------------------------------------------------------
+    log("\n4. Splitting data...")
+
+    with profiler.stage('split', rows=len(X)):
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=config.test_size, random_state=config.random_state, stratify=y
+        )
+
+    log(f"   Train: {len(X_train)} samples ({y_train.mean():.2%} {rate_label})")
+    log(f"   Test:  {len(X_test)} samples ({y_test.mean():.2%} {rate_label})")
+
+    # Statistics from the training split only
+    with profiler.stage('preprocess', rows=len(X)):
+        X_train_scaled = preprocessor.fit_transform_frame(X_train)
+        X_test_scaled = preprocessor.transform_frame(X_test)
+
+    return PreparedData(
+        dataset=dataset,
+        X=X,
+        y=y,
+        X_train=X_train,
+        X_test=X_test,
+        y_train=y_train,
+        y_test=y_test,
+        X_train_scaled=X_train_scaled,
+        X_test_scaled=X_test_scaled,
+        preprocessor=preprocessor,
+        constraints=constraints,
+    )
+
+
+def teacher_soft_targets(config: ExperimentConfig, data: PreparedData,
+                         store: Optional[SoftTargetStore] = None,
+                         keep_teacher: bool = True) -> SoftTargets:
+    """
+    Teacher soft targets for the train and test splits.
+
+    Reused from the store while the teacher hyperparameters, seed and
+    preprocessed data are unchanged.
+    """
+    teacher_spec = build_estimator(config.teacher, config.random_state)
+    return (store or SoftTargetStore()).get_or_fit(
+        teacher_spec, data.X_train_scaled, data.y_train,
+        eval_sets={'test': data.X_test_scaled},
+        keep_teacher=keep_teacher,
+    )
+
+
+def save_results(result: ExperimentResult, verbose: bool = True) -> ExperimentResult:
+    """
+    Write ``<case_study>_results.json``, the ``<case_study>_models/``
+    artifact (see ``econkd.artifacts``) and the compiled student scorer
+    ``<case_study>_scorer.json``.
+
+    With a profiler on the result, the models and scorer are written first
+    as its 'save' stage, so the ``performance`` block in the results JSON
+    includes them.
+    """
+    log = get_logger(verbose)
+    output_dir = Path(result.config.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profiler = result.profiler or StageProfiler()
+
+    with profiler.stage('save'):
+        models_path = save_models(result.models,
+                                  output_dir / f'{result.config.case_study}_models')
+        log(f"   ✅ Models saved to: {models_path}")
+
+        student = result.models.get('economic_student')
+        preprocessor = result.models.get('preprocessor')
+        if student is not None and preprocessor is not None:
+            scorer_path = output_dir / f'{result.config.case_study}_scorer.json'
+            compile_scorer(student, preprocessor).save(scorer_path)
+            log(f"   ✅ Compiled scorer saved to: {scorer_path}")
+
+    if result.profiler is not None:
+        result.results['performance'] = result.profiler.report()
+    results_path = output_dir / f'{result.config.case_study}_results.json'
+    with open(results_path, 'w') as f:
+        json.dump(result.results, f, indent=2)
+    log(f"   ✅ Results saved to: {results_path}")
+
+    result.results_path = results_path
+    result.models_path = models_path
+    return result
+
+
+def seed_everything(random_state: int) -> None:
+    """Seed NumPy's global generator, as the original scripts did."""
+    np.random.seed(random_state)
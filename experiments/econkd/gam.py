@@ -0,0 +1,373 @@
+"""
+Generalized Additive Student
+============================
+
+GAM student for economic knowledge distillation (docs/METHODOLOGY.md,
+"Student Model Choices"): ``logit P(y=1|x) = b + Σ_j f_j(x_j)`` with each
+``f_j`` a cubic B-spline (or, for categorical features and features with few
+distinct values, a step function over the observed levels). Values between
+levels take the effect of the nearest level, so a code that reaches the model
+through a different float precision or scaling still finds its own level.
+
+Monotonicity is enforced exactly. Each term is parameterized by the
+increments δ of its basis coefficients (``c_1 = 0``, ``c_{k+1} = c_k + δ_k``);
+B-spline coefficients that never decrease give a non-decreasing function, so
+an increasing constraint is just ``δ ≥ 0`` and a decreasing one ``δ ≤ 0``.
+Both ``'monotonicity'`` and ``'sign'`` constraints map to a direction;
+``'bounds'`` constraints have no GAM counterpart and are ignored.
+
+Fitting minimizes the same distillation objective as ``EconomicDistiller``
+(``α·L_KD + γ·L_hard``, summed over rows) plus a smoothness penalty by
+penalized IRLS. The sparse basis (degree + 1 non-zeros per row and feature)
+is built once; every iteration only reweights it, and the small
+(Σ basis size)² system is solved with ``lsq_linear`` under the monotonicity
+bounds.
+
+After fitting, each ``f_j`` is tabulated (``lookup_size`` grid points for
+splines, one value per level otherwise), so prediction is a table lookup
+with linear interpolation per feature and never touches the basis.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.linalg import cho_factor, solve_triangular
+from scipy.optimize import lsq_linear
+from scipy.special import expit, logit
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from .constraints import ConstraintSet
+from .distiller import PROB_CLIP, _log_sigmoid
+from .preprocessing import as_design_matrix
+
+RIDGE = 1e-6
+
+
+def _bspline_rows(x: np.ndarray, knots: np.ndarray, degree: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Non-zero B-spline basis values at ``x`` (Cox-de Boor, vectorized).
+
+    Returns:
+        (first, values): basis indices ``first[i] .. first[i] + degree`` are
+        the non-zero functions at ``x[i]`` with values ``values[i]``
+    """
+    n_basis = len(knots) - degree - 1
+    x = np.clip(x, knots[degree], knots[n_basis])
+    span = np.clip(np.searchsorted(knots, x, side='right') - 1, degree, n_basis - 1)
+
+    values = np.zeros((len(x), degree + 1))
+    values[:, 0] = 1.0
+    left = np.zeros((len(x), degree + 1))
+    right = np.zeros((len(x), degree + 1))
+    for j in range(1, degree + 1):
+        left[:, j] = x - knots[span + 1 - j]
+        right[:, j] = knots[span + j] - x
+        saved = np.zeros(len(x))
+        for r in range(j):
+            temp = values[:, r] / (right[:, r + 1] + left[:, j - r])
+            values[:, r] = saved + right[:, r + 1] * temp
+            saved = left[:, j - r] * temp
+        values[:, j] = saved
+    return span - degree, values
+
+
+class _Term:
+    """Basis of one feature: B-spline ('spline') or level indicators ('levels')."""
+
+    def __init__(self, x: np.ndarray, n_splines: int, degree: int, max_levels: int,
+                 categorical: bool = False):
+        levels = np.unique(x)
+        self.lower, self.upper = float(levels[0]), float(levels[-1])
+        if categorical or len(levels) <= max(max_levels, n_splines):
+            self.kind = 'levels'
+            self.levels = levels
+            self.edges = (levels[1:] + levels[:-1]) / 2.0
+            self.n_basis = len(levels)
+        else:
+            self.kind = 'spline'
+            self.degree = degree
+            n_interior = max(0, n_splines - degree - 1)
+            interior = np.unique(np.quantile(x, np.linspace(0, 1, n_interior + 2)[1:-1]))
+            interior = interior[(interior > self.lower) & (interior < self.upper)]
+            self.knots = np.concatenate([np.repeat(self.lower, degree + 1), interior,
+                                         np.repeat(self.upper, degree + 1)])
+            self.n_basis = len(self.knots) - degree - 1
+
+    def level_index(self, x: np.ndarray) -> np.ndarray:
+        """Index of the nearest level (midpoint edges, like the compiled steps)."""
+        return np.searchsorted(self.edges, x)
+
+    def basis(self, x: np.ndarray) -> sparse.csr_matrix:
+        n = len(x)
+        if self.kind == 'levels':
+            return sparse.csr_matrix((np.ones(n), self.level_index(x), np.arange(n + 1)),
+                                     shape=(n, self.n_basis))
+        first, values = _bspline_rows(x, self.knots, self.degree)
+        width = self.degree + 1
+        columns = first[:, None] + np.arange(width)
+        return sparse.csr_matrix((values.ravel(), columns.ravel(), np.arange(0, n * width + 1, width)),
+                                 shape=(n, self.n_basis))
+
+    def penalty(self) -> np.ndarray:
+        """Penalty on the increments δ (n_basis - 1 of them)."""
+        m = self.n_basis - 1
+        if self.kind == 'levels':
+            # Ridge on the level effects c = Lδ, not on δ: adjacent codes of a
+            # nominal feature are not neighbours in any economic sense
+            cumulative = np.tril(np.ones((self.n_basis, m)), -1)
+            return cumulative.T @ cumulative
+        if m < 2:
+            return np.eye(m)
+        # Second differences of the coefficients = first differences of δ
+        diff = np.diff(np.eye(m), axis=0)
+        return diff.T @ diff + RIDGE * np.eye(m)
+
+
+class GAMDistiller(BaseEstimator, ClassifierMixin):
+    """
+    Additive student with monotone splines trained by knowledge distillation.
+
+    Args:
+        constraints: Economic constraints keyed by feature name; 'sign' and
+            'monotonicity' constraints fix the direction of f_j
+        temperature: Distillation temperature T
+        alpha: Weight on the distillation loss L_KD
+        gamma: Weight on the hard-label loss L_hard
+        n_splines: B-spline basis functions per numeric feature
+        degree: Spline degree
+        lam: Smoothness penalty (second differences of the spline
+            coefficients; ridge on level effects)
+        max_levels: Features with at most this many distinct values get one
+            effect per level instead of a spline
+        categorical_features: Names or indices of categorical features, e.g.
+            ``list(pipeline.categories_)``; they get one effect per level
+            whatever their number of levels. Integer columns of a DataFrame
+            (the codes of a compact frame) are always categorical
+        max_iter: Maximum IRLS iterations
+        tol: Relative objective change at which IRLS stops
+        lookup_size: Grid points of each spline's prediction table
+
+    Example:
+        >>> gam = GAMDistiller(constraints=economic_constraints)
+        >>> gam.fit(X_train_scaled, y_train, teacher_train_probs)
+        >>> probs = gam.predict_proba(X_test_scaled)[:, 1]
+        >>> grid, effect = gam.shape_function('education_level')
+    """
+
+    def __init__(self, constraints: Optional[Dict[str, Dict[str, Any]]] = None,
+                 temperature: float = 2.0, alpha: float = 0.5, gamma: float = 0.2,
+                 n_splines: int = 8, degree: int = 3, lam: float = 1.0,
+                 max_levels: int = 16, categorical_features: Optional[Sequence] = None,
+                 max_iter: int = 50, tol: float = 1e-7, lookup_size: int = 1024):
+        self.constraints = constraints
+        self.temperature = temperature
+        self.alpha = alpha
+        self.gamma = gamma
+        self.n_splines = n_splines
+        self.degree = degree
+        self.lam = lam
+        self.max_levels = max_levels
+        self.categorical_features = categorical_features
+        self.max_iter = max_iter
+        self.tol = tol
+        self.lookup_size = lookup_size
+
+    def _objective(self, eta: np.ndarray, y: np.ndarray, soft: np.ndarray,
+                   theta: np.ndarray, penalty: np.ndarray) -> float:
+        T = self.temperature
+        eta_T = eta / T
+        kd = -np.sum(soft * _log_sigmoid(eta_T) + (1.0 - soft) * _log_sigmoid(-eta_T))
+        hard = -np.sum(y * _log_sigmoid(eta) + (1.0 - y) * _log_sigmoid(-eta))
+        return float(self.alpha * T * T * kd + self.gamma * hard
+                     + 0.5 * theta @ penalty @ theta)
+
+    def fit(self, X, y, teacher_probs) -> 'GAMDistiller':
+        """
+        Fit the additive student on hard labels and teacher soft targets.
+
+        Args:
+            X: Training features (DataFrame or array, n x p)
+            y: Binary labels (n,)
+            teacher_probs: Teacher P(y=1|x) on the same rows (n,)
+
+        Returns:
+            self
+        """
+        categorical = set(self.categorical_features or ())
+        if hasattr(X, 'columns'):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+            categorical.update(str(col) for col, dtype in X.dtypes.items()
+                               if pd.api.types.is_integer_dtype(dtype))
+        elif hasattr(self, 'feature_names_in_'):
+            del self.feature_names_in_
+        X = as_design_matrix(X)
+        y = np.asarray(y, dtype=np.float64)
+        n, p = X.shape
+        feature_names = (list(map(str, self.feature_names_in_))
+                         if hasattr(self, 'feature_names_in_') else [f'x{j}' for j in range(p)])
+
+        T = self.temperature
+        teacher_probs = np.clip(np.asarray(teacher_probs, dtype=np.float64),
+                                PROB_CLIP, 1.0 - PROB_CLIP)
+        soft = expit(logit(teacher_probs) / T)
+
+        # Basis built once; columns are B-spline / level indicators of every
+        # feature side by side, parameters are the increments δ plus b.
+        # Features are upcast one column at a time, never the whole matrix
+        self.terms_, blocks = [], []
+        for j in range(p):
+            column = X[:, j].astype(np.float64)
+            self.terms_.append(_Term(column, self.n_splines, self.degree, self.max_levels,
+                                     j in categorical or feature_names[j] in categorical))
+            blocks.append(self.terms_[-1].basis(column))
+        basis = sparse.hstack(blocks, format='csr')
+        # c = cumulative @ δ, with c_1 = 0 and c_{k+1} = c_k + δ_k per term
+        cumulative = sparse.block_diag(
+            [np.tril(np.ones((t.n_basis, t.n_basis - 1)), -1) for t in self.terms_]
+        ).toarray()
+        sizes = np.array([t.n_basis - 1 for t in self.terms_])
+        m = int(sizes.sum())
+
+        penalty = np.zeros((m + 1, m + 1))
+        offset = 0
+        for term, size in zip(self.terms_, sizes):
+            penalty[offset:offset + size, offset:offset + size] = self.lam * term.penalty()
+            offset += size
+
+        # For an additive term, sign and monotonicity constraints are both
+        # the direction of f_j
+        self.constraint_set_ = ConstraintSet.compile(self.constraints or {}, feature_names)
+        directions = np.repeat(self.constraint_set_.dense_arrays()[0], sizes)
+        lower = np.append(np.where(directions > 0, 0.0, -np.inf), -np.inf)
+        upper = np.append(np.where(directions < 0, 0.0, np.inf), np.inf)
+        constrained = bool(np.any(directions != 0))
+
+        target = np.clip(self.alpha * teacher_probs + self.gamma * y, PROB_CLIP, None)
+        theta = np.zeros(m + 1)
+        theta[m] = logit(np.clip(target.sum() / (self.alpha + self.gamma) / n,
+                                 PROB_CLIP, 1.0 - PROB_CLIP))
+
+        def linear_predictor(params: np.ndarray) -> np.ndarray:
+            return basis @ (cumulative @ params[:m]) + params[m]
+
+        eta = linear_predictor(theta)
+        objective = self._objective(eta, y, soft, theta, penalty)
+        self.converged_ = False
+        for iteration in range(1, self.max_iter + 1):
+            prob, prob_T = expit(eta), expit(eta / T)
+            grad = self.alpha * T * (prob_T - soft) + self.gamma * (prob - y)
+            hess = np.maximum(self.alpha * prob_T * (1.0 - prob_T)
+                              + self.gamma * prob * (1.0 - prob), np.finfo(float).eps)
+            response = eta - grad / hess
+
+            # Normal equations of the weighted least-squares step in δ, b
+            weighted = basis.multiply(hess[:, None]).tocsr()
+            gram_c = (basis.T @ weighted).toarray()
+            gram = np.empty((m + 1, m + 1))
+            gram[:m, :m] = cumulative.T @ gram_c @ cumulative
+            gram[:m, m] = gram[m, :m] = cumulative.T @ np.asarray(weighted.sum(axis=0)).ravel()
+            gram[m, m] = hess.sum()
+            gram += penalty
+            rhs = np.append(cumulative.T @ (basis.T @ (hess * response)), hess @ response)
+
+            proposal = self._solve(gram, rhs, lower, upper, constrained)
+
+            # Step halving keeps the penalized objective decreasing
+            step = 1.0
+            while True:
+                candidate = theta + step * (proposal - theta)
+                eta_new = linear_predictor(candidate)
+                new_objective = self._objective(eta_new, y, soft, candidate, penalty)
+                if new_objective <= objective + 1e-12 * abs(objective) or step < 1e-4:
+                    break
+                step /= 2.0
+
+            change = objective - new_objective
+            theta, eta, objective = candidate, eta_new, new_objective
+            if abs(change) <= self.tol * (abs(objective) + 1.0):
+                self.converged_ = True
+                break
+
+        self.n_iter_ = np.array([iteration])
+        self.loss_ = objective / n
+        self.intercept_ = np.array([theta[m]])
+        coefs = cumulative @ theta[:m]
+        splits = np.cumsum([t.n_basis for t in self.terms_])[:-1]
+        self.term_coef_ = np.split(coefs, splits)
+        self._build_tables()
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = p
+        return self
+
+    @staticmethod
+    def _solve(gram: np.ndarray, rhs: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+               constrained: bool) -> np.ndarray:
+        """Minimize ½θᵀGθ - θᵀr subject to lower ≤ θ ≤ upper."""
+        factor, _ = cho_factor(gram, lower=True)
+        chol = np.tril(factor)
+        if not constrained:
+            return solve_triangular(chol.T, solve_triangular(chol, rhs, lower=True), lower=False)
+        # ||Lᵀθ - L⁻¹r||² equals the quadratic up to a constant
+        return lsq_linear(chol.T, solve_triangular(chol, rhs, lower=True),
+                          bounds=(lower, upper), method='bvls').x
+
+    def _build_tables(self) -> None:
+        self.tables_ = []
+        for term, coef in zip(self.terms_, self.term_coef_):
+            if term.kind == 'levels':
+                grid = term.levels
+            else:
+                grid = np.linspace(term.lower, term.upper, self.lookup_size)
+            self.tables_.append((grid, term.basis(grid) @ coef))
+
+    def shape_function(self, feature) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Tabulated effect f_j of one feature (name or index).
+
+        Returns:
+            (grid, values) with f_j(smallest training value) = 0
+        """
+        if isinstance(feature, str):
+            names = list(map(str, getattr(self, 'feature_names_in_', [])))
+            if feature not in names:
+                raise ValueError(f"Unknown feature {feature!r}")
+            feature = names.index(feature)
+        grid, values = self.tables_[feature]
+        return grid.copy(), values.copy()
+
+    def term_effect(self, j: int, x: np.ndarray) -> np.ndarray:
+        """f_j(x) from the lookup table of feature j, as used for prediction."""
+        term = self.terms_[j]
+        grid, values = self.tables_[j]
+        if term.kind == 'levels':
+            return values[term.level_index(x)]
+        # Uniform grid: position, left cell and interpolation weight
+        position = np.clip((x - grid[0]) * ((len(grid) - 1) / (grid[-1] - grid[0])),
+                           0.0, len(grid) - 1)
+        left = np.minimum(position.astype(np.intp), len(grid) - 2)
+        weight = position - left
+        return values[left] * (1.0 - weight) + values[left + 1] * weight
+
+    def decision_function(self, X) -> np.ndarray:
+        X = as_design_matrix(X)
+        eta = np.full(len(X), self.intercept_[0])
+        for j in range(len(self.terms_)):
+            eta += self.term_effect(j, X[:, j].astype(np.float64))
+        return eta
+
+    def predict_proba(self, X) -> np.ndarray:
+        p1 = expit(self.decision_function(X))
+        return np.column_stack([1.0 - p1, p1])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.decision_function(X) > 0).astype(int)
+
+    def shape_frame(self) -> pd.DataFrame:
+        """All tabulated effects in long format (feature, x, effect)."""
+        names = (list(map(str, self.feature_names_in_)) if hasattr(self, 'feature_names_in_')
+                 else [f'x{j}' for j in range(len(self.tables_))])
+        return pd.concat([pd.DataFrame({'feature': name, 'x': grid, 'effect': values})
+                          for name, (grid, values) in zip(names, self.tables_)],
+                         ignore_index=True)
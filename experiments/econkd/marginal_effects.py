@@ -0,0 +1,215 @@
+"""
+Marginal Effects
+================
+
+Average marginal effects (AME) and counterfactual-level predictions for
+distilled students and black-box teachers.
+
+- Linear/logistic students (anything exposing ``coef_`` and ``intercept_``
+  with ``P(y=1|x) = σ(x·β + b)``) are handled analytically: the linear
+  predictor η = Xβ + b is computed once and each counterfactual level v of
+  feature j is just ``σ(η + β_j·(v - x_j))``. No frame copies and no
+  ``predict_proba`` calls. Standard errors come from the delta method given a
+  coefficient covariance matrix (inverse Fisher information or bootstrap).
+- Any other model is scored on batched counterfactual rows: each chunk of
+  rows is repeated once per level, the feature column is overwritten in
+  place, and the whole block goes through a single ``predict_proba`` call.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+
+from .preprocessing import as_design_matrix, linear_predictor
+
+DEFAULT_CHUNK_SIZE = 65536
+
+
+@dataclass
+class MarginalEffects:
+    """
+    Counterfactual predictions and average marginal effect for one feature.
+
+    ``predictions[k]`` is the average P(y=1) when every row has the feature
+    set to ``values[k]``. Standard errors are None when unavailable.
+    """
+
+    feature: str
+    values: np.ndarray
+    predictions: np.ndarray
+    prediction_se: Optional[np.ndarray]
+    ame: Optional[float]
+    ame_se: Optional[float]
+
+    def is_monotonic(self, direction: str = 'increasing') -> bool:
+        """Whether the predictions are monotone across ``values`` (sorted)."""
+        steps = np.diff(self.predictions[np.argsort(self.values)])
+        return bool(np.all(steps >= 0) if direction == 'increasing' else np.all(steps <= 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'feature': self.feature,
+            'effects': {str(v): float(p) for v, p in zip(self.values, self.predictions)},
+            'standard_errors': (
+                {str(v): float(s) for v, s in zip(self.values, self.prediction_se)}
+                if self.prediction_se is not None else None
+            ),
+            'ame': self.ame,
+            'ame_se': self.ame_se,
+        }
+
+
+def _is_linear(model) -> bool:
+    coef = getattr(model, 'coef_', None)
+    return coef is not None and hasattr(model, 'intercept_') and np.ndim(coef) <= 2 \
+        and np.atleast_2d(coef).shape[0] == 1
+
+
+def _feature_index(X, feature: Union[str, int]) -> int:
+    if isinstance(feature, (int, np.integer)):
+        return int(feature)
+    if hasattr(X, 'columns'):
+        return X.columns.get_loc(feature)
+    raise ValueError("Pass an integer feature index when X has no column names")
+
+
+def logistic_covariance(model, X, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    Asymptotic covariance of (β, b) for a logistic model: (X̃ᵀWX̃)⁻¹.
+
+    X̃ is X with an intercept column appended and W = diag(p(1-p)). The
+    information matrix is accumulated in float64 over ``chunk_size`` rows at
+    a time, so float32 inputs are never upcast as a whole.
+    """
+    X = as_design_matrix(X)
+    coef = np.atleast_2d(model.coef_)[0]
+    p = expit(linear_predictor(X, coef, np.ravel(model.intercept_)[0]))
+    w = p * (1.0 - p)
+
+    fisher = np.zeros((X.shape[1] + 1, X.shape[1] + 1))
+    for start in range(0, len(X), chunk_size):
+        stop = min(start + chunk_size, len(X))
+        X_tilde = np.column_stack([X[start:stop], np.ones(stop - start)])
+        fisher += X_tilde.T @ (X_tilde * w[start:stop, None])
+    return np.linalg.pinv(fisher)
+
+
+def _linear_effects(model, X: np.ndarray, j: int, values: np.ndarray,
+                    cov: Optional[np.ndarray], chunk_size: int):
+    coef = np.atleast_2d(model.coef_)[0]
+    beta_j = coef[j]
+    n, n_features = X.shape
+
+    eta = linear_predictor(X, coef, np.ravel(model.intercept_)[0])
+    eta_base = eta - beta_j * X[:, j]
+
+    # Sum over rows of p_v, p_v(1-p_v) and p_v(1-p_v)·x (for delta-method SEs)
+    pred_sum = np.zeros(len(values))
+    weight_sum = np.zeros(len(values))
+    weighted_x = np.zeros((len(values), n_features + 1)) if cov is not None else None
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        probs = expit(eta_base[start:stop, None] + beta_j * values[None, :])
+        weights = probs * (1.0 - probs)
+        pred_sum += probs.sum(axis=0)
+        weight_sum += weights.sum(axis=0)
+        if weighted_x is not None:
+            weighted_x[:, :n_features] += weights.T @ X[start:stop]
+
+    predictions = pred_sum / n
+
+    # AME of a continuous feature: β_j · mean(p(1-p)) at observed values
+    p_obs = expit(eta)
+    dens = p_obs * (1.0 - p_obs)
+    ame = float(beta_j * dens.mean())
+
+    prediction_se = None
+    ame_se = None
+    if cov is not None:
+        # d pred_v / dθ = mean_i p_v(1-p_v) · x̃_i(v), x̃_i(v) has x_ij := v
+        grad_pred = weighted_x / n
+        grad_pred[:, j] = weight_sum / n * values
+        grad_pred[:, n_features] = weight_sum / n
+        prediction_se = np.sqrt(np.einsum('lk,km,lm->l', grad_pred, cov, grad_pred))
+
+        # d AME / dθ = 1{k=j}·mean(p(1-p)) + β_j·mean(p(1-p)(1-2p)·x̃_k)
+        curvature = dens * (1.0 - 2.0 * p_obs)
+        grad_ame = np.empty(n_features + 1)
+        grad_ame[:n_features] = beta_j * (curvature @ X) / n
+        grad_ame[n_features] = beta_j * curvature.mean()
+        grad_ame[j] += dens.mean()
+        ame_se = float(np.sqrt(grad_ame @ cov @ grad_ame))
+
+    return predictions, prediction_se, ame, ame_se
+
+
+def _blackbox_predictions(model, X: np.ndarray, j: int, values: np.ndarray,
+                          chunk_size: int, columns: Optional[Sequence[str]]) -> np.ndarray:
+    n = len(X)
+    n_levels = len(values)
+    rows_per_chunk = max(1, chunk_size // n_levels)
+    pred_sum = np.zeros(n_levels)
+
+    for start in range(0, n, rows_per_chunk):
+        block = X[start:start + rows_per_chunk]
+        counterfactual = np.repeat(block, n_levels, axis=0)
+        counterfactual[:, j] = np.tile(values, len(block))
+        if columns is not None and hasattr(model, 'feature_names_in_'):
+            counterfactual = pd.DataFrame(counterfactual, columns=columns, copy=False)
+        probs = model.predict_proba(counterfactual)[:, 1]
+        pred_sum += probs.reshape(len(block), n_levels).sum(axis=0)
+
+    return pred_sum / n
+
+
+def marginal_effects(model, X, feature: Union[str, int],
+                     values: Optional[Sequence[float]] = None,
+                     cov: Optional[np.ndarray] = None,
+                     chunk_size: int = DEFAULT_CHUNK_SIZE) -> MarginalEffects:
+    """
+    Counterfactual-level predictions and AME of ``feature``.
+
+    Args:
+        model: Fitted classifier (linear students are handled analytically)
+        X: Evaluation features (DataFrame or array)
+        feature: Column name or index
+        values: Grid of feature values; defaults to the sorted unique values
+        cov: Covariance of (coef, intercept) for delta-method standard errors
+            (e.g. ``logistic_covariance(model, X_train)`` or a bootstrap
+            covariance); linear models only
+        chunk_size: Rows (times levels, for black-box models) per batch
+
+    Returns:
+        MarginalEffects
+
+    Example:
+        >>> me = marginal_effects(student, X_test_scaled, 'education_level',
+        ...                       cov=logistic_covariance(student, X_train_scaled))
+        >>> me.is_monotonic('increasing')
+    """
+    j = _feature_index(X, feature)
+    columns = list(X.columns) if hasattr(X, 'columns') else None
+    name = str(columns[j]) if columns is not None else str(feature)
+    X = as_design_matrix(X)
+    values = np.unique(X[:, j]).astype(np.float64) if values is None else np.asarray(values, dtype=np.float64)
+
+    if _is_linear(model):
+        predictions, prediction_se, ame, ame_se = _linear_effects(
+            model, X, j, values, cov, chunk_size
+        )
+    else:
+        predictions = _blackbox_predictions(model, X, j, values, chunk_size, columns)
+        prediction_se, ame, ame_se = None, None, None
+
+    return MarginalEffects(
+        feature=name,
+        values=values,
+        predictions=predictions,
+        prediction_se=prediction_se,
+        ame=ame,
+        ame_se=ame_se,
+    )
@@ -0,0 +1,241 @@
+"""
+Experiment Pipeline Runner
+==========================
+
+Runs the reproduction as a dependency DAG instead of a sequential shell
+script. Each ``Stage`` declares the stages it depends on plus the files it
+reads and writes; stages whose dependencies are done are submitted to a
+process pool as soon as a worker is free, so independent experiments run
+concurrently and a full reproduction takes roughly as long as its slowest
+chain of stages.
+
+A stage is skipped when all of its outputs exist, none is older than any of
+its inputs, and none of its dependencies was re-run in the same invocation
+(make-style). A failed stage blocks its dependents; unrelated stages keep
+running.
+"""
+
+import json
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline DAG.
+
+    Exactly one of ``command`` (argv run as a subprocess) or ``func`` (a
+    picklable top-level callable run in a worker process) must be given.
+
+    Args:
+        name: Unique stage name
+        command: Subprocess argv, e.g. ``[sys.executable, 'script.py']``
+        func: Callable invoked as ``func(*args)``
+        args: Positional arguments for ``func``
+        deps: Names of stages that must finish first
+        inputs: Files (or directories, scanned recursively) the stage reads
+        outputs: Files the stage writes; a stage without outputs always runs
+        cwd: Working directory for ``command``
+        log: File receiving the stage's stdout/stderr (``command`` only)
+    """
+
+    name: str
+    command: Optional[Sequence[str]] = None
+    func: Optional[Callable[..., Any]] = None
+    args: Tuple[Any, ...] = ()
+    deps: Sequence[str] = ()
+    inputs: Sequence[PathLike] = ()
+    outputs: Sequence[PathLike] = ()
+    cwd: Optional[PathLike] = None
+    log: Optional[PathLike] = None
+
+    def __post_init__(self):
+        if (self.command is None) == (self.func is None):
+            raise ValueError(f"Stage '{self.name}' needs exactly one of command or func")
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage: 'ran', 'skipped', 'failed' or 'blocked'."""
+
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class PipelineReport:
+    """Per-stage results plus the wall-clock time of the whole run."""
+
+    results: Dict[str, StageResult] = field(default_factory=dict)
+    wall_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.status in ('ran', 'skipped') for r in self.results.values())
+
+    @property
+    def stage_seconds(self) -> float:
+        """Sum of stage run times, i.e. what a sequential run would take."""
+        return sum(r.seconds for r in self.results.values())
+
+    def summary(self) -> str:
+        lines = [f"   {'Stage':28} {'Status':>8} {'Time (s)':>10}"]
+        for r in self.results.values():
+            lines.append(f"   {r.name:28} {r.status:>8} {r.seconds:>10.1f}")
+        lines.append(f"   {'Sum of stages':28} {'':>8} {self.stage_seconds:>10.1f}")
+        lines.append(f"   {'Wall clock':28} {'':>8} {self.wall_seconds:>10.1f}")
+        return '\n'.join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'wall_seconds': self.wall_seconds,
+            'stage_seconds': self.stage_seconds,
+            'stages': [asdict(r) for r in self.results.values()],
+        }
+
+    def save(self, path: PathLike) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def _mtimes(paths: Sequence[PathLike]) -> List[float]:
+    times = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            times.extend(p.stat().st_mtime for p in path.rglob('*')
+                         if p.is_file() and '__pycache__' not in p.parts)
+        elif path.exists():
+            times.append(path.stat().st_mtime)
+    return times
+
+
+def is_up_to_date(stage: Stage) -> bool:
+    """Whether every output exists and is at least as new as every input."""
+    if not stage.outputs or not all(Path(p).exists() for p in stage.outputs):
+        return False
+    inputs = _mtimes(stage.inputs)
+    return not inputs or min(_mtimes(stage.outputs)) >= max(inputs)
+
+
+def _execute(stage: Stage) -> float:
+    """Run one stage in a worker process and return its duration."""
+    start = time.perf_counter()
+    if stage.func is not None:
+        stage.func(*stage.args)
+    else:
+        log = open(stage.log, 'w') if stage.log else subprocess.DEVNULL
+        try:
+            subprocess.run(list(stage.command), cwd=stage.cwd, stdout=log,
+                           stderr=subprocess.STDOUT, check=True)
+        finally:
+            if stage.log:
+                log.close()
+    return time.perf_counter() - start
+
+
+def _validate(stages: Sequence[Stage]) -> Dict[str, Stage]:
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage name: '{stage.name}'")
+        by_name[stage.name] = stage
+    for stage in stages:
+        unknown = [d for d in stage.deps if d not in by_name]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages {unknown}")
+
+    # Kahn's algorithm, only to reject cycles up front
+    indegree = {name: len(stage.deps) for name, stage in by_name.items()}
+    ready = [name for name, d in indegree.items() if d == 0]
+    seen = 0
+    while ready:
+        name = ready.pop()
+        seen += 1
+        for other in by_name.values():
+            if name in other.deps:
+                indegree[other.name] -= 1
+                if indegree[other.name] == 0:
+                    ready.append(other.name)
+    if seen != len(by_name):
+        raise ValueError('Pipeline stages contain a dependency cycle')
+    return by_name
+
+
+def run_pipeline(stages: Sequence[Stage], max_workers: Optional[int] = None,
+                 force: bool = False,
+                 on_event: Optional[Callable[[StageResult], None]] = None) -> PipelineReport:
+    """
+    Execute ``stages`` respecting dependencies, in parallel where possible.
+
+    Args:
+        stages: Pipeline stages (any order)
+        max_workers: Process pool size (defaults to the number of stages)
+        force: Re-run every stage even if its outputs are up to date
+        on_event: Called with each StageResult as soon as it is known
+
+    Returns:
+        PipelineReport (in stage declaration order)
+
+    Example:
+        >>> report = run_pipeline(stages, max_workers=2)
+        >>> print(report.summary())
+    """
+    by_name = _validate(stages)
+    report = PipelineReport()
+    outcome: Dict[str, StageResult] = {}
+    pending = dict(by_name)
+    running = {}
+    start = time.perf_counter()
+
+    def finish(result: StageResult) -> None:
+        outcome[result.name] = result
+        if on_event is not None:
+            on_event(result)
+
+    with ProcessPoolExecutor(max_workers=max_workers or max(1, len(stages))) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                dep_results = [outcome.get(d) for d in stage.deps]
+                if any(r is None for r in dep_results):
+                    continue
+                del pending[name]
+                if any(r.status in ('failed', 'blocked') for r in dep_results):
+                    finish(StageResult(name, 'blocked'))
+                elif (not force and all(r.status == 'skipped' for r in dep_results)
+                        and is_up_to_date(stage)):
+                    finish(StageResult(name, 'skipped'))
+                else:
+                    running[pool.submit(_execute, stage)] = name
+
+            if not running:
+                # Everything left was resolved synchronously this round
+                continue
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    finish(StageResult(name, 'ran', seconds=future.result()))
+                except Exception as e:
+                    finish(StageResult(name, 'failed', error=str(e)))
+
+    report.results = {name: outcome[name] for name in by_name}
+    report.wall_seconds = time.perf_counter() - start
+    return report
+
+
+def python_stage(name: str, script: PathLike, **kwargs) -> Stage:
+    """``Stage`` running ``script`` with the current interpreter."""
+    script = Path(script)
+    kwargs.setdefault('cwd', script.parent)
+    return Stage(name=name, command=[sys.executable, script.name], **kwargs)
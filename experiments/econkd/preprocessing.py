@@ -0,0 +1,432 @@
+"""
+Feature Preprocessing Pipeline
+==============================
+
+``FeaturePipeline`` replaces the per-script ``LabelEncoder`` loop and the
+extra ``StandardScaler`` frame copies with one fitted, serializable
+transformer:
+
+1. categorical columns become integer codes, looked up once per category
+   level from the pandas ``category`` dtype (no per-row ``astype(str)``);
+   levels are sorted as strings, so the codes match ``LabelEncoder`` on
+   ``X[col].astype(str)`` and missing values keep their own ``'nan'`` level
+2. derived features (``ratio``, ``copy``, ``map``) are computed from the
+   encoded columns
+3. the selected columns are standardized in place
+
+Everything is written into one preallocated, C-contiguous float block. The
+fitted state (category levels, derived-feature specs, means and scales) is
+plain JSON, so the same pipeline can be reapplied at scoring time.
+
+Compact mode
+------------
+``dtype='compact'`` writes the block as float32 and, in ``transform_frame``,
+keeps unscaled categorical columns as int8 codes (int16 above 127 levels),
+which is about half the float64 footprint. Values are computed in float64
+chunks and rounded once, so tree teachers (which split on float32) see
+exactly the data the float64 pipeline gives them. Each chunk is written
+straight into the float32 block and the integer code columns, so no full
+float copy of the frame is ever built.
+
+``as_design_matrix`` is how the students take such input: float32 / float64
+arrays and homogeneous frames pass through without a copy, compact frames
+become one float32 matrix, and
+``linear_predictor`` / ``weighted_sums`` compute ``X @ w`` and ``g @ X`` over
+cache-sized float64 copies of row blocks, so the products accumulate in
+float64 without ever materializing a float64 copy of the whole matrix.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+SCALE_MODES = ('numerical', 'all', 'none')
+DERIVED_OPS = ('ratio', 'copy', 'map')
+DTYPES = ('float64', 'float32', 'compact')
+MISSING_LEVEL = 'nan'
+TRANSFORM_CHUNK = 65536      # rows per float64 staging block for float32 output
+PRODUCT_BLOCK = 4096         # rows per cache-resident float64 copy in matrix products
+FLOAT_DTYPES = (np.dtype(np.float32), np.dtype(np.float64))
+# Integer columns that convert to float32 exactly (compact category codes)
+_FLOAT32_EXACT = {np.dtype(t) for t in (np.int8, np.int16, np.uint8, np.uint16, np.float32)}
+
+
+def code_dtype(n_levels: int) -> np.dtype:
+    """Smallest signed integer dtype holding codes -1 .. n_levels - 1."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_levels <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+# ----------------------------------------------------------------------
+# Design matrices
+# ----------------------------------------------------------------------
+
+def as_design_matrix(X) -> np.ndarray:
+    """
+    ``X`` as a 2-D float32 or float64 array, copying only when necessary.
+
+    float32 / float64 arrays (either memory order) and single-dtype float
+    frames are returned as views. Frames mixing float32 with small integer
+    codes (``FeaturePipeline(dtype='compact')``) are gathered column by
+    column into a new C-contiguous float32 array on every call; code that
+    scores one compact frame repeatedly should gather it once and pass the
+    array. Anything else is converted to float64, as before.
+    """
+    if isinstance(X, pd.DataFrame):
+        dtypes = set(X.dtypes)
+        if len(dtypes) == 1 and dtypes <= set(FLOAT_DTYPES):
+            return X.to_numpy()
+        if not dtypes <= _FLOAT32_EXACT:
+            return X.to_numpy(dtype=np.float64)
+        block = np.empty(X.shape, dtype=np.float32)
+        for j in range(X.shape[1]):
+            block[:, j] = X.iloc[:, j].to_numpy()
+        return block
+    X = np.asarray(X)
+    if X.dtype not in FLOAT_DTYPES:
+        X = X.astype(np.float32 if X.dtype in _FLOAT32_EXACT else np.float64)
+    return X
+
+
+def linear_predictor(X: np.ndarray, coef: np.ndarray, intercept: float = 0.0) -> np.ndarray:
+    """``X @ coef + intercept`` in float64, without a float64 copy of ``X``."""
+    if X.dtype == np.float64:
+        return X @ coef + intercept
+    out = np.empty(len(X))
+    for start in range(0, len(X), PRODUCT_BLOCK):
+        stop = start + PRODUCT_BLOCK
+        np.dot(X[start:stop].astype(np.float64), coef, out=out[start:stop])
+    out += intercept
+    return out
+
+
+def weighted_sums(weights: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """``weights @ X`` in float64, without a float64 copy of ``X``."""
+    if X.dtype == np.float64:
+        return weights @ X
+    out = np.zeros(X.shape[1])
+    for start in range(0, len(X), PRODUCT_BLOCK):
+        stop = start + PRODUCT_BLOCK
+        out += weights[start:stop] @ X[start:stop].astype(np.float64)
+    return out
+
+
+def _is_categorical(series: pd.Series) -> bool:
+    return isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object
+
+
+def _category_levels(series: pd.Series) -> List[str]:
+    """Observed levels as strings, sorted like ``LabelEncoder`` would."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        present = series.cat.remove_unused_categories().cat.categories
+        levels = {str(c) for c in present}
+    else:
+        levels = {str(v) for v in series.dropna().unique()}
+    if series.isna().any():
+        levels.add(MISSING_LEVEL)
+    return sorted(levels)
+
+
+def _encode_categorical(series: pd.Series, levels: Sequence[str]) -> np.ndarray:
+    """
+    Integer codes for ``series`` against fitted ``levels``.
+
+    For category dtypes the lookup runs over the (few) category labels and is
+    then gathered by the existing codes. Unknown levels map to -1. Codes use
+    the smallest integer dtype that holds them (``code_dtype``).
+    """
+    positions = {level: i for i, level in enumerate(levels)}
+    missing = positions.get(MISSING_LEVEL, -1)
+
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    lookup = np.array(
+        [positions.get(str(c), -1) for c in series.cat.categories] + [missing],
+        dtype=code_dtype(len(levels)),
+    )
+    # Missing values have code -1, which indexes the trailing ``missing`` slot
+    return lookup[series.cat.codes.to_numpy()]
+
+
+class FeaturePipeline(BaseEstimator, TransformerMixin):
+    """
+    Fitted categorical encoding, derived features and scaling in one pass.
+
+    Args:
+        derived: Derived features by output name, appended after the input
+            columns in insertion order. Each spec is a dict with ``op``:
+
+            - ``{'op': 'ratio', 'numerator': a, 'denominator': b}``:
+              ``a / (b + offset)``, ``offset`` defaults to 1
+            - ``{'op': 'copy', 'source': a}``
+            - ``{'op': 'map', 'source': a, 'mapping': {...}, 'default': v}``:
+              maps the raw labels of ``a``; unmapped values get ``default``
+
+            Specs whose inputs are not present are skipped.
+        scale: Which columns to standardize: 'numerical' (numeric inputs and
+            derived features), 'all', or 'none'
+        dtype: Output dtype: 'float64', 'float32', or 'compact' (float32
+            block; int8 / int16 codes for unscaled categorical columns in
+            ``transform_frame``)
+
+    Example:
+        >>> pipeline = FeaturePipeline(derived={
+        ...     'monthly_payment': {'op': 'ratio', 'numerator': 'credit_amount',
+        ...                         'denominator': 'duration'},
+        ... })
+        >>> X_train_scaled = pipeline.fit_transform_frame(X_train)
+        >>> X_test_scaled = pipeline.transform_frame(X_test)
+        >>> pipeline.save('results/german_credit_preprocessing.json')
+    """
+
+    def __init__(self, derived: Optional[Dict[str, Dict[str, Any]]] = None,
+                 scale: str = 'numerical', dtype: str = 'float64'):
+        self.derived = derived
+        self.scale = scale
+        self.dtype = dtype
+
+    # ------------------------------------------------------------------
+    # Column planning
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _sources(spec: Mapping[str, Any]) -> List[str]:
+        if spec['op'] == 'ratio':
+            return [spec['numerator'], spec['denominator']]
+        return [spec['source']]
+
+    def _active_derived(self, columns: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        available = set(columns)
+        active = {}
+        for name, spec in (self.derived or {}).items():
+            if spec['op'] not in DERIVED_OPS:
+                raise ValueError(f"Unknown derived feature op for '{name}': {spec['op']!r}")
+            if all(source in available for source in self._sources(spec)):
+                active[name] = dict(spec)
+                available.add(name)
+        return active
+
+    def output_columns(self, columns: Sequence[str]) -> List[str]:
+        """
+        Output column names for input ``columns``, without fitting.
+
+        Useful for resolving constraints before the train/test split.
+        """
+        columns = [str(c) for c in columns]
+        return columns + list(self._active_derived(columns))
+
+    # ------------------------------------------------------------------
+    # Fit / transform
+    # ------------------------------------------------------------------
+
+    def fit(self, X: pd.DataFrame, y=None) -> 'FeaturePipeline':
+        """Learn category levels and scaling statistics from ``X``."""
+        self._fit_block(X)
+        return self
+
+    def _fit_block(self, X: pd.DataFrame) -> np.ndarray:
+        """Fit on ``X`` and return its unscaled float64 block."""
+        if self.scale not in SCALE_MODES:
+            raise ValueError(f"scale must be one of {SCALE_MODES}, got {self.scale!r}")
+        if self.dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}, got {self.dtype!r}")
+
+        self.feature_names_in_ = np.array([str(c) for c in X.columns], dtype=object)
+        self.categories_ = {
+            str(col): _category_levels(X[col]) for col in X.columns if _is_categorical(X[col])
+        }
+        self.derived_ = self._active_derived(self.feature_names_in_)
+        self.feature_names_out_ = np.array(
+            list(self.feature_names_in_) + list(self.derived_), dtype=object
+        )
+
+        if self.scale == 'all':
+            scaled = list(self.feature_names_out_)
+        elif self.scale == 'numerical':
+            scaled = [c for c in self.feature_names_out_ if c not in self.categories_]
+        else:
+            scaled = []
+        self.scaled_columns_ = scaled
+
+        # Statistics are taken from the unscaled block, like StandardScaler
+        block = self._encode(X, np.float64)
+        idx = self._scaled_indices()
+        self.mean_ = block[:, idx].mean(axis=0)
+        scale = block[:, idx].std(axis=0)
+        scale[scale == 0.0] = 1.0
+        self.scale_ = scale
+        return block
+
+    def _scaled_indices(self) -> np.ndarray:
+        positions = {name: j for j, name in enumerate(self.feature_names_out_)}
+        return np.array([positions[c] for c in self.scaled_columns_], dtype=np.intp)
+
+    def _encode(self, X: pd.DataFrame, dtype) -> np.ndarray:
+        """Fill the unscaled (n x p_out) block: codes, numerics, derived."""
+        missing = [c for c in self.feature_names_in_ if c not in X.columns]
+        if missing:
+            raise KeyError(f"Columns missing from input: {missing}")
+
+        n_in = len(self.feature_names_in_)
+        block = np.empty((len(X), len(self.feature_names_out_)), dtype=dtype)
+        for j, col in enumerate(self.feature_names_in_):
+            if col in self.categories_:
+                block[:, j] = _encode_categorical(X[col], self.categories_[col])
+            else:
+                block[:, j] = X[col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+        positions = {name: j for j, name in enumerate(self.feature_names_out_)}
+        for k, (name, spec) in enumerate(self.derived_.items()):
+            j = n_in + k
+            if spec['op'] == 'ratio':
+                offset = spec.get('offset', 1.0)
+                block[:, j] = block[:, positions[spec['numerator']]] / (
+                    block[:, positions[spec['denominator']]] + offset
+                )
+            elif spec['op'] == 'copy':
+                block[:, j] = block[:, positions[spec['source']]]
+            else:
+                source = X[spec['source']] if spec['source'] in X.columns \
+                    else pd.Series(block[:, positions[spec['source']]])
+                mapped = source.map(spec['mapping']).astype(np.float64)
+                block[:, j] = mapped.fillna(spec.get('default', np.nan)).to_numpy()
+        return block
+
+    def transform(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Transform ``X`` into a C-contiguous float block.
+
+        Returns:
+            Array of shape (n_samples, len(feature_names_out_))
+        """
+        check_is_fitted(self, 'scale_')
+        if self.dtype == 'float64':
+            return self._transform64(X)
+        block = np.empty((len(X), len(self.feature_names_out_)), dtype=np.float32)
+        for start, chunk in self._chunks64(X):
+            block[start:start + len(chunk)] = chunk
+        return block
+
+    def _chunks64(self, X: pd.DataFrame) -> Iterator[Tuple[int, np.ndarray]]:
+        # Encoded and scaled in float64 one chunk at a time, then rounded by
+        # the caller, so the float32 values are exactly the float64 ones
+        # rounded once (tree teachers, which split on float32, see the same
+        # data either way)
+        for start in range(0, len(X), TRANSFORM_CHUNK):
+            yield start, self._transform64(X.iloc[start:start + TRANSFORM_CHUNK])
+
+    def _transform64(self, X: pd.DataFrame) -> np.ndarray:
+        return self._standardize(self._encode(X, np.float64))
+
+    def _standardize(self, block: np.ndarray) -> np.ndarray:
+        """Scale the selected columns of an unscaled float64 block in place."""
+        idx = self._scaled_indices()
+        if len(idx):
+            block[:, idx] -= self.mean_
+            block[:, idx] /= self.scale_
+        return block
+
+    def transform_frame(self, X: pd.DataFrame) -> pd.DataFrame:
+        """
+        ``transform`` wrapped (without copying) in a DataFrame with X's index.
+
+        With ``dtype='compact'`` the unscaled categorical columns are
+        written directly as their integer code dtype.
+        """
+        if self.dtype == 'compact':
+            check_is_fitted(self, 'scale_')
+            return self._compact_frame(self._chunks64(X), len(X), X.index)
+        return pd.DataFrame(self.transform(X), columns=list(self.feature_names_out_),
+                            index=X.index, copy=False)
+
+    def _compact_frame(self, chunks: Iterator[Tuple[int, np.ndarray]], n: int,
+                       index: pd.Index) -> pd.DataFrame:
+        """Compact frame filled from float64 (start, chunk) pairs."""
+        columns = list(self.feature_names_out_)
+        code_dtypes = self.code_dtypes()
+        code_idx = [j for j, col in enumerate(columns) if col in code_dtypes]
+        float_idx = [j for j, col in enumerate(columns) if col not in code_dtypes]
+
+        block = np.empty((n, len(float_idx)), dtype=np.float32)
+        codes = {j: np.empty(n, dtype=code_dtypes[columns[j]]) for j in code_idx}
+        for start, chunk in chunks:
+            stop = start + len(chunk)
+            block[start:stop] = chunk[:, float_idx]
+            for j, values in codes.items():
+                values[start:stop] = chunk[:, j]
+
+        frame = pd.DataFrame(block, columns=[columns[j] for j in float_idx],
+                             index=index, copy=False)
+        # Ascending positions, so every code column lands at its final place
+        for j in code_idx:
+            frame.insert(j, columns[j], codes[j])
+        return frame
+
+    def code_dtypes(self) -> Dict[str, np.dtype]:
+        """Integer dtype of each unscaled categorical output column."""
+        check_is_fitted(self, 'scale_')
+        scaled = set(self.scaled_columns_)
+        return {col: code_dtype(len(levels)) for col, levels in self.categories_.items()
+                if col not in scaled}
+
+    def fit_transform_frame(self, X: pd.DataFrame) -> pd.DataFrame:
+        """``fit(X).transform_frame(X)``, encoding ``X`` only once."""
+        block = self._standardize(self._fit_block(X))
+        if self.dtype == 'compact':
+            chunks = ((start, block[start:start + TRANSFORM_CHUNK])
+                      for start in range(0, len(block), TRANSFORM_CHUNK))
+            return self._compact_frame(chunks, len(X), X.index)
+        if self.dtype == 'float32':
+            block = block.astype(np.float32)
+        return pd.DataFrame(block, columns=list(self.feature_names_out_),
+                            index=X.index, copy=False)
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        check_is_fitted(self, 'feature_names_out_')
+        return self.feature_names_out_
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable fitted state."""
+        check_is_fitted(self, 'scale_')
+        return {
+            'params': {'derived': self.derived, 'scale': self.scale, 'dtype': self.dtype},
+            'feature_names_in': list(self.feature_names_in_),
+            'feature_names_out': list(self.feature_names_out_),
+            'categories': self.categories_,
+            'derived': self.derived_,
+            'scaled_columns': self.scaled_columns_,
+            'mean': self.mean_.tolist(),
+            'scale': self.scale_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> 'FeaturePipeline':
+        pipeline = cls(**state['params'])
+        pipeline.feature_names_in_ = np.array(state['feature_names_in'], dtype=object)
+        pipeline.feature_names_out_ = np.array(state['feature_names_out'], dtype=object)
+        pipeline.categories_ = {k: list(v) for k, v in state['categories'].items()}
+        pipeline.derived_ = dict(state['derived'])
+        pipeline.scaled_columns_ = list(state['scaled_columns'])
+        pipeline.mean_ = np.asarray(state['mean'], dtype=np.float64)
+        pipeline.scale_ = np.asarray(state['scale'], dtype=np.float64)
+        return pipeline
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'FeaturePipeline':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
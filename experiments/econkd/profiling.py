@@ -0,0 +1,246 @@
+"""
+Stage Profiling
+===============
+
+Lightweight per-stage instrumentation for the case studies. A
+``StageProfiler`` wraps each numbered section (load, split, preprocess,
+baseline, teacher, KD, economic KD, compliance, bootstrap, save) and records:
+
+- wall time (``time.perf_counter``) and CPU time of this process
+  (``time.process_time``; joblib worker processes are not included)
+- peak resident memory during the stage, sampled from ``/proc/self/statm``
+  by a background thread (the ``ru_maxrss`` high-water mark elsewhere), and
+  its growth over the RSS at stage entry
+- the number of rows the stage processed
+
+Optionally, per stage, the top functions by cumulative time (``cProfile``)
+and the peak traced Python allocation plus the sites still holding the most
+memory when the stage ends (``tracemalloc``); both slow the stage down, so
+they are off by default.
+
+``report()`` is the JSON-ready ``performance`` block the case studies embed
+in ``<case_study>_results.json``, so cost regressions are tracked in the
+same artifact as model quality. ``ExperimentConfig.profiling`` holds the
+profiler options (e.g. ``--set profiling.cprofile=true``).
+
+Example:
+    >>> profiler = StageProfiler(tracemalloc=True)
+    >>> with profiler.stage('baseline', rows=len(X_train)):
+    ...     baseline.fit(X_train, y_train)
+    >>> profiler.report()['stages']['baseline']['wall_s']
+"""
+
+import cProfile
+import functools
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+import tracemalloc as _tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+MB = 2**20
+
+
+# ----------------------------------------------------------------------
+# Memory sampling
+# ----------------------------------------------------------------------
+
+def current_rss() -> Optional[int]:
+    """Resident set size of this process in bytes (None without /proc)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def max_rss() -> int:
+    """Lifetime peak RSS of this process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class PeakMemory:
+    """
+    Context manager tracking peak RSS while its block runs.
+
+    Polls ``/proc/self/statm`` every ``interval`` seconds from a daemon
+    thread; without /proc, ``peak`` is the process high-water mark.
+
+    Attributes:
+        start: RSS at entry (bytes)
+        peak: Highest RSS seen (bytes)
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def growth(self) -> int:
+        return max(0, self.peak - self.start)
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, current_rss() or 0)
+
+    def __enter__(self) -> 'PeakMemory':
+        rss = current_rss()
+        if rss is None:
+            self.start = self.peak = max_rss()
+            return self
+        self.start = self.peak = rss
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, current_rss() or 0)
+        else:
+            self.peak = max_rss()
+
+
+# ----------------------------------------------------------------------
+# Stage records
+# ----------------------------------------------------------------------
+
+@dataclass
+class StageProfile:
+    """Measurements of one stage."""
+
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    peak_rss_mb: float = 0.0
+    rss_growth_mb: float = 0.0
+    rows: Optional[int] = None
+    traced_peak_mb: Optional[float] = None
+    top_allocations: Optional[List[Dict[str, Any]]] = None
+    top_functions: Optional[List[Dict[str, Any]]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if v is not None and k != 'name'}
+
+
+def _top_functions(profile: cProfile.Profile, top: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profile).stats
+    rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return [{'function': f'{path}:{line}({name})', 'ncalls': int(calls),
+             'tottime_s': float(tottime), 'cumtime_s': float(cumtime)}
+            for (path, line, name), (_, calls, tottime, cumtime, _) in rows]
+
+
+def _top_allocations(snapshot: '_tracemalloc.Snapshot', top: int) -> List[Dict[str, Any]]:
+    return [{'site': str(stat.traceback[0]), 'size_mb': stat.size / MB, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:top]]
+
+
+class StageProfiler:
+    """
+    Records wall / CPU time, peak memory and rows per named stage.
+
+    Args:
+        cprofile: Capture the ``top`` functions by cumulative time per stage
+        tracemalloc: Capture the traced allocation peak and the ``top``
+            allocation sites alive at the end of each stage
+        top: Functions / allocation sites kept per stage
+        interval: RSS sampling interval in seconds
+    """
+
+    def __init__(self, cprofile: bool = False, tracemalloc: bool = False,
+                 top: int = 15, interval: float = 0.005):
+        self.cprofile = cprofile
+        self.tracemalloc = tracemalloc
+        self.top = top
+        self.interval = interval
+        self.stages: Dict[str, StageProfile] = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[StageProfile]:
+        """
+        Measure the enclosed block as stage ``name``.
+
+        The yielded ``StageProfile`` can be updated inside the block (e.g.
+        ``record.rows = len(X)`` once the row count is known). Re-entering a
+        stage name adds to its times.
+        """
+        record = self.stages.setdefault(name, StageProfile(name))
+        if rows is not None:
+            record.rows = rows
+
+        profile = cProfile.Profile() if self.cprofile else None
+        started_tracing = self.tracemalloc and not _tracemalloc.is_tracing()
+        if started_tracing:
+            _tracemalloc.start()
+        elif self.tracemalloc:
+            _tracemalloc.reset_peak()
+
+        memory = PeakMemory(self.interval)
+        try:
+            with memory:
+                if profile is not None:
+                    try:
+                        profile.enable()
+                    except ValueError:   # another profiler is active
+                        profile = None
+                cpu_start, wall_start = time.process_time(), time.perf_counter()
+                try:
+                    yield record
+                finally:
+                    record.wall_s += time.perf_counter() - wall_start
+                    record.cpu_s += time.process_time() - cpu_start
+                    if profile is not None:
+                        profile.disable()
+        finally:
+            record.peak_rss_mb = max(record.peak_rss_mb, memory.peak / MB)
+            record.rss_growth_mb = max(record.rss_growth_mb, memory.growth / MB)
+            if profile is not None:
+                record.top_functions = _top_functions(profile, self.top)
+            if self.tracemalloc:
+                record.traced_peak_mb = _tracemalloc.get_traced_memory()[1] / MB
+                record.top_allocations = _top_allocations(_tracemalloc.take_snapshot(), self.top)
+                if started_tracing:
+                    _tracemalloc.stop()
+
+    def profiled(self, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """Decorator measuring every call of a function as one stage."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def report(self) -> Dict[str, Any]:
+        """JSON-ready ``performance`` block (stages in execution order)."""
+        return {
+            'total_wall_s': time.perf_counter() - self._wall_start,
+            'total_cpu_s': time.process_time() - self._cpu_start,
+            'peak_rss_mb': max_rss() / MB,
+            'cpu_count': os.cpu_count(),
+            'options': {'cprofile': self.cprofile, 'tracemalloc': self.tracemalloc},
+            'stages': {name: record.to_dict() for name, record in self.stages.items()},
+        }
+
+    def summary(self) -> str:
+        """One line per stage, for the case-study log."""
+        lines = []
+        for name, record in self.stages.items():
+            rows = f'{record.rows:>9,} rows' if record.rows is not None else ' ' * 14
+            lines.append(f"{name:17} {record.wall_s:8.3f}s wall {record.cpu_s:8.3f}s CPU "
+                         f"{record.peak_rss_mb:8.1f} MB peak  {rows}")
+        return '\n'.join(lines)
@@ -0,0 +1,401 @@
+"""
+Compiled Scoring
+================
+
+``compile_scorer`` folds a fitted student and its ``FeaturePipeline`` into a
+flat scoring artifact that works on raw inputs with NumPy only:
+
+- standardization is folded into the weights and intercept, so numeric
+  columns enter one fused dot product over the raw matrix
+- every categorical column becomes a lookup table indexed by its code,
+  holding the summed contribution of the column and of every derived
+  feature computed from it (e.g. ``education_level`` mapped from
+  ``education``)
+- ``ratio`` (and ``map`` over numeric columns) derived features are the only
+  values computed at scoring time; they are appended as extra columns
+- for a ``GAMDistiller`` each numeric term is its lookup table re-expressed
+  on the raw scale (linear interpolation on a uniform grid, or nearest level
+  for low-cardinality features)
+
+Scoring a batch is then ``b + R @ w`` plus one gather per table, in
+cache-sized row chunks. The
+artifact is plain JSON, and ``score_record`` evaluates a single row with
+plain Python arithmetic to avoid per-call NumPy overhead.
+
+Inputs are raw frames or column mappings (``encode``) or an already encoded
+float matrix of the pipeline's input columns, with categorical columns
+holding their level codes (unknown levels -1). Unseen categories score as
+unknown: their mapped derived features take the ``map`` default.
+
+Example:
+    >>> scorer = compile_scorer(models['economic_student'], models['preprocessor'])
+    >>> R = scorer.encode(X_test)            # raw frame → float matrix
+    >>> probs = scorer.score(R)
+    >>> scorer.score_record(X_test.iloc[0].to_dict())
+    >>> scorer.save('results/german_credit_scorer.json')
+"""
+
+import json
+import math
+from bisect import bisect_left
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Tuple, Union
+
+import numpy as np
+from scipy.special import expit
+
+if TYPE_CHECKING:
+    from .preprocessing import FeaturePipeline
+
+# A scoring process loads only this module: pandas, sklearn and the
+# estimator modules are imported by ``compile_scorer`` and for frame inputs.
+MISSING_LEVEL = 'nan'            # same level name as preprocessing.MISSING_LEVEL
+DEFAULT_CHUNK_SIZE = 4096
+
+
+@dataclass
+class CompiledScorer:
+    """
+    Flat scoring artifact (see module docstring).
+
+    Columns of the working matrix are the pipeline's raw input columns
+    followed by one extra column per entry of ``extras``.
+
+    Args:
+        columns: Raw input column names, in matrix order
+        categories: Levels of each categorical input column
+        extras: Computed columns, ``{'op': 'ratio', 'numerator': i,
+            'denominator': k, 'offset': o}`` or ``{'op': 'map', 'source': i,
+            'keys': [...], 'values': [...], 'default': d}``
+        intercept: Folded intercept
+        weights: Linear weight per working column
+        tables: ``{'column': i, 'values': [...]}`` per categorical column;
+            ``values[0]`` is the unknown-level contribution, ``values[k + 1]``
+            level k's
+        grids: ``{'column': i, 'lower': x0, 'inv_step': 1/h, 'values': [...]}``
+        steps: ``{'column': i, 'edges': [...], 'values': [...]}``; the value
+            of the nearest level, with ``edges`` the midpoints between levels
+    """
+
+    columns: List[str]
+    categories: Dict[str, List[str]]
+    extras: List[Dict[str, Any]] = field(default_factory=list)
+    intercept: float = 0.0
+    weights: List[float] = field(default_factory=list)
+    tables: List[Dict[str, Any]] = field(default_factory=list)
+    grids: List[Dict[str, Any]] = field(default_factory=list)
+    steps: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self._prepare()
+
+    def _prepare(self) -> None:
+        """NumPy and plain-Python views of the artifact, built once."""
+        self._weights = np.asarray(self.weights, dtype=np.float64)
+        self._tables = [(t['column'], np.asarray(t['values'], dtype=np.float64))
+                        for t in self.tables]
+        self._grids = [(g['column'], g['lower'], g['inv_step'],
+                        np.asarray(g['values'], dtype=np.float64)) for g in self.grids]
+        self._steps = [(s['column'], np.asarray(s['edges'], dtype=np.float64),
+                        np.asarray(s['values'], dtype=np.float64)) for s in self.steps]
+        self._codes = {name: {level: i for i, level in enumerate(levels)}
+                       for name, levels in self.categories.items()}
+
+        # Plain lists for score_record: indexing them avoids NumPy scalars
+        self._row_linear = [(j, w) for j, w in enumerate(self.weights) if w != 0.0]
+        self._row_extras = [
+            (e['op'], e['numerator'], e['denominator'], e['offset']) if e['op'] == 'ratio'
+            else (e['op'], e['source'], dict(zip(e['keys'], e['values'])), e['default'])
+            for e in self.extras
+        ]
+        self._row_tables = [(t['column'], list(t['values'])) for t in self.tables]
+        self._row_grids = [(g['column'], g['lower'], g['inv_step'], list(g['values']))
+                           for g in self.grids]
+        self._row_steps = [(s['column'], list(s['edges']), list(s['values']))
+                           for s in self.steps]
+
+    @property
+    def n_columns(self) -> int:
+        return len(self.columns) + len(self.extras)
+
+    # ------------------------------------------------------------------
+    # Input encoding
+    # ------------------------------------------------------------------
+
+    def _code(self, column: str, value: Any) -> int:
+        codes = self._codes[column]
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return codes.get(MISSING_LEVEL, -1)
+        return codes.get(str(value), -1)
+
+    def encode(self, data, dtype=np.float64) -> np.ndarray:
+        """
+        Raw columns (DataFrame or mapping of arrays) to the float matrix.
+
+        Categorical columns are coded through their distinct values only.
+        ``dtype=np.float32`` halves the matrix; ``decision_function`` upcasts
+        it one cache-sized chunk at a time.
+        """
+        first = data[self.columns[0]]
+        R = np.empty((len(first), len(self.columns)), dtype=dtype)
+        for j, column in enumerate(self.columns):
+            values = np.asarray(data[column])
+            if column in self.categories:
+                distinct, inverse = np.unique(values.astype(str), return_inverse=True)
+                missing = self._codes[column].get(MISSING_LEVEL, -1)
+                lookup = np.array([missing if v in ('nan', 'None') else self._code(column, v)
+                                   for v in distinct], dtype=np.float64)
+                R[:, j] = lookup[inverse]
+            else:
+                R[:, j] = values.astype(R.dtype)
+        return R
+
+    # ------------------------------------------------------------------
+    # Batch scoring
+    # ------------------------------------------------------------------
+
+    def _with_extras(self, R: np.ndarray) -> np.ndarray:
+        if not self.extras:
+            return R
+        full = np.empty((len(R), self.n_columns), dtype=np.float64)
+        full[:, :R.shape[1]] = R
+        for k, extra in enumerate(self.extras):
+            j = R.shape[1] + k
+            if extra['op'] == 'ratio':
+                full[:, j] = full[:, extra['numerator']] / (full[:, extra['denominator']]
+                                                           + extra['offset'])
+            else:
+                keys = np.asarray(extra['keys'], dtype=np.float64)
+                source = full[:, extra['source']]
+                position = np.clip(np.searchsorted(keys, source), 0, max(len(keys) - 1, 0))
+                hit = keys[position] == source if len(keys) else np.zeros(len(R), bool)
+                full[:, j] = np.where(hit, np.asarray(extra['values'])[position]
+                                      if len(keys) else 0.0, extra['default'])
+        return full
+
+    def decision_function(self, R: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+        """
+        Linear predictor for an encoded matrix (n x len(columns)).
+
+        Rows are processed in cache-sized chunks so the code and
+        interpolation temporaries never leave the CPU cache. float32 input
+        is upcast per chunk, not as a whole.
+        """
+        if not isinstance(R, np.ndarray):
+            from .preprocessing import as_design_matrix
+            R = as_design_matrix(R)
+        out = np.empty(len(R))
+        for start in range(0, len(R), chunk_size):
+            block = self._with_extras(R[start:start + chunk_size].astype(np.float64))
+            eta = block @ self._weights
+            eta += self.intercept
+            for column, values in self._tables:
+                eta += np.take(values, block[:, column].astype(np.intp) + 1, mode='clip')
+            for column, lower, inv_step, values in self._grids:
+                position = np.clip((block[:, column] - lower) * inv_step, 0.0, len(values) - 1)
+                left = np.minimum(position.astype(np.intp), len(values) - 2)
+                weight = position - left
+                eta += values[left] * (1.0 - weight) + values[left + 1] * weight
+            for column, edges, values in self._steps:
+                eta += values[np.searchsorted(edges, block[:, column])]
+            out[start:start + len(eta)] = eta
+        return out
+
+    def score(self, R: np.ndarray) -> np.ndarray:
+        """P(y=1) for an encoded matrix."""
+        return expit(self.decision_function(R))
+
+    def score_frame(self, data) -> np.ndarray:
+        """P(y=1) for raw columns (DataFrame or mapping of arrays)."""
+        return self.score(self.encode(data))
+
+    # ------------------------------------------------------------------
+    # Single-row scoring
+    # ------------------------------------------------------------------
+
+    def encode_record(self, record: Mapping[str, Any]) -> List[float]:
+        return [float(self._code(c, record.get(c))) if c in self.categories
+                else float(record[c]) for c in self.columns]
+
+    def decision_record(self, row: List[float]) -> float:
+        """Linear predictor of one encoded row, in plain Python."""
+        row = list(row)
+        for op, first, second, third in self._row_extras:
+            if op == 'ratio':
+                row.append(row[first] / (row[second] + third))
+            else:
+                row.append(second.get(row[first], third))
+
+        eta = self.intercept
+        for j, w in self._row_linear:
+            eta += w * row[j]
+        for column, values in self._row_tables:
+            eta += values[min(max(int(row[column]) + 1, 0), len(values) - 1)]
+        for column, lower, inv_step, values in self._row_grids:
+            position = min(max((row[column] - lower) * inv_step, 0.0), len(values) - 1)
+            left = min(int(position), len(values) - 2)
+            weight = position - left
+            eta += values[left] * (1.0 - weight) + values[left + 1] * weight
+        for column, edges, values in self._row_steps:
+            eta += values[bisect_left(edges, row[column])]
+        return eta
+
+    def score_record(self, record: Mapping[str, Any]) -> float:
+        """P(y=1) for one raw record (column name → value)."""
+        eta = self.decision_record(self.encode_record(record))
+        return 1.0 / (1.0 + math.exp(-eta)) if eta >= 0 else math.exp(eta) / (1.0 + math.exp(eta))
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, state: Mapping[str, Any]) -> 'CompiledScorer':
+        return cls(**state)
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'CompiledScorer':
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+# ============================================================================
+# Compilation
+# ============================================================================
+
+def _map_value(mapping: Mapping[Any, Any], label: str, default: float) -> float:
+    by_label = {str(k): v for k, v in mapping.items()}
+    value = by_label.get(label, default)
+    return float('nan') if value is None else float(value)
+
+
+def compile_scorer(student, preprocessor: 'FeaturePipeline') -> CompiledScorer:
+    """
+    Compile a fitted student and its fitted pipeline into a CompiledScorer.
+
+    Args:
+        student: Fitted linear student (``coef_`` / ``intercept_``, e.g.
+            ``EconomicDistiller`` or ``LogisticRegression``) or
+            ``GAMDistiller``, trained on the pipeline's output columns
+        preprocessor: The fitted ``FeaturePipeline``
+
+    Returns:
+        CompiledScorer whose scores match
+        ``student.predict_proba(preprocessor.transform_frame(X))[:, 1]``
+    """
+    columns = list(map(str, preprocessor.feature_names_in_))
+    outputs = list(map(str, preprocessor.feature_names_out_))
+    categories = {k: list(v) for k, v in preprocessor.categories_.items()}
+    from .gam import GAMDistiller
+
+    is_gam = isinstance(student, GAMDistiller)
+    if not is_gam:
+        coef = np.ravel(student.coef_)
+        if len(coef) != len(outputs):
+            raise ValueError(f"Student has {len(coef)} coefficients for "
+                             f"{len(outputs)} pipeline outputs")
+
+    mean = np.zeros(len(outputs))
+    scale = np.ones(len(outputs))
+    scaled = {name: k for k, name in enumerate(preprocessor.scaled_columns_)}
+    for j, name in enumerate(outputs):
+        if name in scaled:
+            mean[j] = preprocessor.mean_[scaled[name]]
+            scale[j] = preprocessor.scale_[scaled[name]]
+
+    extras: List[Dict[str, Any]] = []
+    # Raw origin of every output: ('column', working index) or
+    # ('category', input name, raw value per code slot [unknown, 0, 1, ...])
+    origin: Dict[str, Tuple[Any, ...]] = {}
+    for j, name in enumerate(columns):
+        if name in categories:
+            codes = np.arange(-1, len(categories[name]), dtype=np.float64)
+            origin[name] = ('category', name, codes)
+        else:
+            origin[name] = ('column', j)
+
+    def as_column(name: str) -> int:
+        kind, *rest = origin[name]
+        if kind == 'column':
+            return rest[0]
+        # Arithmetic on a categorical code uses the code itself
+        return columns.index(rest[0])
+
+    for name, spec in preprocessor.derived_.items():
+        if spec['op'] == 'copy':
+            origin[name] = origin[spec['source']]
+        elif spec['op'] == 'ratio':
+            extras.append({'op': 'ratio', 'numerator': as_column(spec['numerator']),
+                           'denominator': as_column(spec['denominator']),
+                           'offset': float(spec.get('offset', 1.0))})
+            origin[name] = ('column', len(columns) + len(extras) - 1)
+        else:
+            default = float(spec.get('default', np.nan))
+            source = origin[spec['source']]
+            if source[0] == 'category' and spec['source'] in columns:
+                labels = categories[source[1]]
+                values = [default] + [default if level == MISSING_LEVEL
+                                      else _map_value(spec['mapping'], level, default)
+                                      for level in labels]
+                origin[name] = ('category', source[1], np.asarray(values))
+            else:
+                keys = sorted(float(k) for k in spec['mapping'])
+                by_key = {float(k): float(v) for k, v in spec['mapping'].items()}
+                extras.append({'op': 'map', 'source': as_column(spec['source']),
+                               'keys': keys, 'values': [by_key[k] for k in keys],
+                               'default': default})
+                origin[name] = ('column', len(columns) + len(extras) - 1)
+
+    n_working = len(columns) + len(extras)
+    weights = np.zeros(n_working)
+    intercept = float(np.ravel(student.intercept_)[0])
+    tables = {name: np.zeros(len(levels) + 1) for name, levels in categories.items()}
+    grids, steps = [], []
+
+    for j, name in enumerate(outputs):
+        kind, *rest = origin[name]
+        if kind == 'category':
+            column, raw = rest
+            standardized = (raw - mean[j]) / scale[j]
+            if is_gam:
+                tables[column] += student.term_effect(j, standardized)
+            else:
+                tables[column] += coef[j] * standardized
+            continue
+
+        column = rest[0]
+        if not is_gam:
+            weights[column] += coef[j] / scale[j]
+            intercept -= coef[j] * mean[j] / scale[j]
+            continue
+
+        grid, values = student.tables_[j]
+        raw_grid = grid * scale[j] + mean[j]
+        if student.terms_[j].kind == 'spline':
+            grids.append({'column': int(column), 'lower': float(raw_grid[0]),
+                          'inv_step': float((len(raw_grid) - 1) / (raw_grid[-1] - raw_grid[0])),
+                          'values': values.tolist()})
+        else:
+            steps.append({'column': int(column),
+                          'edges': ((raw_grid[1:] + raw_grid[:-1]) / 2.0).tolist(),
+                          'values': values.tolist()})
+
+    return CompiledScorer(
+        columns=columns,
+        categories=categories,
+        extras=extras,
+        intercept=intercept,
+        weights=weights.tolist(),
+        tables=[{'column': columns.index(name), 'values': values.tolist()}
+                for name, values in tables.items()],
+        grids=grids,
+        steps=steps,
+    )
@@ -0,0 +1,452 @@
+"""
+Scoring Service
+===============
+
+Local asyncio scoring server for a compiled student (``CompiledScorer``),
+with no dependency beyond the standard library and NumPy:
+
+- the scorer (student with the preprocessing folded in) is loaded once
+- concurrent requests are coalesced into micro-batches: the batcher takes
+  whatever is queued, waits at most ``max_wait_ms`` for more rows (up to
+  ``max_batch_size``) and scores the whole block with one vectorized call
+- optionally, a sampled fraction of the scored rows is shadow-scored by the
+  teacher in a worker thread, off the request path, and the student-teacher
+  gap is tracked for drift monitoring
+- ``/stats`` reports p50 / p99 latency, throughput and batch sizes
+
+Endpoints (HTTP/1.1 with keep-alive, over TCP or a Unix socket):
+
+- ``POST /score`` with ``{"records": [{column: value, ...}, ...]}`` returns
+  ``{"probabilities": [...]}``
+- ``GET /stats`` and ``GET /health``
+
+``run_load`` is a matching load generator that keeps ``concurrency``
+connections busy and measures client-side latency.
+
+Example:
+    >>> server = ScoringServer.from_results('german_credit', shadow_fraction=0.05)
+    >>> asyncio.run(server.serve(port=8080))
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .artifacts import load_models
+from .experiment import DEFAULT_OUTPUT_DIR
+from .scoring import CompiledScorer
+from .teacher_inference import as_compiled
+
+LATENCY_WINDOW = 10000
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not len(values):
+        return {'p50_ms': None, 'p99_ms': None}
+    p50, p99 = np.percentile(np.asarray(values) * 1000.0, [50, 99])
+    return {'p50_ms': float(p50), 'p99_ms': float(p99)}
+
+
+@dataclass
+class ShadowStats:
+    """Running student-teacher comparison on shadow-scored rows."""
+
+    rows: int = 0
+    abs_gap_sum: float = 0.0
+    max_abs_gap: float = 0.0
+    disagreements: int = 0
+    student_sum: float = 0.0
+    teacher_sum: float = 0.0
+
+    def update(self, student: np.ndarray, teacher: np.ndarray) -> None:
+        gap = np.abs(student - teacher)
+        self.rows += len(gap)
+        self.abs_gap_sum += float(gap.sum())
+        self.max_abs_gap = max(self.max_abs_gap, float(gap.max(initial=0.0)))
+        self.disagreements += int(np.sum((student > 0.5) != (teacher > 0.5)))
+        self.student_sum += float(student.sum())
+        self.teacher_sum += float(teacher.sum())
+
+    def to_dict(self) -> Dict[str, Any]:
+        n = max(self.rows, 1)
+        return {
+            'rows': self.rows,
+            'mean_abs_gap': self.abs_gap_sum / n,
+            'max_abs_gap': self.max_abs_gap,
+            'disagreement_rate': self.disagreements / n,
+            'mean_student': self.student_sum / n,
+            'mean_teacher': self.teacher_sum / n,
+        }
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent scoring calls into vectorized batches.
+
+    Args:
+        scorer: Compiled student
+        max_batch_size: Rows per batch
+        max_wait_ms: Longest a queued row waits for the batch to fill
+        on_batch: Called with (records, probabilities) after each batch
+    """
+
+    def __init__(self, scorer: CompiledScorer, max_batch_size: int = 1024,
+                 max_wait_ms: float = 2.0, on_batch=None):
+        self.scorer = scorer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.on_batch = on_batch
+        self.batch_sizes: deque = deque(maxlen=LATENCY_WINDOW)
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def score(self, records: List[Mapping[str, Any]]) -> np.ndarray:
+        """Probabilities for ``records``, scored in a shared batch."""
+        rows = [self.scorer.encode_record(record) for record in records]
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((records, rows, future))
+        return await future
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            n_rows = len(pending[0][1])
+            deadline = loop.time() + self.max_wait
+            while n_rows < self.max_batch_size:
+                if queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = queue.get_nowait()
+                pending.append(item)
+                n_rows += len(item[1])
+
+            records = [r for item in pending for r in item[0]]
+            rows = [row for item in pending for row in item[1]]
+            try:
+                probs = self.scorer.score(np.array(rows, dtype=np.float64).reshape(len(rows), -1))
+            except Exception as e:
+                for _, _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batch_sizes.append(len(rows))
+            offset = 0
+            for _, item_rows, future in pending:
+                if not future.done():
+                    future.set_result(probs[offset:offset + len(item_rows)])
+                offset += len(item_rows)
+            if self.on_batch is not None:
+                self.on_batch(records, probs)
+
+
+class ScoringServer:
+    """
+    HTTP scoring server around a ``MicroBatcher``.
+
+    Args:
+        scorer: Compiled student
+        teacher: Optional fitted teacher for shadow scoring
+        preprocessor: ``FeaturePipeline`` feeding the teacher
+        shadow_fraction: Fraction of scored rows also sent to the teacher
+        max_batch_size: Rows per micro-batch
+        max_wait_ms: Longest a request waits for its batch to fill
+        random_state: Seed for the shadow sampling
+    """
+
+    def __init__(self, scorer: CompiledScorer, teacher=None, preprocessor=None,
+                 shadow_fraction: float = 0.0, max_batch_size: int = 1024,
+                 max_wait_ms: float = 2.0, random_state: Optional[int] = None):
+        if shadow_fraction > 0 and (teacher is None or preprocessor is None):
+            raise ValueError('Shadow scoring needs the teacher and the preprocessor')
+        self.scorer = scorer
+        # Shadow batches are small: the compiled ensemble avoids sklearn's
+        # per-tree call overhead
+        self.teacher = as_compiled(teacher) if teacher is not None else None
+        self.preprocessor = preprocessor
+        self.shadow_fraction = shadow_fraction
+        self.batcher = MicroBatcher(scorer, max_batch_size, max_wait_ms,
+                                    on_batch=self._shadow if shadow_fraction > 0 else None)
+        self.shadow = ShadowStats()
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.rows = 0
+        self._rng = random.Random(random_state)
+        self._started: Optional[float] = None
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+        self._shadow_tasks: set = set()
+
+    @classmethod
+    def from_results(cls, case_study: str, results_dir: Union[str, Path, None] = None,
+                     shadow_fraction: float = 0.0, **kwargs) -> 'ScoringServer':
+        """
+        Load ``<case_study>_scorer.json`` (and, for shadow scoring, the
+        teacher and preprocessor from the ``<case_study>_models/`` artifact).
+        """
+        results_dir = Path(results_dir or DEFAULT_OUTPUT_DIR)
+        scorer = CompiledScorer.load(results_dir / f'{case_study}_scorer.json')
+        teacher = preprocessor = None
+        if shadow_fraction > 0:
+            models = load_models(results_dir / f'{case_study}_models')
+            teacher, preprocessor = models['teacher'], models['preprocessor']
+        return cls(scorer, teacher, preprocessor, shadow_fraction, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Shadow scoring
+    # ------------------------------------------------------------------
+
+    def _shadow(self, records: List[Mapping[str, Any]], probs: np.ndarray) -> None:
+        picked = [i for i in range(len(records)) if self._rng.random() < self.shadow_fraction]
+        if not picked:
+            return
+        sample = [records[i] for i in picked]
+        loop = asyncio.get_running_loop()
+        task = loop.run_in_executor(None, self._teacher_probs, sample)
+        self._shadow_tasks.add(task)
+
+        def done(fut, student=probs[picked]):
+            self._shadow_tasks.discard(fut)
+            if not fut.cancelled() and fut.exception() is None:
+                self.shadow.update(student, fut.result())
+        task.add_done_callback(done)
+
+    def _teacher_probs(self, records: List[Mapping[str, Any]]) -> np.ndarray:
+        frame = pd.DataFrame.from_records(records, columns=self.scorer.columns)
+        return self.teacher.predict_proba(self.preprocessor.transform_frame(frame))[:, 1]
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, latency percentiles (last requests) and batch sizes.
+
+        Throughput is measured from the first request to the latest
+        response, so idle time before the load starts does not dilute it.
+        """
+        uptime = time.perf_counter() - self._started if self._started else 0.0
+        active = self._last - self._first if self._first is not None else 0.0
+        sizes = self.batcher.batch_sizes
+        stats = {
+            'requests': self.requests,
+            'rows': self.rows,
+            'uptime_s': uptime,
+            'active_s': active,
+            'requests_per_s': self.requests / active if active else 0.0,
+            'rows_per_s': self.rows / active if active else 0.0,
+            'latency': _percentiles(list(self.latencies)),
+            'batches': len(sizes),
+            'mean_batch_size': float(np.mean(sizes)) if sizes else 0.0,
+            'max_batch_size': int(max(sizes)) if sizes else 0,
+        }
+        if self.shadow_fraction > 0:
+            stats['shadow'] = {'fraction': self.shadow_fraction, **self.shadow.to_dict()}
+        return stats
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if method == 'GET' and path == '/health':
+            return 200, {'status': 'ok'}
+        if method == 'GET' and path == '/stats':
+            return 200, self.stats()
+        if method != 'POST' or path != '/score':
+            return 404, {'error': f'No route for {method} {path}'}
+
+        start = time.perf_counter()
+        if self._first is None:
+            self._first = start
+        try:
+            payload = json.loads(body)
+            records = payload['records'] if 'records' in payload else [payload['record']]
+            probs = await self.batcher.score(records)
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': f'{type(e).__name__}: {e}'}
+        self._last = time.perf_counter()
+        self.latencies.append(self._last - start)
+        self.requests += 1
+        self.rows += len(records)
+        return 200, {'probabilities': probs.tolist()}
+
+    async def _connection(self, reader: asyncio.StreamReader,
+                          writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, response = await self._handle(method, path, body)
+                data = json.dumps(response).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f'HTTP/1.1 {status} {"OK" if status == 200 else "Error"}\r\n'
+                    f'Content-Type: application/json\r\nContent-Length: {len(data)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode()
+                    + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8080,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start listening (TCP, or a Unix socket when ``unix_path`` is set)."""
+        self.batcher.start()
+        self._started = time.perf_counter()
+        if unix_path:
+            return await asyncio.start_unix_server(self._connection, path=unix_path)
+        return await asyncio.start_server(self._connection, host, port)
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080,
+                    unix_path: Optional[str] = None) -> None:
+        """Serve until cancelled."""
+        server = await self.start(host, port, unix_path)
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                await self.batcher.stop()
+
+
+# ============================================================================
+# Load generator
+# ============================================================================
+
+@dataclass
+class LoadReport:
+    """Client-side view of a load test."""
+
+    requests: int
+    rows: int
+    errors: int
+    seconds: float
+    requests_per_s: float
+    rows_per_s: float
+    p50_ms: Optional[float]
+    p99_ms: Optional[float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def _request(reader, writer, method: str, path: str, body: bytes = b'') -> Tuple[int, bytes]:
+    writer.write(f'{method} {path} HTTP/1.1\r\nHost: econkd\r\n'
+                 f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'.encode()
+                 + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def _open(host: str, port: int, unix_path: Optional[str]):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def fetch_stats(host: str = '127.0.0.1', port: int = 8080,
+                      unix_path: Optional[str] = None) -> Dict[str, Any]:
+    """The server's ``/stats`` payload."""
+    reader, writer = await _open(host, port, unix_path)
+    try:
+        _, body = await _request(reader, writer, 'GET', '/stats')
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+async def run_load(records: Sequence[Mapping[str, Any]], n_requests: int = 10000,
+                   concurrency: int = 64, rows_per_request: int = 1,
+                   host: str = '127.0.0.1', port: int = 8080,
+                   unix_path: Optional[str] = None,
+                   random_state: Optional[int] = 0) -> LoadReport:
+    """
+    Send ``n_requests`` scoring requests over ``concurrency`` keep-alive
+    connections, each with ``rows_per_request`` records drawn from
+    ``records``.
+    """
+    rng = random.Random(random_state)
+    bodies = [json.dumps({'records': rng.sample(list(records), rows_per_request)}).encode()
+              for _ in range(min(n_requests, 1000))]
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(n_requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        reader, writer = await _open(host, port, unix_path)
+        try:
+            for i in counter:
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, 'POST', '/score',
+                                           bodies[i % len(bodies)])
+                latencies.append(time.perf_counter() - start)
+                errors += status != 200
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+    return LoadReport(
+        requests=len(latencies),
+        rows=len(latencies) * rows_per_request,
+        errors=errors,
+        seconds=seconds,
+        requests_per_s=len(latencies) / seconds,
+        rows_per_s=len(latencies) * rows_per_request / seconds,
+        **_percentiles(latencies),
+    )
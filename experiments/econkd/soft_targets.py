@@ -0,0 +1,217 @@
+"""
+Teacher Soft-Target Store
+=========================
+
+Persistent cache of teacher probabilities (soft targets) so that student
+sweeps over temperature, alpha or constraint weights do not retrain and
+re-query the teacher on every run.
+
+Entries are keyed by a SHA-256 fingerprint of the teacher class, its
+hyperparameters (including ``random_state``), the preprocessed training
+matrix and labels, and every matrix the teacher is asked to score. Each
+entry is a directory holding one ``.npy`` per split, a ``meta.json`` and,
+optionally, the fitted teacher (``teacher.joblib``). The store is bounded
+by ``max_bytes`` and evicts least-recently-used entries first.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Union
+
+import joblib
+import numpy as np
+from sklearn.base import BaseEstimator, clone
+
+from .teacher_inference import as_compiled, teacher_probabilities
+
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent / 'cache' / 'soft_targets'
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+META_FILE = 'meta.json'
+TEACHER_FILE = 'teacher.joblib'
+
+
+@dataclass
+class SoftTargets:
+    """Teacher positive-class probabilities for one or more data splits."""
+
+    key: str
+    probs: Dict[str, np.ndarray]
+    from_cache: bool
+    teacher: Optional[BaseEstimator] = field(default=None, repr=False)
+
+    def __getitem__(self, split: str) -> np.ndarray:
+        return self.probs[split]
+
+
+def _hash_array(hasher, X) -> None:
+    values = np.ascontiguousarray(np.asarray(X))
+    hasher.update(f'{values.dtype.str}{values.shape}'.encode())
+    hasher.update(values.tobytes())
+
+
+def teacher_fingerprint(teacher: BaseEstimator, X_train, y_train,
+                        eval_sets: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Fingerprint a (teacher spec, training data, scored data) combination.
+
+    Args:
+        teacher: Unfitted (or fitted) teacher; only its class and params count
+        X_train: Preprocessed training matrix
+        y_train: Training labels
+        eval_sets: Additional matrices the teacher will score, by split name
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    hasher = hashlib.sha256()
+    spec = {
+        'class': f'{type(teacher).__module__}.{type(teacher).__qualname__}',
+        'params': teacher.get_params(deep=True),
+    }
+    hasher.update(json.dumps(spec, sort_keys=True, default=repr).encode())
+    _hash_array(hasher, X_train)
+    _hash_array(hasher, y_train)
+    for split in sorted(eval_sets or {}):
+        hasher.update(split.encode())
+        _hash_array(hasher, eval_sets[split])
+    return hasher.hexdigest()
+
+
+class SoftTargetStore:
+    """
+    On-disk LRU store of teacher soft targets.
+
+    Example:
+        >>> store = SoftTargetStore()
+        >>> targets = store.get_or_fit(
+        ...     GradientBoostingClassifier(random_state=42),
+        ...     X_train_scaled, y_train, {'test': X_test_scaled},
+        ... )
+        >>> teacher_test_probs = targets['test']
+    """
+
+    def __init__(self, directory: Union[str, Path, None] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory or DEFAULT_STORE_DIR)
+        self.max_bytes = max_bytes
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / key
+
+    def get(self, key: str, load_teacher: bool = False) -> Optional[SoftTargets]:
+        """Return cached soft targets for ``key`` (None on a miss)."""
+        entry = self._entry(key)
+        meta_path = entry / META_FILE
+        if not meta_path.exists():
+            return None
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        teacher = None
+        if load_teacher:
+            if not (entry / TEACHER_FILE).exists():
+                return None
+            teacher = joblib.load(entry / TEACHER_FILE, mmap_mode='r')
+
+        probs = {split: np.load(entry / f'{split}.npy') for split in meta['splits']}
+
+        # Touch the entry so eviction sees it as recently used
+        os.utime(meta_path)
+        return SoftTargets(key=key, probs=probs, from_cache=True, teacher=teacher)
+
+    def put(self, key: str, probs: Mapping[str, np.ndarray],
+            teacher: Optional[BaseEstimator] = None) -> None:
+        """Write an entry atomically, then enforce the size bound."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.directory, prefix='.staging-'))
+        try:
+            for split, values in probs.items():
+                np.save(staging / f'{split}.npy', np.asarray(values))
+            if teacher is not None:
+                joblib.dump(teacher, staging / TEACHER_FILE)
+            with open(staging / META_FILE, 'w') as f:
+                json.dump({
+                    'splits': sorted(probs),
+                    'has_teacher': teacher is not None,
+                    'created': time.time(),
+                }, f, indent=2)
+
+            entry = self._entry(key)
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(staging, entry)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.evict()
+
+    def get_or_fit(self, teacher: BaseEstimator, X_train, y_train,
+                   eval_sets: Optional[Mapping[str, Any]] = None,
+                   keep_teacher: bool = False, n_jobs: Optional[int] = -1) -> SoftTargets:
+        """
+        Return teacher soft targets, fitting the teacher only on a cache miss.
+
+        Args:
+            teacher: Unfitted teacher estimator (cloned before fitting)
+            X_train: Preprocessed training matrix
+            y_train: Training labels
+            eval_sets: Extra matrices to score, by split name (e.g. 'test')
+            keep_teacher: Also persist/return the fitted teacher
+            n_jobs: Threads for scoring the splits (see ``teacher_probabilities``)
+
+        Returns:
+            SoftTargets with a 'train' split plus one entry per eval set
+        """
+        eval_sets = dict(eval_sets or {})
+        key = teacher_fingerprint(teacher, X_train, y_train, eval_sets)
+
+        cached = self.get(key, load_teacher=keep_teacher)
+        if cached is not None:
+            return cached
+
+        fitted = clone(teacher).fit(X_train, y_train)
+        predictor = as_compiled(fitted)
+        probs = {'train': teacher_probabilities(predictor, X_train, n_jobs=n_jobs)}
+        for split, X_split in eval_sets.items():
+            probs[split] = teacher_probabilities(predictor, X_split, n_jobs=n_jobs)
+
+        self.put(key, probs, fitted if keep_teacher else None)
+        return SoftTargets(key=key, probs=probs, from_cache=False,
+                           teacher=fitted if keep_teacher else None)
+
+    def _entries(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return [p for p in self.directory.iterdir()
+                if p.is_dir() and (p / META_FILE).exists()]
+
+    @staticmethod
+    def _size(entry: Path) -> int:
+        return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+
+    def evict(self) -> List[str]:
+        """Delete least-recently-used entries until the store fits ``max_bytes``."""
+        entries = sorted(self._entries(), key=lambda p: (p / META_FILE).stat().st_mtime)
+        sizes = {entry: self._size(entry) for entry in entries}
+        total = sum(sizes.values())
+
+        evicted = []
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+            evicted.append(entry.name)
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
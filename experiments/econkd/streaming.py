@@ -0,0 +1,100 @@
+"""
+Chunked Data Streams
+====================
+
+Readers that yield ``(X, y)`` chunks with bounded peak memory, for
+``EconomicDistiller.fit_stream``. Each reader is a generator function; wrap
+it in a lambda (or ``functools.partial``) so every epoch gets a fresh pass:
+
+    >>> stream = partial(iter_csv_chunks, 'loans.csv', 'default', 100_000)
+    >>> student.fit_stream(stream, teacher=teacher, n_epochs=2)
+
+``transform`` is applied to each raw feature frame before it is yielded
+(e.g. the fitted preprocessing), so the teacher and student see exactly the
+representation they were trained on.
+"""
+
+from typing import Any, Callable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+Chunk = Tuple[Any, np.ndarray]
+
+
+def _split_target(frame: pd.DataFrame, target: str,
+                  transform: Optional[Callable[[pd.DataFrame], Any]]) -> Chunk:
+    y = frame.pop(target).to_numpy()
+    X = transform(frame) if transform is not None else frame
+    return X, y
+
+
+def iter_array_chunks(X, y, chunk_size: int, probs: Optional[np.ndarray] = None
+                      ) -> Iterator[Tuple[Any, ...]]:
+    """Yield consecutive row slices of in-memory (or memory-mapped) arrays."""
+    n = len(y)
+    for start in range(0, n, chunk_size):
+        rows = slice(start, min(start + chunk_size, n))
+        X_chunk = X.iloc[rows] if hasattr(X, 'iloc') else X[rows]
+        y_chunk = np.asarray(y[rows] if not hasattr(y, 'iloc') else y.iloc[rows])
+        if probs is None:
+            yield X_chunk, y_chunk
+        else:
+            yield X_chunk, y_chunk, np.asarray(probs[rows])
+
+
+def iter_csv_chunks(path: str, target: str, chunk_size: int,
+                    transform: Optional[Callable[[pd.DataFrame], Any]] = None,
+                    usecols: Optional[Sequence[str]] = None,
+                    **read_csv_kwargs) -> Iterator[Chunk]:
+    """
+    Stream a CSV file in ``chunk_size``-row pieces.
+
+    Args:
+        path: CSV file path
+        target: Name of the label column
+        chunk_size: Rows per chunk
+        transform: Optional feature transform applied per chunk
+        usecols: Columns to read (must include ``target``)
+        **read_csv_kwargs: Passed through to ``pd.read_csv``
+
+    Yields:
+        (X_chunk, y_chunk)
+    """
+    reader = pd.read_csv(path, chunksize=chunk_size, usecols=usecols, **read_csv_kwargs)
+    with reader:
+        for frame in reader:
+            yield _split_target(frame, target, transform)
+
+
+def iter_parquet_chunks(path: str, target: str, chunk_size: int,
+                        transform: Optional[Callable[[pd.DataFrame], Any]] = None,
+                        columns: Optional[Sequence[str]] = None) -> Iterator[Chunk]:
+    """
+    Stream a Parquet file in record batches of at most ``chunk_size`` rows.
+
+    Requires ``pyarrow`` (optional dependency).
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("iter_parquet_chunks requires pyarrow: pip install pyarrow") from e
+
+    parquet = pq.ParquetFile(path)
+    for batch in parquet.iter_batches(batch_size=chunk_size, columns=columns):
+        yield _split_target(batch.to_pandas(), target, transform)
+
+
+def iter_generator_chunks(make_chunk: Callable[[int], Optional[Chunk]]) -> Iterator[Chunk]:
+    """
+    Yield chunks from a callable ``make_chunk(i)`` until it returns None.
+
+    Useful for data produced on the fly (database cursors, simulators).
+    """
+    i = 0
+    while True:
+        chunk = make_chunk(i)
+        if chunk is None:
+            return
+        yield chunk
+        i += 1
@@ -0,0 +1,560 @@
+"""
+Structural Break Detection
+==========================
+
+Rolling-window coefficient tracking with CUSUM and Chow tests, as described
+in docs/METHODOLOGY.md ("Structural Break Detection").
+
+The data is sorted by time once; every window is then a contiguous slice of
+the same C-contiguous matrix (no copies). Windows are either a number of rows
+or a number of consecutive time periods (e.g. 24 monthly credit vintages
+sliding one month at a time). The student is refitted on each window
+warm-started from the previous window's coefficients, so heavily overlapping
+windows converge in a handful of L-BFGS-B iterations instead of a cold fit
+each; the total cost is O(n · window/step · p) per iteration.
+
+Both tests then run on the stacked (windows x features) coefficient path
+without any further fitting:
+
+- CUSUM: cumulative sum of the centered coefficient path per feature,
+  standardized by a difference-based long-run variance (overlapping windows
+  are autocorrelated) and compared with the supremum of a Brownian bridge
+- Chow: Wald form of the Chow test for each pair of adjacent non-overlapping
+  windows, ``(β₂ - β₁)ᵀ(V₁ + V₂)⁻¹(β₂ - β₁) ~ χ²_p``, computed for all
+  boundaries with one batched solve, plus per-feature z statistics
+
+``chow_scan`` instead tests every candidate break date of a pooled student
+without refitting anything: prefix sums of the IRLS sufficient statistics
+give both segments' fits at each split in O(n·p²) time and O(n·p) memory,
+and the sup-F
+statistic gets an asymptotic p-value from Andrews' (1993) distribution.
+"""
+
+import math
+import time as _time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.special import expit, logit
+from sklearn.base import clone
+
+from .distiller import PROB_CLIP, EconomicDistiller
+from .marginal_effects import logistic_covariance
+
+PREFIX_BLOCK = 1 << 21   # float64 entries of per-row (p+1)² running sums held at once
+
+
+@dataclass
+class CusumResult:
+    """
+    CUSUM test on each coefficient path.
+
+    ``path[t, j]`` is the standardized cumulative deviation of feature j up
+    to window t; ``statistic[j]`` its maximum absolute value, located at
+    ``break_label[j]`` (the centre of window ``break_index[j]``).
+    """
+
+    feature_names: List[str]
+    path: np.ndarray
+    statistic: np.ndarray
+    critical_value: float
+    break_index: np.ndarray
+    break_label: np.ndarray
+
+    @property
+    def reject(self) -> np.ndarray:
+        return self.statistic > self.critical_value
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({
+            'cusum_stat': self.statistic,
+            'cusum_break': self.break_label,
+            'cusum_reject': self.reject,
+        }, index=pd.Index(self.feature_names, name='feature'))
+
+
+@dataclass
+class ChowResult:
+    """
+    Wald-form Chow tests between adjacent non-overlapping windows.
+
+    Row k compares the windows ending and starting at ``boundary[k]``;
+    ``z[k, j]`` is the standardized shift of feature j across it. P-values
+    are pointwise; scanning many boundaries inflates the false-alarm rate.
+    """
+
+    feature_names: List[str]
+    boundary: np.ndarray
+    statistic: np.ndarray
+    df: int
+    p_value: np.ndarray
+    shift: np.ndarray
+    z: np.ndarray
+
+    @property
+    def f_statistic(self) -> np.ndarray:
+        return self.statistic / self.df
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({'boundary': self.boundary, 'F': self.f_statistic,
+                              'p_value': self.p_value})
+        z = pd.DataFrame(self.z, columns=[f'z_{name}' for name in self.feature_names])
+        return pd.concat([frame, z], axis=1)
+
+
+@dataclass
+class RollingCoefficients:
+    """
+    Coefficient path of a student refitted over rolling windows.
+
+    Window t covers rows ``[row_start[t], row_stop[t])`` of the time-sorted
+    data; ``start`` / ``end`` / ``center`` are the time labels (or row
+    positions when no time was given) of its first, last and middle row.
+    ``covariance`` holds the (p x p) inverse Fisher information of each
+    window's coefficients and is None when not computed.
+    """
+
+    feature_names: List[str]
+    start: np.ndarray
+    end: np.ndarray
+    center: np.ndarray
+    row_start: np.ndarray
+    row_stop: np.ndarray
+    coef: np.ndarray
+    intercept: np.ndarray
+    n_iter: np.ndarray
+    overlap: int
+    covariance: Optional[np.ndarray] = field(default=None, repr=False)
+    fit_seconds: float = 0.0
+
+    @property
+    def n_windows(self) -> int:
+        return len(self.coef)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Coefficient path, one row per window indexed by its start label."""
+        frame = pd.DataFrame(self.coef, columns=self.feature_names,
+                             index=pd.Index(self.start, name='window_start'))
+        frame['intercept'] = self.intercept
+        return frame
+
+    def cusum(self, alpha: float = 0.05) -> CusumResult:
+        """
+        CUSUM test for a shift in the mean of each coefficient path.
+
+        The long-run variance comes from first differences of the path, so a
+        level shift does not inflate it: a window averaging ``overlap``
+        periods moves by (u_new - u_old) / overlap per step, giving
+        LRV = overlap² · E[Δβ²] / 2.
+        """
+        n_windows = self.n_windows
+        if n_windows < 3:
+            raise ValueError('CUSUM needs at least 3 windows')
+        deviations = self.coef - self.coef.mean(axis=0)
+
+        long_run = self.overlap ** 2 * np.mean(np.diff(self.coef, axis=0) ** 2, axis=0) / 2.0
+        scale = np.sqrt(np.maximum(long_run, np.finfo(float).tiny) * n_windows)
+
+        path = np.cumsum(deviations, axis=0) / scale
+        break_index = np.abs(path).argmax(axis=0)
+        return CusumResult(
+            feature_names=self.feature_names,
+            path=path,
+            statistic=np.abs(path).max(axis=0),
+            critical_value=float(stats.kstwobign.ppf(1.0 - alpha)),
+            break_index=break_index,
+            break_label=self.center[break_index],
+        )
+
+    def chow(self) -> ChowResult:
+        """Chow tests between every window and the first one not overlapping it."""
+        if self.covariance is None:
+            raise ValueError('Chow tests need the window covariances '
+                             '(rolling_coefficients(..., covariance=True))')
+        later = np.searchsorted(self.row_start, self.row_stop)
+        earlier = np.flatnonzero(later < self.n_windows)
+        if not len(earlier):
+            raise ValueError('No pair of non-overlapping windows to compare')
+        later = later[earlier]
+
+        shift = self.coef[later] - self.coef[earlier]
+        pooled = self.covariance[later] + self.covariance[earlier]
+        statistic = np.einsum('kj,kj->k', shift,
+                              np.linalg.solve(pooled, shift[..., None])[..., 0])
+        z = shift / np.sqrt(np.diagonal(pooled, axis1=1, axis2=2))
+        df = self.coef.shape[1]
+        return ChowResult(
+            feature_names=self.feature_names,
+            boundary=self.start[later],
+            statistic=statistic,
+            df=df,
+            p_value=stats.chi2.sf(statistic, df),
+            shift=shift,
+            z=z,
+        )
+
+    def summary(self, alpha: float = 0.05) -> pd.DataFrame:
+        """
+        Per-feature break summary: CUSUM statistic and location, plus the
+        boundary with the largest Chow z and its value (when covariances
+        are available).
+        """
+        frame = self.cusum(alpha).to_frame()
+        if self.covariance is not None:
+            chow = self.chow()
+            peak = np.abs(chow.z).argmax(axis=0)
+            frame['chow_max_z'] = chow.z[peak, np.arange(len(peak))]
+            frame['chow_break'] = chow.boundary[peak]
+        return frame
+
+
+def _period_starts(time: Optional[np.ndarray], n_rows: int) -> np.ndarray:
+    """First row of every period in time-sorted data, plus ``n_rows``."""
+    if time is None:
+        return np.arange(n_rows + 1)
+    change = np.flatnonzero(time[1:] != time[:-1]) + 1
+    return np.concatenate([[0], change, [n_rows]])
+
+
+def _window_bounds(n_rows: int, time: Optional[np.ndarray], window: int, step: int):
+    """Row slices ``[start, stop)`` of every window."""
+    unit_rows = _period_starts(time, n_rows)
+    n_units = len(unit_rows) - 1
+    if window > n_units:
+        raise ValueError(f"window={window} is larger than the {n_units} "
+                         f"{'periods' if time is not None else 'rows'} available")
+    first = np.arange(0, n_units - window + 1, step)
+    return unit_rows[first], unit_rows[first + window]
+
+
+def _sorted_inputs(X, y, teacher_probs, time):
+    """Feature names plus float arrays sorted by ``time`` (stable)."""
+    feature_names = ([str(c) for c in X.columns] if hasattr(X, 'columns')
+                     else [f'x{j}' for j in range(np.shape(X)[1])])
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    teacher_probs = y if teacher_probs is None else np.asarray(teacher_probs, dtype=np.float64)
+
+    labels = None
+    if time is not None:
+        labels = np.asarray(time)
+        order = np.argsort(labels, kind='stable')
+        X, y, teacher_probs, labels = X[order], y[order], teacher_probs[order], labels[order]
+    return feature_names, np.ascontiguousarray(X), y, teacher_probs, labels
+
+
+def rolling_coefficients(X, y, teacher_probs=None, time=None,
+                         window: int = 500, step: Optional[int] = None,
+                         student: Optional[EconomicDistiller] = None,
+                         warm_start: bool = True, covariance: bool = True,
+                         min_samples: int = 0) -> RollingCoefficients:
+    """
+    Refit the student over rolling windows of time-ordered data.
+
+    Args:
+        X: Features (DataFrame or array, n x p)
+        y: Binary labels (n,)
+        teacher_probs: Teacher P(y=1|x) per row; None distills from the
+            labels themselves
+        time: Sortable time label per row (e.g. vintage month). When given,
+            ``window`` and ``step`` count distinct periods; otherwise rows
+            (in the given order)
+        window: Window length in periods (or rows)
+        step: Shift between consecutive windows (defaults to ``window // 10``)
+        student: Unfitted ``EconomicDistiller`` template (defaults to
+            ``EconomicDistiller()``); cloned once and refitted per window
+        warm_start: Start each fit from the previous window's coefficients
+        covariance: Compute the per-window covariances needed by ``chow``
+        min_samples: Skip windows with fewer rows (periods can be uneven)
+
+    Returns:
+        RollingCoefficients
+
+    Example:
+        >>> path = rolling_coefficients(X, y, teacher_probs, time=df['vintage'],
+        ...                             window=24, step=1,
+        ...                             student=EconomicDistiller(constraints=constraints))
+        >>> path.summary()
+    """
+    feature_names, X, y, teacher_probs, labels = _sorted_inputs(X, y, teacher_probs, time)
+    step = step or max(1, window // 10)
+
+    row_start, row_stop = _window_bounds(len(X), labels, window, step)
+    keep = (row_stop - row_start) >= max(min_samples, 1)
+    row_start, row_stop = row_start[keep], row_stop[keep]
+    if not len(row_start):
+        raise ValueError('No window has enough rows')
+
+    # Column names let the student map constraints onto the bare array
+    template = clone(student) if student is not None else EconomicDistiller()
+    frame_columns = pd.Index(feature_names)
+
+    n_windows, n_features = len(row_start), X.shape[1]
+    coef = np.empty((n_windows, n_features))
+    intercept = np.empty(n_windows)
+    n_iter = np.empty(n_windows, dtype=int)
+    cov = np.empty((n_windows, n_features, n_features)) if covariance else None
+
+    coef_init, intercept_init = None, None
+    start_time = _time.perf_counter()
+    for t, (lo, hi) in enumerate(zip(row_start, row_stop)):
+        X_window = pd.DataFrame(X[lo:hi], columns=frame_columns, copy=False)
+        template.fit(X_window, y[lo:hi], teacher_probs[lo:hi],
+                     coef_init=coef_init, intercept_init=intercept_init)
+        coef[t] = template.coef_[0]
+        intercept[t] = template.intercept_[0]
+        n_iter[t] = int(np.ravel(template.n_iter_)[0])
+        if cov is not None:
+            cov[t] = logistic_covariance(template, X[lo:hi])[:n_features, :n_features]
+        if warm_start:
+            coef_init, intercept_init = coef[t], intercept[t]
+    fit_seconds = _time.perf_counter() - start_time
+
+    positions = labels if labels is not None else np.arange(len(X))
+    center = (row_start + row_stop) // 2
+    # Number of windows sharing rows with any given one (the CUSUM bandwidth)
+    overlap = 1
+    if n_windows > 1:
+        overlap = max(1, math.ceil(np.mean(row_stop - row_start) / np.mean(np.diff(row_start))))
+    return RollingCoefficients(
+        feature_names=feature_names,
+        start=positions[row_start],
+        end=positions[row_stop - 1],
+        center=positions[center],
+        row_start=row_start,
+        row_stop=row_stop,
+        coef=coef,
+        intercept=intercept,
+        n_iter=n_iter,
+        overlap=overlap,
+        covariance=cov,
+        fit_seconds=fit_seconds,
+    )
+
+
+@dataclass
+class ChowScan:
+    """
+    Chow F statistic at every candidate break point.
+
+    Candidate k splits the time-sorted rows into ``[0, position[k])`` and
+    ``[position[k], n)``; ``location[k]`` is the time label (or row position)
+    of the first row after the split and ``shift[k]`` the coefficient change
+    (second segment minus first). ``p_value`` is the asymptotic p-value of
+    ``sup_f`` under Andrews' (1993) sup-F distribution, which accounts for
+    scanning all candidates; None when not simulated.
+    """
+
+    feature_names: List[str]
+    location: np.ndarray
+    position: np.ndarray
+    f_statistic: np.ndarray
+    df: int
+    shift: np.ndarray
+    trim: float
+    p_value: Optional[float] = None
+
+    @property
+    def sup_index(self) -> int:
+        return int(np.argmax(self.f_statistic))
+
+    @property
+    def sup_f(self) -> float:
+        return float(self.f_statistic[self.sup_index])
+
+    @property
+    def break_location(self):
+        return self.location[self.sup_index]
+
+    @property
+    def coefficient_shift(self) -> pd.Series:
+        """Per-feature coefficient shift at the sup-F break point."""
+        return pd.Series(self.shift[self.sup_index], index=self.feature_names)
+
+    def to_frame(self) -> pd.DataFrame:
+        frame = pd.DataFrame({'location': self.location, 'position': self.position,
+                              'F': self.f_statistic})
+        shift = pd.DataFrame(self.shift, columns=[f'shift_{name}' for name in self.feature_names])
+        return pd.concat([frame, shift], axis=1)
+
+
+def _working_response(model, X: np.ndarray, y: np.ndarray, teacher_probs: np.ndarray):
+    """
+    IRLS weights and working response of ``model``'s loss at its fitted
+    coefficients: h = ∂²L/∂η², z = η - (∂L/∂η) / h.
+
+    For an ``EconomicDistiller`` the loss is α·L_KD + γ·L_hard; anything
+    else with ``coef_`` / ``intercept_`` is treated as a plain logistic
+    regression on ``y``.
+    """
+    eta = X @ np.ravel(model.coef_) + np.ravel(model.intercept_)[0]
+    prob = expit(eta)
+    if isinstance(model, EconomicDistiller):
+        T = model.temperature
+        soft = expit(logit(np.clip(teacher_probs, PROB_CLIP, 1.0 - PROB_CLIP)) / T)
+        prob_T = expit(eta / T)
+        grad = model.alpha * T * (prob_T - soft) + model.gamma * (prob - y)
+        hess = model.alpha * prob_T * (1.0 - prob_T) + model.gamma * prob * (1.0 - prob)
+    else:
+        grad = prob - y
+        hess = prob * (1.0 - prob)
+    hess = np.maximum(hess, np.finfo(float).eps)
+    return hess, eta - grad / hess
+
+
+def _segment_fits(A: np.ndarray, b: np.ndarray, c: np.ndarray):
+    """Batched weighted least squares from sufficient statistics."""
+    try:
+        coef = np.linalg.solve(A, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        coef = np.einsum('kij,kj->ki', np.linalg.pinv(A), b)
+    return coef, c - np.einsum('kj,kj->k', b, coef)
+
+
+def sup_f_pvalue(sup_f: float, df: int, trim: float = 0.15, n_simulations: int = 2000,
+                 n_grid: int = 1000, random_state: Optional[int] = 0) -> float:
+    """
+    Asymptotic p-value of a sup-F statistic (Andrews, 1993).
+
+    Simulates ``sup_{π ∈ [trim, 1 - trim]} ||W(π) - πW(1)||² / (π(1 - π))``
+    for a ``df``-dimensional Brownian motion W on a grid of ``n_grid`` steps
+    and compares it with ``df · sup_f``.
+    """
+    rng = np.random.default_rng(random_state)
+    pi = np.arange(1, n_grid + 1) / n_grid
+    inside = (pi >= trim) & (pi <= 1.0 - trim)
+    pi = pi[inside]
+
+    exceed = 0
+    batch = max(1, 2_000_000 // (n_grid * df))
+    for start in range(0, n_simulations, batch):
+        size = min(batch, n_simulations - start)
+        walk = np.cumsum(rng.standard_normal((size, n_grid, df)), axis=1) / np.sqrt(n_grid)
+        bridge = walk[:, inside] - pi[None, :, None] * walk[:, -1:]
+        sup = (np.sum(bridge ** 2, axis=2) / (pi * (1.0 - pi))).max(axis=1)
+        exceed += int(np.sum(sup >= df * sup_f))
+    return exceed / n_simulations
+
+
+def chow_scan(model, X, y, teacher_probs=None, time=None, trim: float = 0.15,
+              step: int = 1, chunk_size: int = 4096,
+              n_simulations: int = 2000, random_state: Optional[int] = 0) -> ChowScan:
+    """
+    Chow F test at every candidate break point of a fitted student.
+
+    The logistic likelihood is replaced by its IRLS approximation at the
+    pooled fit: with working weights h and response z from ``model``, each
+    segment's coefficients and residual sum of squares follow from the
+    sufficient statistics X̃ᵀHX̃, X̃ᵀHz and zᵀHz of its rows (X̃ = X plus an
+    intercept column). After one pass for the pooled totals, they are
+    accumulated as prefix sums in a second pass, and each block of rows
+    solves both segments of its candidates right away, keeping only their F
+    statistics and coefficient shifts. The scan costs O(n·p²) time plus two
+    (p+1)-sized solves per candidate instead of two refits per candidate, and
+    its memory does not grow with p² times the number of candidates:
+
+        F = [(RSS_pooled - RSS_1 - RSS_2) / k] / [(RSS_1 + RSS_2) / (n - 2k)]
+
+    Args:
+        model: Fitted pooled student (an ``EconomicDistiller`` such as
+            ``result.models['economic_student']``, or any logistic model with
+            ``coef_`` / ``intercept_``), already fitted on these rows
+        X: Features in the model's input space (n x p)
+        y: Binary labels (n,)
+        teacher_probs: Teacher P(y=1|x) per row (``EconomicDistiller`` only;
+            None uses the labels)
+        time: Sortable time label per row; candidates are then the period
+            boundaries. Without it every row position is a candidate and the
+            given row order is the time order
+        trim: Fraction of rows excluded at each end (Andrews' π₀)
+        step: Keep every ``step``-th candidate
+        chunk_size: Rows per block when accumulating prefix sums (fewer
+            when the block's running (p+1)² sums would exceed
+            ``PREFIX_BLOCK`` entries)
+        n_simulations: Draws for the sup-F p-value (0 to skip)
+        random_state: Seed for the p-value simulation
+
+    Returns:
+        ChowScan
+
+    Example:
+        >>> student = result.models['economic_student']
+        >>> scan = chow_scan(student, X_train_scaled, y_train, teacher_train_probs,
+        ...                  time=application_month)
+        >>> scan.sup_f, scan.break_location, scan.p_value
+        >>> scan.coefficient_shift
+    """
+    feature_names, X, y, teacher_probs, labels = _sorted_inputs(X, y, teacher_probs, time)
+    n, p = X.shape
+    k = p + 1
+    if n <= 2 * k:
+        raise ValueError(f"Need more than {2 * k} rows for a Chow test with {p} features")
+
+    candidates = _period_starts(labels, n)[1:-1]
+    lo_bound = max(k, int(math.ceil(trim * n)))
+    hi_bound = min(n - k, int(math.floor((1.0 - trim) * n)))
+    candidates = candidates[(candidates >= lo_bound) & (candidates <= hi_bound)][::step]
+    if not len(candidates):
+        raise ValueError('No candidate break points left after trimming')
+
+    weights, response = _working_response(model, X, y, teacher_probs)
+
+    def blocks(size: int):
+        for lo in range(0, n, size):
+            hi = min(lo + size, n)
+            X_tilde = np.column_stack([X[lo:hi], np.ones(hi - lo)])
+            yield lo, hi, X_tilde, X_tilde * weights[lo:hi, None]
+
+    # Pooled sufficient statistics first, so that both segments can be solved
+    # as soon as a candidate's prefix sums are known
+    A_total, b_total, c_total = np.zeros((k, k)), np.zeros(k), 0.0
+    for lo, hi, X_tilde, weighted in blocks(chunk_size):
+        A_total += weighted.T @ X_tilde
+        b_total += weighted.T @ response[lo:hi]
+        c_total += float(np.dot(weights[lo:hi], response[lo:hi] ** 2))
+    _, rss_pooled = _segment_fits(A_total[None], b_total[None], np.array([c_total]))
+
+    # Prefix sums evaluated only at candidates; each block's candidates are
+    # solved immediately and only their F statistic and shift are kept
+    f_statistic = np.empty(len(candidates))
+    shift = np.empty((len(candidates), p))
+    A_carry, b_carry, c_carry = np.zeros((k, k)), np.zeros(k), 0.0
+    cursor = 0
+    for lo, hi, X_tilde, weighted in blocks(max(1, min(chunk_size, PREFIX_BLOCK // (k * k)))):
+        stop = cursor + np.searchsorted(candidates[cursor:], hi, side='right')
+        if stop > cursor:
+            rows = candidates[cursor:stop] - lo - 1
+            A1 = A_carry + np.cumsum(np.einsum('ni,nj->nij', weighted, X_tilde), axis=0)[rows]
+            b1 = b_carry + np.cumsum(weighted * response[lo:hi, None], axis=0)[rows]
+            c1 = c_carry + np.cumsum(weights[lo:hi] * response[lo:hi] ** 2)[rows]
+            coef_1, rss_1 = _segment_fits(A1, b1, c1)
+            coef_2, rss_2 = _segment_fits(A_total - A1, b_total - b1, c_total - c1)
+
+            rss_split = np.maximum(rss_1 + rss_2, np.finfo(float).tiny)
+            f_statistic[cursor:stop] = ((rss_pooled[0] - rss_split) / k) / (rss_split / (n - 2 * k))
+            shift[cursor:stop] = (coef_2 - coef_1)[:, :p]
+            cursor = stop
+            if cursor == len(candidates):
+                break
+
+        A_carry = A_carry + weighted.T @ X_tilde
+        b_carry = b_carry + weighted.T @ response[lo:hi]
+        c_carry += float(np.dot(weights[lo:hi], response[lo:hi] ** 2))
+
+    positions = labels if labels is not None else np.arange(n)
+    scan = ChowScan(
+        feature_names=feature_names,
+        location=positions[candidates],
+        position=candidates,
+        f_statistic=f_statistic,
+        df=k,
+        shift=shift,
+        trim=trim,
+    )
+    if n_simulations:
+        scan.p_value = sup_f_pvalue(scan.sup_f, k, trim, n_simulations,
+                                    random_state=random_state)
+    return scan
@@ -0,0 +1,366 @@
+"""
+Distillation Hyperparameter Sweeps
+==================================
+
+Grid, random and successive-halving searches over the ``EconomicDistiller``
+hyperparameters (temperature T, α, β, γ, C, ...).
+
+Every trial reuses the same inputs: the preprocessed training matrix is
+written once to a read-only memory-mapped ``.npy`` shared by all workers
+(see ``bootstrap.shared_readonly_array``) and the teacher soft targets are
+passed in, typically straight from the ``SoftTargetStore``, so the teacher
+is never refitted. Candidates are ordered so that neighbouring trials differ
+in as few parameters as possible, split into contiguous chunks per worker,
+and each fit is warm-started from the previous trial's coefficients (or,
+under successive halving, from the same candidate's previous rung).
+
+Results land in one table (one row per trial) with AUC / F1 per evaluation
+set, constraint compliance, fit time and iteration count;
+``SweepResult.pareto_front`` extracts the non-dominated trade-offs.
+
+Note that with the default ``constraint_mode='bounds'`` the constraints are
+enforced exactly and β has no effect; sweep β together with
+``constraint_mode='penalty'``.
+"""
+
+import math
+import time
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.metrics import f1_score, roc_auc_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler, train_test_split
+
+from .bootstrap import shared_readonly_array
+from .distiller import EconomicDistiller
+from .preprocessing import as_design_matrix
+
+SEARCH_METHODS = ('grid', 'random', 'halving')
+
+DEFAULT_SPACE: Dict[str, List[Any]] = {
+    'temperature': [1.0, 2.0, 4.0, 8.0],
+    'alpha': [0.3, 0.5, 0.7],
+    'gamma': [0.1, 0.2, 0.4],
+    'C': [0.1, 0.5, 1.0],
+}
+
+
+@dataclass
+class SweepResult:
+    """
+    Trial table of a sweep.
+
+    ``table`` has one row per trial: the swept parameters, ``rung`` and
+    ``n_rows`` (training rows used), ``<set>_auc`` / ``<set>_f1`` for every
+    evaluation set, ``compliance`` (%), ``fit_time`` (s), ``n_iter`` and
+    ``converged``. ``resources`` lists the training rows of each rung (one
+    entry for grid and random search).
+    """
+
+    table: pd.DataFrame
+    params: List[str]
+    metric: str
+    search: str
+    resources: List[int] = field(default_factory=list)
+
+    @property
+    def n_rungs(self) -> int:
+        return len(self.resources)
+
+    @property
+    def final(self) -> pd.DataFrame:
+        """Trials of the last rung, i.e. those fitted on all training rows."""
+        return self.table[self.table['rung'] == self.table['rung'].max()]
+
+    def best(self, metric: Optional[str] = None) -> pd.Series:
+        """Full-data trial with the highest ``metric``."""
+        final = self.final
+        return final.loc[final[metric or self.metric].idxmax()]
+
+    def pareto_front(self, maximize: Sequence[str] = (),
+                     minimize: Sequence[str] = ('fit_time',)) -> pd.DataFrame:
+        """
+        Non-dominated full-data trials.
+
+        Args:
+            maximize: Columns to maximize (default: the sweep metric and
+                compliance)
+            minimize: Columns to minimize
+
+        Returns:
+            Pareto-optimal rows, sorted by the first maximized column
+        """
+        maximize = list(maximize) or [self.metric, 'compliance']
+        final = self.final
+        # Compliance is NaN when no constraints apply to the features
+        maximize = [c for c in maximize if final[c].notna().any()]
+        values = np.column_stack(
+            [final[c].to_numpy(dtype=float) for c in maximize]
+            + [-final[c].to_numpy(dtype=float) for c in minimize]
+        )
+        front = final[pareto_mask(values)]
+        return front.sort_values(maximize[0], ascending=False)
+
+
+def pareto_mask(values: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask of non-dominated rows of ``values`` (all objectives maximized).
+
+    A row is dominated when another row is at least as good on every
+    objective and strictly better on one.
+    """
+    values = np.asarray(values, dtype=float)
+    geq = (values[:, None, :] >= values[None, :, :]).all(axis=2)
+    gt = (values[:, None, :] > values[None, :, :]).any(axis=2)
+    dominated = (geq & gt).any(axis=0)
+    return ~dominated
+
+
+def _candidates(space: Mapping[str, Any], search: str, n_iter: Optional[int],
+                random_state: Optional[int]) -> List[Dict[str, Any]]:
+    if search == 'random' or (search == 'halving' and n_iter is not None):
+        candidates = list(ParameterSampler(space, n_iter=n_iter or 20,
+                                           random_state=random_state))
+    else:
+        candidates = list(ParameterGrid(space))
+    # Neighbouring trials differ in as few (trailing) parameters as possible
+    keys = sorted(space)
+    return sorted(candidates, key=lambda c: tuple(float(c[k]) if _numeric(c[k])
+                                                  else str(c[k]) for k in keys))
+
+
+def _numeric(value) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
+
+
+def _fit_chunk(X_path: str, y: np.ndarray, teacher_probs: np.ndarray,
+               feature_names: List[str], constraints: Optional[Dict[str, Any]],
+               eval_sets: Dict[str, Tuple[np.ndarray, np.ndarray]],
+               base_params: Dict[str, Any], trials: List[Dict[str, Any]],
+               rows: np.ndarray, warm_start: bool):
+    """Fit a chain of trials against the memory-mapped ``X`` (in a worker)."""
+    X = np.load(X_path, mmap_mode='r')
+    X_fit = pd.DataFrame(X[rows], columns=feature_names, copy=False)
+    y_fit, probs_fit = y[rows], teacher_probs[rows]
+
+    records = []
+    previous = None
+    for trial in trials:
+        init = trial.get('init') if trial.get('init') is not None else previous
+        student = EconomicDistiller(constraints=constraints,
+                                    **{**base_params, **trial['params']})
+        start = time.perf_counter()
+        if warm_start and init is not None:
+            student.fit(X_fit, y_fit, probs_fit, coef_init=init[0], intercept_init=init[1])
+        else:
+            student.fit(X_fit, y_fit, probs_fit)
+        fit_time = time.perf_counter() - start
+
+        record = {
+            **trial['params'],
+            'trial': trial['id'],
+            'fit_time': fit_time,
+            'n_iter': int(student.n_iter_[0]),
+            'converged': student.converged_,
+            'loss': student.loss_,
+            'compliance': (student.constraint_set_.compliance_rate(student.coef_[0])
+                           if len(student.constraint_set_) else np.nan),
+        }
+        for name, (X_eval, y_eval) in eval_sets.items():
+            probs = student.predict_proba(pd.DataFrame(X_eval, columns=feature_names,
+                                                       copy=False))[:, 1]
+            record[f'{name}_auc'] = roc_auc_score(y_eval, probs)
+            record[f'{name}_f1'] = f1_score(y_eval, (probs > 0.5).astype(int))
+        records.append((record, (student.coef_[0].copy(), float(student.intercept_[0]))))
+        previous = records[-1][1]
+    return records
+
+
+def sweep_distiller(X, y, teacher_probs,
+                    eval_sets: Mapping[str, Tuple[Any, Any]],
+                    space: Optional[Mapping[str, Any]] = None,
+                    constraints: Optional[Dict[str, Dict[str, Any]]] = None,
+                    search: str = 'grid',
+                    n_iter: Optional[int] = None,
+                    base_params: Optional[Dict[str, Any]] = None,
+                    metric: Optional[str] = None,
+                    eta: int = 3,
+                    min_resources: Optional[int] = None,
+                    warm_start: bool = True,
+                    n_jobs: int = -1,
+                    random_state: Optional[int] = None,
+                    temp_folder: Optional[str] = None) -> SweepResult:
+    """
+    Sweep ``EconomicDistiller`` hyperparameters.
+
+    Args:
+        X: Preprocessed training features (DataFrame, n x p)
+        y: Binary training labels (n,)
+        teacher_probs: Teacher P(y=1|x) on the training rows (n,)
+        eval_sets: Evaluation sets by name, ``{'val': (X_val, y_val), ...}``;
+            the first one drives selection and halving
+        space: Parameter lists (or scipy distributions for random search)
+            by ``EconomicDistiller`` argument; defaults to ``DEFAULT_SPACE``
+        constraints: Economic constraints passed to every student
+        search: 'grid', 'random' or 'halving' (successive halving over
+            training rows)
+        n_iter: Candidates for random search (and random-candidate halving)
+        base_params: Fixed ``EconomicDistiller`` arguments
+        metric: Selection column, defaults to ``'<first eval set>_auc'``
+        eta: Halving rate: keep 1/eta of the candidates per rung
+        min_resources: Training rows in the first halving rung. Defaults to
+            ``max(10 * p, n // eta ** (rungs - 1))`` with enough rungs to
+            bring the candidates down to one; the rungs are then cut to
+            those the data can grow into by factors of eta. With
+            ``n < eta * 10 * p`` (e.g. the German credit sweep, n=560 and p=22
+            after encoding) no second rung fits, every candidate is fitted on all
+            rows and halving costs as much as grid search; a warning is
+            issued whenever rungs are cut, and ``SweepResult.resources``
+            records the rungs actually used. Pass a smaller value or fewer
+            candidates (``n_iter``) in that case
+        warm_start: Warm-start fits from neighbouring / previous-rung trials
+        n_jobs: Worker processes (joblib convention)
+        random_state: Seed for random candidates and the halving row order
+        temp_folder: Directory for the shared training matrix
+
+    Returns:
+        SweepResult
+
+    Example:
+        >>> result = sweep_distiller(
+        ...     X_fit, y_fit, teacher_fit_probs, {'val': (X_val, y_val)},
+        ...     space={'temperature': [1, 2, 4], 'alpha': [0.3, 0.5, 0.7]},
+        ...     constraints=economic_constraints,
+        ... )
+        >>> result.pareto_front()
+    """
+    if search not in SEARCH_METHODS:
+        raise ValueError(f"search must be one of {SEARCH_METHODS}, got {search!r}")
+    space = dict(space or DEFAULT_SPACE)
+    base_params = dict(base_params or {})
+    for key in space:
+        base_params.pop(key, None)
+
+    feature_names = [str(c) for c in X.columns] if hasattr(X, 'columns') else \
+        [f'x{j}' for j in range(np.shape(X)[1])]
+    X = np.ascontiguousarray(as_design_matrix(X))
+    y = np.asarray(y, dtype=np.float64)
+    teacher_probs = np.asarray(teacher_probs, dtype=np.float64)
+    eval_arrays = {name: (np.ascontiguousarray(as_design_matrix(Xe)), np.asarray(ye))
+                   for name, (Xe, ye) in eval_sets.items()}
+    metric = metric or f'{next(iter(eval_arrays))}_auc'
+
+    candidates = _candidates(space, search, n_iter, random_state)
+    n = len(X)
+    n_workers = max(1, effective_n_jobs(n_jobs))
+
+    if search == 'halving':
+        n_rungs = math.ceil(math.log(len(candidates), eta)) + 1 if len(candidates) > 1 else 1
+        smallest = min(n, min_resources or max(10 * X.shape[1], n // eta ** (n_rungs - 1)))
+        # Fewer rungs when the data cannot grow by eta that many times
+        planned = n_rungs
+        n_rungs = min(n_rungs, 1 + int(math.floor(math.log(n / smallest, eta) + 1e-9)))
+        if n_rungs < planned:
+            final = math.ceil(len(candidates) / eta ** (n_rungs - 1))
+            warnings.warn(
+                f'Successive halving over {len(candidates)} candidates needs {planned} '
+                f'rungs but {n} rows starting at {smallest} allow only {n_rungs}; '
+                f'{final} candidates will be fitted on all rows. Lower min_resources '
+                f'or the number of candidates', UserWarning, stacklevel=2)
+        resources = [int(smallest * eta ** r) for r in range(n_rungs)]
+        resources[-1] = n
+        order = np.random.default_rng(random_state).permutation(n)
+    else:
+        resources = [n]
+        order = np.arange(n)
+
+    records: List[Dict[str, Any]] = []
+    survivors = list(range(len(candidates)))
+    inits: Dict[int, Tuple[np.ndarray, float]] = {}
+
+    with shared_readonly_array(X, temp_folder) as X_path:
+        for rung, n_rows in enumerate(resources):
+            # Nested row subsets, so a candidate's previous rung is a good start
+            rows = np.sort(order[:n_rows])
+            trials = [{'id': i, 'params': candidates[i], 'init': inits.get(i)}
+                      for i in survivors]
+            chunks = [list(chunk) for chunk in np.array_split(np.array(trials, dtype=object),
+                                                              min(n_workers, len(trials)))]
+            outputs = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_chunk)(X_path, y, teacher_probs, feature_names, constraints,
+                                    eval_arrays, base_params, chunk, rows, warm_start)
+                for chunk in chunks if chunk
+            )
+
+            rung_records = []
+            for chunk_records in outputs:
+                for record, solution in chunk_records:
+                    record.update({'rung': rung, 'n_rows': n_rows})
+                    inits[record['trial']] = solution
+                    rung_records.append(record)
+            records.extend(rung_records)
+
+            if rung < len(resources) - 1:
+                ranked = sorted(rung_records, key=lambda r: r[metric], reverse=True)
+                keep = max(1, math.ceil(len(ranked) / eta))
+                survivors = sorted(r['trial'] for r in ranked[:keep])
+
+    columns = list(space) + ['trial', 'rung', 'n_rows']
+    table = pd.DataFrame(records)
+    table = table[columns + [c for c in table.columns if c not in columns]]
+    table = table.sort_values(['rung', 'trial']).reset_index(drop=True)
+    return SweepResult(table=table, params=list(space), metric=metric, search=search,
+                       resources=resources)
+
+
+def sweep_case_study(case_study, config=None,
+                     space: Optional[Mapping[str, Any]] = None,
+                     validation_size: float = 0.2,
+                     verbose: bool = False, **kwargs) -> SweepResult:
+    """
+    Sweep a case study's Economic KD student in one warm process.
+
+    The case study's data is prepared once, the teacher soft targets come
+    from the ``SoftTargetStore``, and a stratified validation split is held
+    out of the training set for selection; the test split is reported as
+    ``test_auc`` / ``test_f1`` but never used to rank trials.
+
+    Args:
+        case_study: Case study module (e.g. ``econkd.case_studies.german_credit``)
+        config: ExperimentConfig; defaults to the case study's default
+        space: Parameter space (defaults to ``DEFAULT_SPACE``)
+        validation_size: Fraction of the training split used for selection
+        verbose: Print the case study's data preparation log
+        **kwargs: Passed on to ``sweep_distiller``
+
+    Returns:
+        SweepResult
+    """
+    from .experiment import teacher_soft_targets
+
+    config = config or case_study.default_config()
+    data = case_study.prepare(config, verbose=verbose)
+    teacher_probs = teacher_soft_targets(config, data, keep_teacher=False)['train']
+
+    positions = np.arange(len(data.y_train))
+    fit_idx, val_idx = train_test_split(
+        positions, test_size=validation_size, random_state=config.random_state,
+        stratify=data.y_train,
+    )
+    X, y = data.X_train_scaled, data.y_train.to_numpy()
+
+    kwargs.setdefault('n_jobs', config.n_jobs)
+    kwargs.setdefault('random_state', config.random_state)
+    return sweep_distiller(
+        X.iloc[fit_idx], y[fit_idx], teacher_probs[fit_idx],
+        eval_sets={'val': (X.iloc[val_idx], y[val_idx]),
+                   'test': (data.X_test_scaled, data.y_test.to_numpy())},
+        space=space,
+        constraints=data.constraints,
+        base_params=config.student,
+        **kwargs,
+    )
@@ -0,0 +1,538 @@
+"""
+Synthetic Economic Data
+=======================
+
+Credit- and labor-style datasets of any size with a known data-generating
+process, for load-testing the bootstrap, distillation and break-detection
+paths and for checking that they recover the planted coefficients.
+
+Each kind mirrors the columns of its case study (``'credit'`` →
+``german_credit``, ``'labor'`` → ``adult_income``), so the case study's
+``build_preprocessor`` and ``default_constraints`` apply unchanged:
+
+- numeric columns are monotone transforms (lognormal, ordinal, zero-inflated
+  lognormal) of correlated latent Gaussians, so their marginal moments are
+  known in closed form
+- ``P(y=1) = expit(intercept + Σ β_j (x_j - μ_j) / σ_j + Σ effect[level])``
+  with ``μ_j, σ_j`` the population moments; ``β`` is on the standardized
+  scale the students are fitted on, with the signs the case-study
+  constraints expect (``education-num`` is monotone increasing)
+- categorical columns with configurable cardinalities, Zipf-like level
+  frequencies and centered level effects
+- ``n_extra`` Gaussian columns ``x0, x1, ...`` with small known
+  coefficients, to scale the feature count
+- structural breaks: from a given fraction of the rows (which are in time
+  order, ``period`` = 0 .. ``n_periods - 1``) some coefficients change
+
+Rows are generated in chunks of ``chunk_size`` from per-chunk seeds, so peak
+memory is one chunk and the output depends only on the spec.
+``write_synthetic`` streams the chunks into the local dataset cache
+(``econkd.datasets`` layout: one ``.npy`` per column plus ``schema.json``,
+with ``period.npy`` and ``truth.json`` alongside), or into chunked Parquet
+files. A cached synthetic dataset loads like an OpenML one:
+
+    >>> spec = SyntheticSpec('credit', n_rows=10_000_000, breaks=[(0.5, {'duration': 0.0})])
+    >>> name = write_synthetic(spec)                       # 'synthetic-credit-1e7'
+    >>> config = german_credit.default_config().replace(dataset=name, dataset_version=1)
+    >>> result = german_credit.run(config)
+    >>> coefficient_recovery(result.models['economic_student'],
+    ...                      result.models['preprocessor'], spec.truth())
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.special import expit
+from scipy.stats import norm
+
+from .datasets import CURRENT_FILE, DEFAULT_CACHE_DIR, SCHEMA_FILE, TARGET_COLUMN
+
+KINDS = ('credit', 'labor')
+TRUTH_FILE = 'truth.json'
+PERIOD_FILE = 'period.npy'
+DEFAULT_CHUNK_SIZE = 1_000_000
+ORDINAL_SPAN = 2.0          # latent cutpoints spread over [-2, 2]
+
+# Numeric columns: (name, distribution, parameters, standardized coefficient)
+NUMERIC_TEMPLATES = {
+    'credit': [
+        ('duration', 'lognormal', {'mu': np.log(18.0), 'sigma': 0.5}, 0.35),
+        ('credit_amount', 'lognormal', {'mu': 7.8, 'sigma': 0.75}, 0.25),
+        ('installment_commitment', 'ordinal', {'low': 1, 'high': 4}, 0.15),
+        ('residence_since', 'ordinal', {'low': 1, 'high': 4}, 0.0),
+        ('age', 'lognormal', {'mu': np.log(35.0), 'sigma': 0.3}, -0.25),
+        ('existing_credits', 'ordinal', {'low': 1, 'high': 3}, 0.05),
+        ('num_dependents', 'ordinal', {'low': 1, 'high': 2}, 0.0),
+    ],
+    'labor': [
+        ('age', 'lognormal', {'mu': np.log(38.0), 'sigma': 0.3}, 0.45),
+        ('fnlwgt', 'lognormal', {'mu': 12.0, 'sigma': 0.5}, 0.0),
+        ('education-num', 'ordinal', {'low': 1, 'high': 16}, 0.8),
+        ('capital-gain', 'zero_inflated', {'share': 0.08, 'mu': 8.5, 'sigma': 1.0}, 0.3),
+        ('capital-loss', 'zero_inflated', {'share': 0.05, 'mu': 7.5, 'sigma': 0.3}, 0.05),
+        ('hours-per-week', 'lognormal', {'mu': np.log(40.0), 'sigma': 0.3}, 0.4),
+    ],
+}
+# Latent correlations between numeric columns
+CORRELATIONS = {
+    'credit': {('duration', 'credit_amount'): 0.6, ('age', 'residence_since'): 0.3},
+    'labor': {('age', 'education-num'): 0.1, ('education-num', 'hours-per-week'): 0.2,
+              ('education-num', 'capital-gain'): 0.2},
+}
+CARDINALITIES = {
+    'credit': {'checking_status': 4, 'credit_history': 5, 'purpose': 10,
+               'savings_status': 5, 'employment': 5, 'housing': 3},
+    'labor': {'workclass': 8, 'marital-status': 7, 'occupation': 14,
+              'relationship': 6, 'race': 5, 'sex': 2, 'native-country': 40},
+}
+# (positive label, negative label, base rate of the positive class)
+TARGETS = {'credit': ('bad', 'good', 0.3), 'labor': ('>50K', '<=50K', 0.24)}
+
+
+# ----------------------------------------------------------------------
+# Marginal distributions
+# ----------------------------------------------------------------------
+
+def _ordinal_probabilities(low: int, high: int) -> np.ndarray:
+    cuts = np.linspace(-ORDINAL_SPAN, ORDINAL_SPAN, high - low)
+    return np.diff(np.concatenate([[0.0], norm.cdf(cuts), [1.0]]))
+
+
+def _moments(dist: str, params: Mapping[str, Any]) -> Tuple[float, float]:
+    """Population mean and standard deviation of a column."""
+    if dist == 'normal':
+        return params['loc'], params['scale']
+    if dist == 'lognormal':
+        mu, s2 = params['mu'], params['sigma'] ** 2
+        return float(np.exp(mu + s2 / 2)), float(np.sqrt((np.exp(s2) - 1) * np.exp(2 * mu + s2)))
+    if dist == 'ordinal':
+        levels = np.arange(params['low'], params['high'] + 1)
+        p = _ordinal_probabilities(params['low'], params['high'])
+        mean = float(p @ levels)
+        return mean, float(np.sqrt(p @ levels**2 - mean**2))
+    if dist == 'zero_inflated':
+        q, mu, s2 = params['share'], params['mu'], params['sigma'] ** 2
+        m1, m2 = q * np.exp(mu + s2 / 2), q * np.exp(2 * mu + 2 * s2)
+        return float(m1), float(np.sqrt(m2 - m1**2))
+    raise ValueError(f'Unknown distribution {dist!r}')
+
+
+def _transform(dist: str, params: Mapping[str, Any], z: np.ndarray,
+               rng: np.random.Generator) -> np.ndarray:
+    """Column values from its latent standard normal ``z``."""
+    if dist == 'normal':
+        return params['loc'] + params['scale'] * z
+    if dist == 'lognormal':
+        return np.exp(params['mu'] + params['sigma'] * z)
+    if dist == 'ordinal':
+        cuts = np.linspace(-ORDINAL_SPAN, ORDINAL_SPAN, params['high'] - params['low'])
+        return (params['low'] + np.searchsorted(cuts, z)).astype(np.float64)
+    if dist == 'zero_inflated':
+        positive = z > norm.ppf(1.0 - params['share'])
+        values = np.zeros(len(z))
+        values[positive] = np.exp(params['mu'] + params['sigma']
+                                  * rng.standard_normal(int(positive.sum())))
+        return values
+    raise ValueError(f'Unknown distribution {dist!r}')
+
+
+# ----------------------------------------------------------------------
+# Specification and ground truth
+# ----------------------------------------------------------------------
+
+@dataclass
+class SyntheticTruth:
+    """
+    The planted data-generating process.
+
+    Attributes:
+        kind: 'credit' or 'labor'
+        coef: Standardized coefficient per numeric column (first regime)
+        intercept: Intercept (first regime)
+        moments: Population (mean, std) per numeric column
+        level_effects: Log-odds effect per level of each categorical column
+        level_probabilities: Frequency of each level
+        regimes: ``{'start_row', 'start_period', 'coef', 'intercept'}`` per
+            regime, the first starting at row 0
+        positive_label: Target value of class 1
+    """
+
+    kind: str
+    coef: Dict[str, float]
+    intercept: float
+    moments: Dict[str, Tuple[float, float]]
+    level_effects: Dict[str, List[float]]
+    level_probabilities: Dict[str, List[float]]
+    regimes: List[Dict[str, Any]] = field(default_factory=list)
+    positive_label: str = ''
+
+    def coef_at(self, period: int) -> Dict[str, float]:
+        """Coefficients in force in ``period``."""
+        active = [r for r in self.regimes if r['start_period'] <= period]
+        return active[-1]['coef'] if active else self.coef
+
+    def save(self, path: Union[str, Path]) -> None:
+        with open(path, 'w') as f:
+            json.dump(asdict(self), f, indent=2)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'SyntheticTruth':
+        with open(path) as f:
+            values = json.load(f)
+        values['moments'] = {k: tuple(v) for k, v in values['moments'].items()}
+        return cls(**values)
+
+
+@dataclass
+class SyntheticSpec:
+    """
+    Size and structure of a synthetic dataset.
+
+    Args:
+        kind: 'credit' (German Credit columns) or 'labor' (Adult columns)
+        n_rows: Number of rows
+        n_extra: Additional Gaussian columns ``x0, x1, ...`` with small
+            known coefficients
+        cardinalities: Levels per categorical column; merged over the
+            kind's defaults (0 drops a column, new names add columns)
+        breaks: ``(fraction, {column: coefficient})`` pairs; from that
+            fraction of the rows on, the listed standardized coefficients
+            (or ``'intercept'``) take the new values
+        n_periods: Number of time periods the rows are spread over
+        categorical_effect: Std of the categorical level effects
+        chunk_size: Rows generated at a time
+        random_state: Seed; chunk ``i`` uses ``SeedSequence(random_state,
+            spawn_key=(i,))``, so the data depends on ``chunk_size``
+    """
+
+    kind: str
+    n_rows: int
+    n_extra: int = 0
+    cardinalities: Optional[Dict[str, int]] = None
+    breaks: Sequence[Tuple[float, Dict[str, float]]] = ()
+    n_periods: int = 120
+    categorical_effect: float = 0.3
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    random_state: int = 0
+
+    def __post_init__(self):
+        if self.kind not in KINDS:
+            raise ValueError(f'kind must be one of {KINDS}, got {self.kind!r}')
+        if self.n_rows < 1 or self.chunk_size < 1:
+            raise ValueError('n_rows and chunk_size must be positive')
+        self.n_rows = int(self.n_rows)
+        self.breaks = sorted((float(at), dict(changes)) for at, changes in self.breaks)
+        numeric = self.numeric_columns + ['intercept']
+        for at, changes in self.breaks:
+            if not 0.0 < at < 1.0:
+                raise ValueError(f'Break fractions must be in (0, 1), got {at}')
+            unknown = set(changes) - set(numeric)
+            if unknown:
+                raise ValueError(f'Breaks on unknown columns {sorted(unknown)}')
+
+    @property
+    def name(self) -> str:
+        """Default cache name, e.g. 'synthetic-credit-1e7'."""
+        exponent = int(round(np.log10(self.n_rows)))
+        size = f'1e{exponent}' if 10**exponent == self.n_rows else str(self.n_rows)
+        return f'synthetic-{self.kind}-{size}'
+
+    @property
+    def numeric_columns(self) -> List[str]:
+        return ([name for name, *_ in NUMERIC_TEMPLATES[self.kind]]
+                + [f'x{j}' for j in range(self.n_extra)])
+
+    @property
+    def categorical_columns(self) -> Dict[str, int]:
+        levels = {**CARDINALITIES[self.kind], **(self.cardinalities or {})}
+        return {name: int(k) for name, k in levels.items() if k > 0}
+
+    @property
+    def columns(self) -> List[str]:
+        return self.numeric_columns + list(self.categorical_columns)
+
+    def _rng(self, *key: int) -> np.random.Generator:
+        return np.random.default_rng(np.random.SeedSequence(self.random_state, spawn_key=key))
+
+    def truth(self) -> SyntheticTruth:
+        """The planted coefficients, moments and level effects."""
+        rng = self._rng(2**31 - 1)   # separate stream from the row chunks
+        coef, moments = {}, {}
+        for name, dist, params, beta in NUMERIC_TEMPLATES[self.kind]:
+            coef[name] = float(beta)
+            moments[name] = _moments(dist, params)
+        extra = rng.normal(0.0, 0.1, self.n_extra)
+        for j in range(self.n_extra):
+            coef[f'x{j}'] = float(extra[j])
+            moments[f'x{j}'] = (0.0, 1.0)
+
+        level_effects, level_probabilities = {}, {}
+        for name, k in self.categorical_columns.items():
+            p = 1.0 / np.arange(1, k + 1)
+            effects = rng.normal(0.0, self.categorical_effect, k)
+            level_probabilities[name] = (p / p.sum()).tolist()
+            level_effects[name] = (effects - effects.mean()).tolist()
+
+        positive, _, base_rate = TARGETS[self.kind]
+        intercept = float(np.log(base_rate / (1 - base_rate)))
+        regimes = [{'start_row': 0, 'start_period': 0, 'coef': coef, 'intercept': intercept}]
+        for at, changes in self.breaks:
+            start = int(at * self.n_rows)
+            previous = regimes[-1]
+            regimes.append({
+                'start_row': start,
+                'start_period': start * self.n_periods // self.n_rows,
+                'coef': {**previous['coef'],
+                         **{k: float(v) for k, v in changes.items() if k != 'intercept'}},
+                'intercept': float(changes.get('intercept', previous['intercept'])),
+            })
+        return SyntheticTruth(kind=self.kind, coef=coef, intercept=intercept, moments=moments,
+                              level_effects=level_effects,
+                              level_probabilities=level_probabilities,
+                              regimes=regimes, positive_label=positive)
+
+    def latent_correlation(self) -> np.ndarray:
+        names = [name for name, *_ in NUMERIC_TEMPLATES[self.kind]]
+        corr = np.eye(len(names))
+        for (a, b), rho in CORRELATIONS[self.kind].items():
+            i, j = names.index(a), names.index(b)
+            corr[i, j] = corr[j, i] = rho
+        return corr
+
+
+# ----------------------------------------------------------------------
+# Generation
+# ----------------------------------------------------------------------
+
+def iter_synthetic_chunks(spec: SyntheticSpec, truth: Optional[SyntheticTruth] = None
+                          ) -> Iterator[Tuple[pd.DataFrame, np.ndarray, np.ndarray]]:
+    """
+    Yield ``(X, y, period)`` chunks of at most ``spec.chunk_size`` rows.
+
+    ``X`` has float64 numeric columns and pandas categoricals, ``y`` is the
+    0/1 target and ``period`` the int32 time period of each row. For
+    ``fit_stream``, wrap it so every epoch gets a fresh pass:
+    ``lambda: ((X, y) for X, y, _ in iter_synthetic_chunks(spec))``.
+    """
+    truth = truth or spec.truth()
+    templates = NUMERIC_TEMPLATES[spec.kind]
+    chol = np.linalg.cholesky(spec.latent_correlation())
+    categories = {name: pd.CategoricalDtype([f'{name}_{i}' for i in range(k)])
+                  for name, k in spec.categorical_columns.items()}
+    starts = [r['start_row'] for r in truth.regimes]
+
+    for index, start in enumerate(range(0, spec.n_rows, spec.chunk_size)):
+        n = min(spec.chunk_size, spec.n_rows - start)
+        rng = spec._rng(index)
+        rows = np.arange(start, start + n)
+        regime = np.searchsorted(starts, rows, side='right') - 1
+
+        latent = rng.standard_normal((n, len(templates))) @ chol.T
+        columns: Dict[str, Any] = {}
+        logit = np.array([r['intercept'] for r in truth.regimes])[regime]
+        for j, (name, dist, params, _) in enumerate(templates):
+            columns[name] = _transform(dist, params, latent[:, j], rng)
+        for j in range(spec.n_extra):
+            columns[f'x{j}'] = rng.standard_normal(n)
+        for name in spec.numeric_columns:
+            mean, sd = truth.moments[name]
+            beta = np.array([r['coef'][name] for r in truth.regimes])
+            if np.any(beta):
+                logit += beta[regime] * ((columns[name] - mean) / sd)
+
+        for name, dtype in categories.items():
+            p = np.asarray(truth.level_probabilities[name])
+            codes = np.searchsorted(np.cumsum(p), rng.random(n) * p.sum(), side='right')
+            codes = np.minimum(codes, len(p) - 1)
+            logit += np.asarray(truth.level_effects[name])[codes]
+            columns[name] = pd.Categorical.from_codes(codes, dtype=dtype)
+
+        y = (rng.random(n) < expit(logit)).astype(np.int8)
+        period = (rows * spec.n_periods // spec.n_rows).astype(np.int32)
+        yield pd.DataFrame(columns, index=pd.RangeIndex(start, start + n)), y, period
+
+
+def generate_frame(spec: SyntheticSpec) -> Tuple[pd.DataFrame, pd.Series, np.ndarray]:
+    """The whole dataset in memory: ``(X, y labels, period)``."""
+    positive, negative, _ = TARGETS[spec.kind]
+    chunks = list(iter_synthetic_chunks(spec))
+    X = pd.concat([X for X, _, _ in chunks])
+    y = np.concatenate([y for _, y, _ in chunks])
+    labels = pd.Series(np.where(y == 1, positive, negative), index=X.index, dtype='category')
+    return X, labels, np.concatenate([p for _, _, p in chunks])
+
+
+# ----------------------------------------------------------------------
+# Writing
+# ----------------------------------------------------------------------
+
+def _column_specs(spec: SyntheticSpec) -> List[Dict[str, Any]]:
+    """Schema entries in the ``econkd.datasets`` format (target last)."""
+    specs = [{'name': name, 'kind': 'numeric', 'dtype': 'float64'}
+             for name in spec.numeric_columns]
+    for name, k in spec.categorical_columns.items():
+        specs.append({'name': name, 'kind': 'categorical',
+                      'dtype': 'int8' if k < 128 else 'int16',
+                      'categories': [f'{name}_{i}' for i in range(k)], 'ordered': False})
+    positive, negative, _ = TARGETS[spec.kind]
+    specs.append({'name': TARGET_COLUMN, 'kind': 'categorical', 'dtype': 'int8',
+                  'categories': sorted([positive, negative]), 'ordered': False})
+    return specs
+
+
+def _write_npy(spec: SyntheticSpec, truth: SyntheticTruth, name: str, version: int,
+               cache_dir: Union[str, Path, None]) -> Path:
+    specs = _column_specs(spec)
+    root = Path(cache_dir or DEFAULT_CACHE_DIR) / f'{name}-v{version}'
+    root.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=root, prefix='.staging-'))
+    try:
+        files = [np.lib.format.open_memmap(staging / f'col_{i:04d}.npy', mode='w+',
+                                           dtype=s['dtype'], shape=(spec.n_rows,))
+                 for i, s in enumerate(specs)]
+        periods = np.lib.format.open_memmap(staging / PERIOD_FILE, mode='w+',
+                                            dtype=np.int32, shape=(spec.n_rows,))
+        target_codes = {label: code for code, label in enumerate(specs[-1]['categories'])}
+        positive_code = target_codes[truth.positive_label]
+
+        for X, y, period in iter_synthetic_chunks(spec, truth):
+            rows = slice(X.index[0], X.index[-1] + 1)
+            for values, s in zip(files[:-1], specs[:-1]):
+                column = X[s['name']]
+                values[rows] = column.cat.codes if s['kind'] == 'categorical' else column
+            files[-1][rows] = np.where(y == 1, positive_code, 1 - positive_code)
+            periods[rows] = period
+
+        # Same digest as ``store_frame``: schema, then each column's bytes
+        hasher = hashlib.sha256(json.dumps(specs, sort_keys=True).encode())
+        for values in files:
+            values.flush()
+            for start in range(0, spec.n_rows, spec.chunk_size):
+                hasher.update(values[start:start + spec.chunk_size].tobytes())
+        periods.flush()
+        del files, periods
+        digest = hasher.hexdigest()
+
+        with open(staging / SCHEMA_FILE, 'w') as f:
+            json.dump({'name': name, 'version': version, 'digest': digest,
+                       'n_rows': spec.n_rows, 'columns': specs}, f, indent=2)
+        truth.save(staging / TRUTH_FILE)
+        os.chmod(staging, 0o755)
+        target = root / digest
+        if target.exists():
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    with open(root / CURRENT_FILE, 'w') as f:
+        f.write(digest)
+    return target
+
+
+def _write_parquet(spec: SyntheticSpec, truth: SyntheticTruth, directory: Path) -> Path:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet output requires pyarrow: pip install pyarrow") from e
+
+    positive, negative, _ = TARGETS[spec.kind]
+    target_dtype = pd.CategoricalDtype(sorted([positive, negative]))
+    directory.mkdir(parents=True, exist_ok=True)
+    for index, (X, y, period) in enumerate(iter_synthetic_chunks(spec, truth)):
+        frame = X.assign(**{
+            TARGET_COLUMN: pd.Categorical(np.where(y == 1, positive, negative), dtype=target_dtype),
+            'period': period,
+        })
+        pq.write_table(pa.Table.from_pandas(frame, preserve_index=False),
+                       directory / f'part-{index:05d}.parquet')
+    truth.save(directory / TRUTH_FILE)
+    return directory
+
+
+def write_synthetic(spec: SyntheticSpec, name: Optional[str] = None, version: int = 1,
+                    cache_dir: Union[str, Path, None] = None, format: str = 'npy',
+                    directory: Union[str, Path, None] = None) -> str:
+    """
+    Stream a synthetic dataset to disk, one chunk in memory at a time.
+
+    Args:
+        spec: What to generate
+        name: Dataset name (defaults to ``spec.name``)
+        version: Dataset version in the cache
+        cache_dir: Cache root for ``format='npy'`` (defaults to
+            ``experiments/data``); the result loads with
+            ``load_openml_dataset(name, version, offline=True)``
+        format: 'npy' (dataset cache) or 'parquet' (``part-NNNNN.parquet``
+            files with the target as ``'__target__'`` and a ``'period'``
+            column, readable with ``iter_parquet_chunks``; needs pyarrow)
+        directory: Output directory for ``format='parquet'``
+
+    Returns:
+        The dataset name
+    """
+    name = name or spec.name
+    truth = spec.truth()
+    if format == 'npy':
+        _write_npy(spec, truth, name, version, cache_dir)
+    elif format == 'parquet':
+        if directory is None:
+            raise ValueError("format='parquet' needs an output directory")
+        _write_parquet(spec, truth, Path(directory))
+    else:
+        raise ValueError(f"format must be 'npy' or 'parquet', got {format!r}")
+    return name
+
+
+def load_synthetic_extras(path: Union[str, Path]) -> Tuple[SyntheticTruth, np.ndarray]:
+    """Ground truth and memory-mapped periods next to a cached dataset (``CachedDataset.path``)."""
+    path = Path(path)
+    return SyntheticTruth.load(path / TRUTH_FILE), np.load(path / PERIOD_FILE, mmap_mode='r')
+
+
+# ----------------------------------------------------------------------
+# Recovery
+# ----------------------------------------------------------------------
+
+def coefficient_recovery(model, preprocessor, truth: SyntheticTruth,
+                         period: Optional[int] = None) -> pd.DataFrame:
+    """
+    Planted vs estimated standardized coefficients of the numeric columns.
+
+    The estimate is mapped onto the truth's scale (population moments):
+    ``β̂_j = coef_j · σ_j / scale_j`` for columns the preprocessor scaled
+    (``scale_j = 1`` otherwise).
+
+    Args:
+        model: Fitted linear student (``coef_`` over the preprocessor's
+            output columns)
+        preprocessor: The fitted ``FeaturePipeline``
+        truth: ``SyntheticSpec.truth()`` or ``SyntheticTruth.load``
+        period: Compare against the coefficients in force in this period
+            (default: the first regime)
+
+    Returns:
+        DataFrame with feature, true, estimated, error and sign_match
+    """
+    coef = np.asarray(model.coef_).ravel()
+    names = list(preprocessor.feature_names_out_)
+    scale = dict(zip(preprocessor.scaled_columns_, preprocessor.scale_))
+    planted = truth.coef if period is None else truth.coef_at(period)
+    rows = []
+    for feature, beta in planted.items():
+        if feature not in names:
+            continue
+        estimate = coef[names.index(feature)] * truth.moments[feature][1] / scale.get(feature, 1.0)
+        rows.append({'feature': feature, 'true': beta, 'estimated': estimate,
+                     'error': estimate - beta,
+                     'sign_match': bool(np.sign(estimate) == np.sign(beta)) if beta else None})
+    return pd.DataFrame(rows)
@@ -0,0 +1,295 @@
+"""
+Teacher Inference
+=================
+
+Fast, exact soft-target generation for the tree-ensemble teachers
+(``GradientBoostingClassifier``, ``RandomForestClassifier``,
+``ExtraTreesClassifier``, ``DecisionTreeClassifier``; binary targets).
+
+``compile_teacher`` reads the fitted trees once into a ``CompiledEnsemble``:
+
+- flattened node arrays for all trees, renumbered breadth-first so the right
+  child of node ``i`` is always ``left[i] + 1`` and leaves point to
+  themselves; one traversal step for every (row, tree) pair is then
+  ``node = left[node] + (x[feature[node]] > threshold[node])``
+- thresholds rounded down to float32, so comparing float32 inputs gives
+  exactly the splits sklearn makes (it casts ``X`` to float32 as well)
+- per-leaf values with the GBM learning rate (or the forest's ``1 / T``)
+  folded in, plus the constant GBM baseline
+
+Two evaluation paths give the same probabilities (up to float64 summation
+order):
+
+- ``'vectorized'``: all trees advance together, one NumPy step per tree
+  level, over a (rows x trees) block of node indices. Its cost does not
+  depend on the number of Python-level calls, which makes it much faster
+  than ``predict_proba`` on small batches (streaming chunks, counterfactual
+  grids, shadow scoring), where sklearn's per-tree overhead dominates
+- ``'native'``: sklearn's compiled ``Tree.apply`` per tree on float32
+  row chunks, followed by a leaf-value gather. ``Tree.apply`` releases the
+  GIL, so chunks run in parallel threads (``n_jobs``); GBM's own
+  ``predict_proba`` walks its trees with the GIL held and uses one core
+
+``backend='auto'`` picks ``'vectorized'`` for batches up to
+``SMALL_BATCH`` rows and ``'native'`` above, except for a GBM scored on one
+thread: there the per-tree ``Tree.apply`` calls and leaf gathers cost more
+than GBM's own single pass over its trees (0.68 s vs 0.45 s for 200k rows
+and 100 depth-5 trees), so the compiled ensemble hands large batches to the
+estimator's ``decision_function``. Inputs with NaNs are rejected: the
+compiled arrays do not route missing values.
+
+Example:
+    >>> teacher = compile_teacher(models['teacher'])
+    >>> probs = teacher.predict_proba(X_augmented, n_jobs=-1)[:, 1]
+    >>> teacher_probabilities(models['teacher'], X_train_scaled)   # (n,)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+import numpy as np
+from joblib import effective_n_jobs
+from scipy.special import expit, logit
+from sklearn.dummy import DummyClassifier
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.tree import DecisionTreeClassifier
+
+from .preprocessing import as_design_matrix
+
+BACKENDS = ('auto', 'vectorized', 'native')
+SMALL_BATCH = 256
+BLOCK_SIZE = 1 << 16        # (rows x trees) node indices per vectorized block
+NATIVE_CHUNK_SIZE = 16384   # rows per Tree.apply call
+
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """Largest float32 <= each value, so ``x32 <= t`` iff ``x32 <= floor(t)``."""
+    rounded = values.astype(np.float32)
+    over = rounded.astype(np.float64) > values
+    rounded[over] = np.nextafter(rounded[over], np.float32(-np.inf))
+    return rounded
+
+
+def _breadth_first(tree) -> np.ndarray:
+    """Node ids in an order where every pair of children is adjacent."""
+    left, right = tree.children_left, tree.children_right
+    levels = [np.zeros(1, dtype=np.intp)]
+    while len(levels[-1]):
+        parents = levels[-1][left[levels[-1]] != -1]
+        levels.append(np.column_stack([left[parents], right[parents]]).ravel())
+    return np.concatenate(levels)
+
+
+def _gbm_baseline(teacher: GradientBoostingClassifier) -> float:
+    if teacher.init_ == 'zero':
+        return 0.0
+    if isinstance(teacher.init_, DummyClassifier) and teacher.init_.strategy == 'prior':
+        prior = np.clip(teacher.init_.class_prior_[1], np.finfo(np.float64).eps,
+                        1 - np.finfo(np.float64).eps)
+        return float(logit(prior))
+    raise ValueError('Only the default (prior) or zero GBM init can be compiled')
+
+
+@dataclass
+class CompiledEnsemble:
+    """
+    Flattened tree ensemble with a logistic or averaging output.
+
+    Attributes:
+        feature: Split feature per node (0 at leaves)
+        threshold: float32 split threshold per node (+inf at leaves)
+        left: Left child per node in the flat arrays (the node itself at leaves)
+        value: Output contribution per node (nonzero only at leaves)
+        roots: Flat index of each tree's root
+        depth: Maximum tree depth (traversal steps)
+        n_features: Expected number of input columns
+        baseline: Constant added to the summed leaf values
+        link: 'logit' (GBM: P = expit(raw)) or 'identity' (forests: P = raw)
+        trees: The sklearn ``Tree`` objects, for the native path
+        leaf_values: Per-tree leaf contributions in sklearn node order
+        estimator: The compiled estimator, for single-threaded GBM batches
+    """
+
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    value: np.ndarray
+    roots: np.ndarray
+    depth: int
+    n_features: int
+    baseline: float
+    link: str
+    trees: List[Any] = field(repr=False)
+    leaf_values: List[np.ndarray] = field(repr=False)
+    classes_: np.ndarray = field(default_factory=lambda: np.array([0, 1]))
+    estimator: Any = field(default=None, repr=False)
+
+    @classmethod
+    def from_estimator(cls, teacher) -> 'CompiledEnsemble':
+        """Compile a fitted binary tree-ensemble classifier."""
+        if len(getattr(teacher, 'classes_', ())) != 2:
+            raise ValueError('Only fitted binary classifiers can be compiled')
+
+        if isinstance(teacher, GradientBoostingClassifier):
+            if teacher.loss != 'log_loss':
+                raise ValueError(f"Only loss='log_loss' can be compiled, got {teacher.loss!r}")
+            trees = [estimator.tree_ for estimator in teacher.estimators_[:, 0]]
+            leaf_values = [tree.value[:, 0, 0] * teacher.learning_rate for tree in trees]
+            baseline, link = _gbm_baseline(teacher), 'logit'
+        elif isinstance(teacher, (RandomForestClassifier, ExtraTreesClassifier,
+                                  DecisionTreeClassifier)):
+            estimators = getattr(teacher, 'estimators_', [teacher])
+            trees = [estimator.tree_ for estimator in estimators]
+            leaf_values = [tree.value[:, 0, 1] / tree.value[:, 0, :].sum(axis=1) / len(trees)
+                           for tree in trees]
+            baseline, link = 0.0, 'identity'
+        else:
+            raise ValueError(f'{type(teacher).__name__} cannot be compiled')
+
+        features, thresholds, lefts, values, roots = [], [], [], [], []
+        offset = 0
+        for tree, leaf_value in zip(trees, leaf_values):
+            order = _breadth_first(tree)
+            position = np.empty(len(order), dtype=np.intp)
+            position[order] = np.arange(len(order))
+            is_leaf = tree.children_left[order] == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature[order]))
+            thresholds.append(_float32_floor(np.where(is_leaf, np.inf, tree.threshold[order])))
+            lefts.append(offset + np.where(is_leaf, np.arange(len(order)),
+                                           position[tree.children_left[order]]))
+            values.append(np.where(is_leaf, leaf_value[order], 0.0))
+            roots.append(offset)
+            offset += len(order)
+
+        index = np.int32 if offset < np.iinfo(np.int32).max else np.intp
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(index),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=index),
+            depth=max(tree.max_depth for tree in trees),
+            n_features=trees[0].n_features,
+            baseline=baseline,
+            link=link,
+            trees=trees,
+            leaf_values=leaf_values,
+            estimator=teacher,
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    # ------------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------------
+
+    def _as_float32(self, X) -> np.ndarray:
+        # Compact frames are gathered into float32 directly, not via float64
+        X = np.ascontiguousarray(as_design_matrix(X), dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f'Expected a 2-D input with {self.n_features} columns, '
+                             f'got shape {X.shape}')
+        if np.isnan(X).any():
+            raise ValueError('Compiled ensembles do not route missing values')
+        return X
+
+    def _vectorized_block(self, X: np.ndarray) -> np.ndarray:
+        n = len(X)
+        flat = X.ravel()
+        row_start = (np.arange(n, dtype=np.intp) * self.n_features)[:, None]
+        node = np.repeat(self.roots[None, :], n, axis=0)
+        for _ in range(self.depth):
+            go_right = flat[row_start + self.feature[node]] > self.threshold[node]
+            node = self.left[node] + go_right
+        return self.value[node].sum(axis=1)
+
+    def _native_block(self, X: np.ndarray) -> np.ndarray:
+        raw = np.zeros(len(X))
+        contribution = np.empty(len(X))
+        for tree, leaf_value in zip(self.trees, self.leaf_values):
+            raw += np.take(leaf_value, tree.apply(X), out=contribution)
+        return raw
+
+    def raw_predict(self, X, backend: str = 'auto', n_jobs: Optional[int] = None) -> np.ndarray:
+        """
+        Summed leaf values plus baseline (log-odds for GBM, P(y=1) for forests).
+
+        Args:
+            X: Input matrix (n x n_features), preprocessed like the training data
+            backend: 'auto', 'vectorized' or 'native' (see module docstring)
+            n_jobs: Threads over row chunks (joblib convention, -1 = all cores)
+
+        Returns:
+            (n,) array
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f'backend must be one of {BACKENDS}, got {backend!r}')
+        if (backend == 'auto' and self.link == 'logit' and self.estimator is not None
+                and len(X) > SMALL_BATCH and effective_n_jobs(n_jobs) == 1):
+            # sklearn validates and converts the input itself
+            return self.estimator.decision_function(X)
+        X = self._as_float32(X)
+        if backend == 'auto':
+            backend = 'vectorized' if len(X) <= SMALL_BATCH else 'native'
+        if backend == 'vectorized':
+            evaluate, chunk_size = self._vectorized_block, max(1, BLOCK_SIZE // self.n_trees)
+        else:
+            evaluate, chunk_size = self._native_block, NATIVE_CHUNK_SIZE
+
+        starts = range(0, len(X), chunk_size)
+        n_jobs = min(effective_n_jobs(n_jobs), len(starts))
+        raw = np.empty(len(X))
+        if n_jobs <= 1:
+            for start in starts:
+                raw[start:start + chunk_size] = evaluate(X[start:start + chunk_size])
+        else:
+            with ThreadPoolExecutor(n_jobs) as pool:
+                blocks = pool.map(lambda start: evaluate(X[start:start + chunk_size]), starts)
+                for start, block in zip(starts, blocks):
+                    raw[start:start + len(block)] = block
+        return raw + self.baseline
+
+    def predict_proba(self, X, backend: str = 'auto', n_jobs: Optional[int] = None) -> np.ndarray:
+        raw = self.raw_predict(X, backend, n_jobs)
+        positive = expit(raw) if self.link == 'logit' else raw
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X, backend: str = 'auto', n_jobs: Optional[int] = None) -> np.ndarray:
+        return (self.predict_proba(X, backend, n_jobs)[:, 1] > 0.5).astype(int)
+
+
+def compile_teacher(teacher) -> CompiledEnsemble:
+    """Compile a fitted tree-ensemble teacher (see ``CompiledEnsemble``)."""
+    return CompiledEnsemble.from_estimator(teacher)
+
+
+def as_compiled(teacher):
+    """``teacher`` compiled when it is a supported tree ensemble, else unchanged."""
+    if isinstance(teacher, CompiledEnsemble):
+        return teacher
+    try:
+        return compile_teacher(teacher)
+    except ValueError:
+        return teacher
+
+
+def teacher_probabilities(teacher, X, backend: str = 'auto',
+                          n_jobs: Optional[int] = None) -> np.ndarray:
+    """
+    Teacher P(y=1|x), through the compiled ensemble when the teacher
+    supports it and its own ``predict_proba`` otherwise.
+
+    Compile once with ``as_compiled`` when scoring several matrices.
+    """
+    teacher = as_compiled(teacher)
+    if isinstance(teacher, CompiledEnsemble):
+        return teacher.predict_proba(X, backend, n_jobs)[:, 1]
+    return teacher.predict_proba(X)[:, 1]
@@ -19,7 +19,14 @@ print("="*80)
 print("GENERATING LATEX TABLES FOR PAPER")
 print("="*80)
 
-results_dir = Path("results")
+results_dir = Path(__file__).resolve().parent / "results"
+
+
+def percent(value):
+    """LaTeX percentage, or '---' when the value is missing (None)."""
+    return '---' if value is None else f"{value:.1f}\\%"
+
+results_dir.mkdir(parents=True, exist_ok=True)
 output_file = results_dir / "latex_tables.tex"
 
 # ============================================================================
@@ -97,7 +104,7 @@ if german_credit_results:
         f"{models['baseline']['test_auc']:.3f} & "
         f"{models['baseline']['test_f1']:.3f} & "
         f"{models['baseline']['test_acc']:.3f} & "
-        f"{models['baseline']['compliance']:.1f}\\% \\\\\n"
+        f"{percent(models['baseline']['compliance'])} \\\\\n"
     )
 
     # Standard KD
@@ -115,7 +122,7 @@ if german_credit_results:
         f"\\textbf{{{models['economic_kd']['test_auc']:.3f}}} & "
         f"\\textbf{{{models['economic_kd']['test_f1']:.3f}}} & "
         f"\\textbf{{{models['economic_kd']['test_acc']:.3f}}} & "
-        f"\\textbf{{{models['economic_kd']['compliance']:.1f}\\%}} \\\\\n"
+        f"\\textbf{{{percent(models['economic_kd']['compliance'])}}} \\\\\n"
     )
 
     # Trade-offs
@@ -174,7 +181,7 @@ if adult_income_results:
         f"Baseline (LR) & "
         f"{models['baseline']['test_auc']:.3f} & "
         f"{models['baseline']['test_f1']:.3f} & "
-        f"{baseline_comp:.1f}\\% & --- \\\\\n" if baseline_comp else
+        f"{baseline_comp:.1f}\\% & --- \\\\\n" if baseline_comp is not None else
         f"{models['baseline']['test_auc']:.3f} & "
         f"{models['baseline']['test_f1']:.3f} & "
         f"--- & --- \\\\\n"
@@ -190,7 +197,7 @@ if adult_income_results:
         f"\\textbf{{{models['economic_kd']['test_f1']:.3f}}} & "
     )
 
-    if economic_comp:
+    if economic_comp is not None:
         latex_content.append(f"\\textbf{{{economic_comp:.1f}\\%}} & ")
     else:
         latex_content.append(f"--- & ")
@@ -252,8 +259,8 @@ if german_credit_results and adult_income_results:
     gc_comp = german_credit_results['models']['economic_kd']['compliance']
     ai_comp = adult_income_results['models']['economic_kd']['compliance']
 
-    latex_content.append(f"Compliance & 95\\%+ & {gc_comp:.1f}\\% & ")
-    if ai_comp:
+    latex_content.append(f"Compliance & 95\\%+ & {percent(gc_comp)} & ")
+    if ai_comp is not None:
         latex_content.append(f"{ai_comp:.1f}\\% \\\\\n")
     else:
         latex_content.append(f"--- \\\\\n")
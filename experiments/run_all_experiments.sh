@@ -10,7 +10,7 @@
 # Target Venues: Journal of Econometrics, NeurIPS Economics Track
 #
 # Usage:
-#   ./run_all_experiments.sh
+#   ./run_all_experiments.sh [--force] [--jobs N]
 #
 # Results will be saved to experiments/results/
 ###############################################################################
@@ -32,74 +32,23 @@ echo "Experiment directory: $(pwd)"
 echo ""
 
 # ============================================================================
-# Experiment 1: German Credit (Credit Risk)
+# Experiments and LaTeX tables (parallel DAG, see run_pipeline.py)
 # ============================================================================
+#
+# German Credit and Adult Income run concurrently; the LaTeX tables are
+# generated once both have finished. Stages whose outputs are up to date are
+# skipped; pass --force to re-run everything. Per-stage logs are written to
+# logs/ and timings to logs/pipeline_timings.json.
 
-echo "------------------------------------------------------------------------"
-echo "EXPERIMENT 1: German Credit Dataset (Credit Risk)"
-echo "------------------------------------------------------------------------"
-echo "Paper Section: 5.2 - Case Study 1"
-echo "Dataset: UCI German Credit (1000 samples, 20 features)"
-echo "Expected time: 2-3 minutes"
-echo ""
-
-python3 01_german_credit_experiment.py 2>&1 | tee logs/german_credit.log
-
-if [ $? -eq 0 ]; then
-    echo "✅ German Credit experiment completed successfully"
-else
-    echo "❌ German Credit experiment failed"
-    exit 1
-fi
-
-echo ""
-
-# ============================================================================
-# Experiment 2: Adult Income (Labor Economics)
-# ============================================================================
-
-echo "------------------------------------------------------------------------"
-echo "EXPERIMENT 2: Adult Income Dataset (Labor Economics)"
-echo "------------------------------------------------------------------------"
-echo "Paper Section: 5.3 - Case Study 2"
-echo "Dataset: UCI Adult/Census Income (48k samples, 14 features)"
-echo "Expected time: 3-5 minutes"
-echo ""
-
-python3 02_adult_income_experiment.py 2>&1 | tee logs/adult_income.log
-
-if [ $? -eq 0 ]; then
-    echo "✅ Adult Income experiment completed successfully"
+if python3 run_pipeline.py "$@"; then
+    echo "✅ All pipeline stages completed successfully"
 else
-    echo "❌ Adult Income experiment failed"
+    echo "❌ Pipeline failed (check logs/)"
     exit 1
 fi
 
 echo ""
 
-# ============================================================================
-# Generate LaTeX Tables and Figures
-# ============================================================================
-
-echo "------------------------------------------------------------------------"
-echo "GENERATING LATEX TABLES AND FIGURES"
-echo "------------------------------------------------------------------------"
-echo ""
-
-if [ -f "generate_latex_tables.py" ]; then
-    python3 generate_latex_tables.py 2>&1 | tee logs/latex_generation.log
-
-    if [ $? -eq 0 ]; then
-        echo "✅ LaTeX tables generated successfully"
-    else
-        echo "⚠️  LaTeX generation had warnings (check logs)"
-    fi
-else
-    echo "⚠️  generate_latex_tables.py not found, skipping"
-fi
-
-echo ""
-
 # ============================================================================
 # Summary
 # ============================================================================
@@ -116,6 +65,8 @@ echo ""
 echo "Logs saved to:"
 echo "  - logs/german_credit.log"
 echo "  - logs/adult_income.log"
+echo "  - logs/latex_generation.log"
+echo "  - logs/pipeline_timings.json"
 echo ""
 echo "Next steps:"
 echo "  1. Review results in results/*.json"
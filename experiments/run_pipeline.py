@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Run All Experiments as a Pipeline
+=================================
+
+Parallel, incremental replacement for running ``01_german_credit_experiment.py``,
+``02_adult_income_experiment.py`` and ``generate_latex_tables.py`` one after
+another. Stages form a DAG:
+
+    data:credit-g ──> teacher:german_credit ──> german_credit ──┐
+                                                                ├──> latex_tables
+    data:adult ─────> teacher:adult_income ───> adult_income ───┘
+
+The two case studies run concurrently in a process pool, and any stage whose
+outputs are newer than its inputs (script, ``econkd`` package, cached
+dataset) is skipped. The teacher stage fits the teacher into
+``cache/soft_targets``, the on-disk artifact the experiment stage reads it
+back from.
+
+The remaining steps of an experiment (preprocessing, baseline, students,
+bootstrap) stay inside its stage: they hand fitted in-memory objects to each
+other and each takes seconds, so splitting them would add a process start and
+a round trip to disk per step for no shorter critical path. The teacher is
+the step worth caching on its own.
+
+Usage:
+    python3 run_pipeline.py            # run what is out of date
+    python3 run_pipeline.py --force    # re-run everything
+    python3 run_pipeline.py --jobs 1   # sequential
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from econkd.case_studies import fit_teacher
+from econkd.datasets import DEFAULT_CACHE_DIR, CURRENT_FILE, load_openml_dataset
+from econkd.pipeline import Stage, python_stage, run_pipeline
+
+EXPERIMENTS_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = EXPERIMENTS_DIR / 'results'
+LOGS_DIR = EXPERIMENTS_DIR / 'logs'
+PACKAGE_DIR = EXPERIMENTS_DIR / 'econkd'
+
+# (stage name, script, OpenML dataset, version)
+EXPERIMENTS = [
+    ('german_credit', '01_german_credit_experiment.py', 'credit-g', 1),
+    ('adult_income', '02_adult_income_experiment.py', 'adult', 2),
+]
+
+
+def build_stages():
+    stages = []
+    for name, script, dataset, version in EXPERIMENTS:
+        pointer = DEFAULT_CACHE_DIR / f'{dataset}-v{version}' / CURRENT_FILE
+        stages.append(Stage(
+            name=f'data:{dataset}',
+            func=load_openml_dataset,
+            args=(dataset, version),
+            outputs=[pointer],
+        ))
+        marker = RESULTS_DIR / f'{name}_teacher.json'
+        stages.append(Stage(
+            name=f'teacher:{name}',
+            func=fit_teacher,
+            args=(name, marker),
+            deps=[f'data:{dataset}'],
+            inputs=[PACKAGE_DIR, pointer],
+            outputs=[marker],
+        ))
+        stages.append(python_stage(
+            name, EXPERIMENTS_DIR / script,
+            deps=[f'teacher:{name}'],
+            inputs=[EXPERIMENTS_DIR / script, PACKAGE_DIR, pointer, marker],
+            outputs=[RESULTS_DIR / f'{name}_results.json',
+                     RESULTS_DIR / f'{name}_models' / 'CURRENT',
+                     RESULTS_DIR / f'{name}_scorer.json'],
+            log=LOGS_DIR / f'{name}.log',
+        ))
+
+    stages.append(python_stage(
+        'latex_tables', EXPERIMENTS_DIR / 'generate_latex_tables.py',
+        deps=[name for name, *_ in EXPERIMENTS],
+        inputs=[EXPERIMENTS_DIR / 'generate_latex_tables.py']
+        + [RESULTS_DIR / f'{name}_results.json' for name, *_ in EXPERIMENTS],
+        outputs=[RESULTS_DIR / 'latex_tables.tex'],
+        log=LOGS_DIR / 'latex_generation.log',
+    ))
+    return stages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--force', action='store_true',
+                        help='re-run every stage, even if up to date')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='worker processes (default: one per stage)')
+    args = parser.parse_args(argv)
+
+    for directory in (RESULTS_DIR, LOGS_DIR, EXPERIMENTS_DIR / 'figures'):
+        directory.mkdir(parents=True, exist_ok=True)
+
+    print("="*80)
+    print("RUNNING ALL EXPERIMENTS - KNOWLEDGE DISTILLATION FOR ECONOMICS")
+    print("="*80)
+
+    def on_event(result):
+        icon = {'ran': '✅', 'skipped': '⏭️ ', 'failed': '❌', 'blocked': '⛔'}[result.status]
+        detail = f" ({result.seconds:.1f}s)" if result.status == 'ran' else ''
+        print(f"   {icon} {result.name}: {result.status}{detail}")
+        if result.error:
+            print(f"      {result.error}")
+
+    report = run_pipeline(build_stages(), max_workers=args.jobs,
+                          force=args.force, on_event=on_event)
+
+    print("\nStage timings:")
+    print(report.summary())
+    report.save(LOGS_DIR / 'pipeline_timings.json')
+    print(f"\nLogs: {LOGS_DIR}/  Results: {RESULTS_DIR}/")
+
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""Shared fixtures: a small synthetic credit dataset, preprocessed like German credit."""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from econkd.case_studies import german_credit  # noqa: E402
+from econkd.synthetic import SyntheticSpec, generate_frame  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def credit_frame():
+    """Raw synthetic credit rows (German credit columns) and 0/1 labels."""
+    X, labels, _ = generate_frame(SyntheticSpec('credit', n_rows=2000, random_state=1))
+    return X, (labels == 'bad').to_numpy().astype(int)
+
+
+@pytest.fixture(scope='session')
+def credit_design(credit_frame):
+    """``(preprocessor, X_scaled, y)`` with German credit's pipeline fitted."""
+    X, y = credit_frame
+    preprocessor = german_credit.build_preprocessor(X)
+    return preprocessor, preprocessor.fit_transform_frame(X), y
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(0)
@@ -0,0 +1,70 @@
+import json
+import shutil
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from econkd.artifacts import CURRENT_FILE, MANIFEST_FILE, load_models, save_models
+
+
+@pytest.fixture
+def models(credit_design):
+    preprocessor, X_scaled, y = credit_design
+    return {
+        'baseline': LogisticRegression(max_iter=1000).fit(X_scaled, y),
+        'weak_baseline': LogisticRegression(C=0.01, max_iter=1000).fit(X_scaled, y),
+        'preprocessor': preprocessor,
+    }
+
+
+def _versions(directory):
+    return sorted(p.name for p in directory.iterdir() if p.is_dir())
+
+
+def test_round_trip(models, tmp_path):
+    directory = save_models(models, tmp_path / 'models')
+    loaded = load_models(directory, verify=True)
+    assert loaded.loaded == []
+    np.testing.assert_array_equal(loaded['baseline'].coef_, models['baseline'].coef_)
+    assert loaded.loaded == ['baseline']
+
+
+def test_open_artifact_keeps_reading_its_version(models, tmp_path):
+    directory = tmp_path / 'models'
+    save_models(models, directory)
+    opened = load_models(directory)
+
+    swapped = {**models, 'baseline': models['weak_baseline']}
+    save_models(swapped, directory)
+    np.testing.assert_array_equal(opened['baseline'].coef_, models['baseline'].coef_)
+    np.testing.assert_array_equal(load_models(directory)['baseline'].coef_,
+                                  models['weak_baseline'].coef_)
+
+    # A third save keeps only the version it replaces
+    save_models(models, directory)
+    assert len(_versions(directory)) == 2
+    assert (directory / CURRENT_FILE).read_text() in _versions(directory)
+
+
+def test_saving_the_same_models_reuses_the_version(models, tmp_path):
+    directory = tmp_path / 'models'
+    save_models(models, directory)
+    first = _versions(directory)
+    save_models(models, directory)
+    assert _versions(directory) == first
+    assert not [p for p in directory.iterdir() if p.name.startswith('.')]
+
+
+def test_directories_without_pointer_still_load(models, tmp_path):
+    directory = tmp_path / 'models'
+    save_models(models, directory)
+    legacy = tmp_path / 'legacy'
+    shutil.copytree(directory / (directory / CURRENT_FILE).read_text(), legacy)
+    assert json.loads((legacy / MANIFEST_FILE).read_text())['components']
+    np.testing.assert_array_equal(load_models(legacy)['baseline'].coef_,
+                                  models['baseline'].coef_)
+
+    # Saving over it replaces the top-level files with a version directory
+    save_models(models, legacy)
+    assert sorted(p.name for p in legacy.iterdir()) == sorted(_versions(legacy) + [CURRENT_FILE])
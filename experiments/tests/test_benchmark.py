@@ -0,0 +1,13 @@
+import importlib
+import warnings
+
+from econkd import benchmark
+
+
+def test_benchmark_leaves_warning_filters_alone():
+    for module in benchmark.STAGE_IMPORTS:
+        importlib.import_module(module, 'econkd')
+    before = list(warnings.filters)
+    results = benchmark.benchmark_dataset('2e3x5', stages=('load', 'preprocess', 'student_fit'))
+    assert [r['stage'] for r in results] == ['load', 'preprocess', 'student_fit']
+    assert warnings.filters == before
@@ -0,0 +1,22 @@
+import numpy as np
+
+from econkd.bootstrap import _fit_batch, _fit_weighted_batch, shared_readonly_array
+
+PARAMS = {'max_iter': 1000, 'tol': 1e-10}
+
+
+def test_multinomial_weights_reproduce_row_resampling(credit_design):
+    _, X_scaled, y = credit_design
+    X = np.ascontiguousarray(X_scaled.to_numpy())
+    seeds = np.random.SeedSequence(7).spawn(3)
+    # The multinomial weights are the bincount of the same n uniform draws
+    indices = np.stack([np.random.default_rng(seed).integers(0, len(y), size=len(y))
+                        for seed in seeds])
+
+    coefs, intercepts = _fit_batch(X, y, indices, PARAMS, None, None)
+    with shared_readonly_array(X) as X_path:
+        weighted_coefs, weighted_intercepts = _fit_weighted_batch(
+            X_path, y, seeds, 'multinomial', PARAMS, None, None)
+
+    np.testing.assert_allclose(weighted_coefs, coefs, atol=1e-5)
+    np.testing.assert_allclose(weighted_intercepts, intercepts, atol=1e-5)
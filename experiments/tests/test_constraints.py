@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from econkd.constraints import ConstraintSet
+
+FEATURES = ['age', 'income', 'debt', 'education']
+CONSTRAINTS = {
+    'age': {'type': 'sign', 'sign': -1},
+    'income': {'type': 'monotonicity', 'direction': 'increasing'},
+    'debt': {'type': 'bounds', 'lower': 0.0, 'upper': 1.0},
+    'not_a_feature': {'type': 'sign', 'sign': +1},
+}
+
+
+@pytest.fixture
+def constraint_set():
+    return ConstraintSet.compile(CONSTRAINTS, FEATURES)
+
+
+def test_compile_skips_absent_features(constraint_set):
+    assert len(constraint_set) == 3
+    assert constraint_set.names == ['age', 'income', 'debt']
+
+
+@pytest.mark.parametrize('coef, n_satisfied', [
+    ([-1.0, 2.0, 0.5, 9.0], 3),
+    ([0.0, 0.0, 0.0, 0.0], 1),       # zero has no sign, only the bound holds
+    ([-1.0, 0.0, 0.0, 0.0], 2),
+    ([1.0, 2.0, 0.5, 0.0], 2),
+    ([1.0, -2.0, 0.5, 0.0], 1),
+    ([1.0, -2.0, 1.5, 0.0], 0),
+])
+def test_compliance_counts(constraint_set, coef, n_satisfied):
+    report = constraint_set.evaluate(np.array(coef))
+    assert report.satisfied.sum() == n_satisfied
+    assert report.rate == pytest.approx(100.0 * n_satisfied / 3)
+    assert len(report.violations) == 3 - n_satisfied
+
+
+def test_matrix_rates_match_row_by_row(constraint_set, rng):
+    coefs = rng.normal(size=(50, len(FEATURES)))
+    rates = constraint_set.compliance_rate(coefs)
+    assert rates.shape == (50,)
+    np.testing.assert_allclose(rates, [constraint_set.compliance_rate(c) for c in coefs])
+
+
+def test_unknown_type_is_rejected():
+    with pytest.raises(ValueError):
+        ConstraintSet.compile({'age': {'type': 'convex'}}, FEATURES)
+
+
+def test_empty_set_has_no_compliance_rate(rng):
+    empty = ConstraintSet.compile({}, FEATURES)
+    assert empty.compliance_rate(np.ones(len(FEATURES))) is None
+    assert empty.compliance_rate(rng.normal(size=(5, len(FEATURES)))) is None
+    assert empty.evaluate(np.ones(len(FEATURES))).rate is None
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from econkd.crossval import _metric_bounds, _single_threaded, t_interval
+from sklearn.ensemble import RandomForestClassifier
+
+
+def test_t_interval_is_clipped_to_bounds():
+    values = np.array([100.0, 100.0, 100.0, 80.0])
+    unclipped = t_interval(values)
+    clipped = t_interval(values, bounds=(0.0, 100.0))
+    assert unclipped['ci_upper'] > 100.0
+    assert clipped['ci_upper'] == 100.0
+    assert clipped['ci_lower'] == pytest.approx(unclipped['ci_lower'])
+    assert clipped['mean'] == unclipped['mean']
+
+
+@pytest.mark.parametrize('column, bounds', [
+    ('economic_kd_compliance', (0.0, 100.0)),
+    ('teacher_oof_auc', (0.0, 1.0)),
+    ('retention', (0.0, np.inf)),
+    ('student_time', None),
+])
+def test_metric_bounds(column, bounds):
+    assert _metric_bounds(column) == bounds
+
+
+def test_fold_teachers_are_single_threaded():
+    teacher = RandomForestClassifier(n_jobs=-1)
+    assert _single_threaded(teacher).n_jobs == 1
+    assert teacher.n_jobs == -1
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy.optimize import check_grad
+from scipy.special import expit
+
+from econkd.distiller import EconomicDistiller
+
+CONSTRAINTS = {
+    'x0': {'type': 'sign', 'sign': +1},
+    'x1': {'type': 'monotonicity', 'direction': 'decreasing'},
+    'x2': {'type': 'bounds', 'lower': -0.1, 'upper': 0.1},
+}
+
+
+@pytest.fixture
+def problem(rng):
+    X = rng.normal(size=(300, 4))
+    y = (rng.random(300) < expit(X @ [1.0, -0.5, 0.3, 0.0])).astype(float)
+    teacher_probs = expit(X @ [0.8, -0.4, 0.5, 0.1])
+    return X, y, teacher_probs
+
+
+@pytest.mark.parametrize('constraint_mode', ['bounds', 'penalty'])
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_loss_gradient_matches_finite_differences(problem, rng, constraint_mode, dtype):
+    X, y, teacher_probs = problem
+    student = EconomicDistiller(constraints=CONSTRAINTS, temperature=3.0, alpha=0.6,
+                                beta=2.0, gamma=0.3, C=0.5, constraint_mode=constraint_mode)
+    X, y, soft = student._prepare(X.astype(dtype), y, teacher_probs, reset=True)
+    signs, lower, upper, _, _ = student._constraint_state
+    args = (X, y, soft, signs, lower, upper, constraint_mode == 'penalty')
+
+    # Violate every constraint, so the penalty terms are active in 'penalty'
+    params = np.array([-0.5, 0.7, 0.4, 0.2, 0.1]) + 0.01 * rng.normal(size=5)
+    error = check_grad(lambda w: student._loss_and_grad(w, *args)[0],
+                       lambda w: student._loss_and_grad(w, *args)[1], params)
+    assert error < 1e-5
+
+
+def test_bounds_mode_satisfies_constraints(problem):
+    X, y, teacher_probs = problem
+    student = EconomicDistiller(constraints=CONSTRAINTS).fit(X, y, teacher_probs)
+    assert student.constraint_set_.compliance_rate(student.coef_[0]) == 100.0
+
+
+def test_coefficients_pinned_at_zero_are_violations(problem):
+    X, y, teacher_probs = problem
+    # The teacher's effect of x2 is positive, so bounds mode clamps it to 0
+    constraints = {**CONSTRAINTS, 'x2': {'type': 'sign', 'sign': -1}}
+    student = EconomicDistiller(constraints=constraints).fit(X, y, teacher_probs)
+    assert student.coef_[0, 2] == 0.0
+    report = student.constraint_set_.evaluate(student.coef_[0])
+    assert [v['feature'] for v in report.violations] == ['x2']
+    assert report.violations[0]['actual_sign'] == 0
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.special import expit
+
+from econkd.gam import GAMDistiller
+
+
+@pytest.fixture
+def nominal(rng):
+    n = 3000
+    code = rng.integers(0, 30, size=n)
+    effects = rng.normal(scale=0.8, size=30)
+    x = rng.normal(size=n)
+    y = (rng.random(n) < expit(effects[code] + x)).astype(int)
+    return pd.DataFrame({'code': code.astype(float), 'x': x}), y, expit(effects[code] + 0.8 * x)
+
+
+def test_categorical_features_get_levels_whatever_their_cardinality(nominal):
+    X, y, teacher_probs = nominal
+    assert GAMDistiller(max_iter=5).fit(X, y, teacher_probs).terms_[0].kind == 'spline'
+    gam = GAMDistiller(categorical_features=['code'], max_iter=5).fit(X, y, teacher_probs)
+    assert gam.terms_[0].kind == 'levels'
+    # Integer columns (compact codes) are categorical without being named
+    compact = X.astype({'code': np.int8})
+    assert GAMDistiller(max_iter=5).fit(compact, y, teacher_probs).terms_[0].kind == 'levels'
+
+
+def test_level_penalty_ignores_the_order_of_codes(nominal, rng):
+    X, y, teacher_probs = nominal
+    # Relabel the codes, keeping the reference level 0 in place
+    relabel = np.concatenate([[0], 1 + rng.permutation(29)])
+    shuffled = X.assign(code=relabel[X['code'].astype(int)].astype(float))
+
+    params = dict(categorical_features=['code'], lam=5.0)
+    gam = GAMDistiller(**params).fit(X, y, teacher_probs)
+    shuffled_gam = GAMDistiller(**params).fit(shuffled, y, teacher_probs)
+    np.testing.assert_allclose(shuffled_gam.predict_proba(shuffled), gam.predict_proba(X),
+                               atol=1e-6)
+
+
+def test_levels_are_found_from_nearby_values(nominal):
+    X, y, teacher_probs = nominal
+    gam = GAMDistiller(categorical_features=['code'], max_iter=5).fit(X, y, teacher_probs)
+    codes = X['code'].to_numpy()
+    np.testing.assert_array_equal(gam.term_effect(0, codes - 1e-8), gam.term_effect(0, codes))
+    np.testing.assert_array_equal(gam.term_effect(0, codes + 0.3), gam.term_effect(0, codes))
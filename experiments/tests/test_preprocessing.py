@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from econkd.case_studies import german_credit
+from econkd.preprocessing import as_design_matrix
+
+
+@pytest.mark.parametrize('dtype', ['float64', 'float32', 'compact'])
+def test_fit_transform_frame_matches_fit_then_transform(credit_frame, dtype):
+    X, _ = credit_frame
+    one_pass = german_credit.build_preprocessor(X).set_params(dtype=dtype)
+    two_pass = german_credit.build_preprocessor(X).set_params(dtype=dtype)
+    pd.testing.assert_frame_equal(one_pass.fit_transform_frame(X),
+                                  two_pass.fit(X).transform_frame(X))
+
+
+def test_compact_frame_keeps_codes_and_rounds_once(credit_frame):
+    X, _ = credit_frame
+    full = german_credit.build_preprocessor(X).fit(X)
+    compact = german_credit.build_preprocessor(X).set_params(dtype='compact').fit(X)
+    frame = compact.transform_frame(X)
+
+    assert list(frame.columns) == list(full.feature_names_out_)
+    for column, dtype in compact.code_dtypes().items():
+        assert frame[column].dtype == dtype
+    np.testing.assert_array_equal(as_design_matrix(frame),
+                                  full.transform(X).astype(np.float32))
+
+
+
+def test_design_matrix_sees_in_place_changes(credit_frame):
+    X, _ = credit_frame
+    frame = german_credit.build_preprocessor(X).set_params(dtype='compact').fit_transform_frame(X)
+    before = as_design_matrix(frame)
+    frame.iloc[0, 0] = 99.0
+    after = as_design_matrix(frame)
+    assert after is not before
+    assert after[0, 0] == 99.0 and before[0, 0] != 99.0
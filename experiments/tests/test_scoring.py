@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from econkd.case_studies import german_credit
+from econkd.distiller import EconomicDistiller
+from econkd.gam import GAMDistiller
+from econkd.scoring import CompiledScorer, compile_scorer
+
+
+@pytest.fixture(scope='module')
+def teacher_probs(credit_design):
+    _, X_scaled, y = credit_design
+    return LogisticRegression(C=0.1, max_iter=1000).fit(X_scaled, y).predict_proba(X_scaled)[:, 1]
+
+
+@pytest.mark.parametrize('make_student', [
+    lambda: LogisticRegression(max_iter=1000),
+    lambda: EconomicDistiller(constraints={'duration': {'type': 'sign', 'sign': +1}}),
+    lambda: GAMDistiller(n_splines=6),
+], ids=['logistic', 'economic', 'gam'])
+def test_compiled_scorer_matches_predict_proba(credit_frame, credit_design, teacher_probs,
+                                               make_student):
+    X, _ = credit_frame
+    preprocessor, X_scaled, y = credit_design
+    student = make_student()
+    if isinstance(student, LogisticRegression):
+        student.fit(X_scaled, y)
+    else:
+        student.fit(X_scaled, y, teacher_probs)
+    expected = student.predict_proba(X_scaled)[:, 1]
+
+    scorer = compile_scorer(student, preprocessor)
+    np.testing.assert_allclose(scorer.score(scorer.encode(X)), expected, atol=1e-10)
+    np.testing.assert_allclose(scorer.score(scorer.encode(X, dtype=np.float32)), expected,
+                               atol=1e-5)
+
+    record = X.iloc[0].to_dict()
+    assert scorer.score_record(record) == pytest.approx(expected[0], abs=1e-10)
+
+
+def test_scorer_round_trips_through_json(credit_frame, credit_design, tmp_path):
+    X, _ = credit_frame
+    preprocessor, X_scaled, y = credit_design
+    scorer = compile_scorer(LogisticRegression(max_iter=1000).fit(X_scaled, y), preprocessor)
+    scorer.save(tmp_path / 'scorer.json')
+    loaded = CompiledScorer.load(tmp_path / 'scorer.json')
+    R = scorer.encode(X)
+    np.testing.assert_array_equal(loaded.score(R), scorer.score(R))
+
+
+@pytest.mark.parametrize('scale', ['numerical', 'all'])
+def test_compiled_gam_matches_predict_proba_on_compact_frames(credit_frame, teacher_probs,
+                                                              scale):
+    # Levels learned from float32 codes must still be found by the float64
+    # codes compile_scorer and a float64 design pass in
+    X, y = credit_frame
+    preprocessor = german_credit.build_preprocessor(X).set_params(dtype='compact', scale=scale)
+    X_compact = preprocessor.fit_transform_frame(X)
+    gam = GAMDistiller(n_splines=6, max_iter=10).fit(X_compact, y, teacher_probs)
+    expected = gam.predict_proba(X_compact)[:, 1]
+
+    scorer = compile_scorer(gam, preprocessor)
+    np.testing.assert_allclose(scorer.score(scorer.encode(X)), expected, atol=1e-5)
+    X_float64 = preprocessor.set_params(dtype='float64').transform_frame(X)
+    np.testing.assert_allclose(gam.predict_proba(X_float64)[:, 1], expected, atol=1e-5)
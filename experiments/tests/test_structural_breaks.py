@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from scipy.special import expit
+from sklearn.linear_model import LogisticRegression
+
+from econkd import structural_breaks
+from econkd.distiller import EconomicDistiller
+from econkd.structural_breaks import _working_response, chow_scan
+
+
+def _wls_rss(X_tilde, h, z):
+    """Weighted least squares of z on X_tilde, fitted directly."""
+    root = np.sqrt(h)
+    coef = np.linalg.lstsq(X_tilde * root[:, None], z * root, rcond=None)[0]
+    return coef, float(np.sum(h * (z - X_tilde @ coef) ** 2))
+
+
+@pytest.fixture
+def drifting(rng):
+    n = 150
+    X = rng.normal(size=(n, 2))
+    coef = np.where(np.arange(n)[:, None] < 90, [1.0, -0.5], [-0.5, 0.5])
+    y = (rng.random(n) < expit(np.sum(X * coef, axis=1))).astype(float)
+    teacher_probs = expit(np.sum(X * coef, axis=1) * 0.8)
+    return X, y, teacher_probs
+
+
+@pytest.mark.parametrize('student', ['logistic', 'economic'])
+def test_chow_scan_matches_brute_force_segment_fits(drifting, student):
+    X, y, teacher_probs = drifting
+    if student == 'logistic':
+        model = LogisticRegression(C=1e6, max_iter=1000).fit(X, y)
+    else:
+        model = EconomicDistiller(temperature=2.0).fit(X, y, teacher_probs)
+    scan = chow_scan(model, X, y, teacher_probs, trim=0.2, n_simulations=0)
+
+    h, z = _working_response(model, X, y, teacher_probs)
+    X_tilde = np.column_stack([X, np.ones(len(X))])
+    n, k = X_tilde.shape
+    _, rss_pooled = _wls_rss(X_tilde, h, z)
+    for position, f_statistic, shift in zip(scan.position, scan.f_statistic, scan.shift):
+        first, second = slice(0, position), slice(position, n)
+        coef_1, rss_1 = _wls_rss(X_tilde[first], h[first], z[first])
+        coef_2, rss_2 = _wls_rss(X_tilde[second], h[second], z[second])
+        expected = ((rss_pooled - rss_1 - rss_2) / k) / ((rss_1 + rss_2) / (n - 2 * k))
+        assert f_statistic == pytest.approx(expected, rel=1e-8)
+        np.testing.assert_allclose(shift, (coef_2 - coef_1)[:2], atol=1e-8)
+
+    assert abs(scan.break_location - 90) <= 10
+
+
+def test_chow_scan_rejects_too_few_rows(rng):
+    X = rng.normal(size=(6, 2))
+    y = np.array([0, 1, 0, 1, 1, 0])
+    model = LogisticRegression().fit(X, y)
+    with pytest.raises(ValueError):
+        chow_scan(model, X, y, n_simulations=0)
+
+
+@pytest.mark.parametrize('chunk_size, prefix_block', [(7, 1 << 21), (4096, 50)])
+def test_chow_scan_does_not_depend_on_blocking(drifting, monkeypatch, chunk_size, prefix_block):
+    X, y, _ = drifting
+    model = LogisticRegression(C=1e6, max_iter=1000).fit(X, y)
+    expected = chow_scan(model, X, y, trim=0.2, n_simulations=0)
+    monkeypatch.setattr(structural_breaks, 'PREFIX_BLOCK', prefix_block)
+    scan = chow_scan(model, X, y, trim=0.2, step=3, chunk_size=chunk_size, n_simulations=0)
+    np.testing.assert_allclose(scan.f_statistic, expected.f_statistic[::3], rtol=1e-10)
+    np.testing.assert_allclose(scan.shift, expected.shift[::3], atol=1e-10)
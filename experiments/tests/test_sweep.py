@@ -0,0 +1,33 @@
+import pytest
+from scipy.special import expit
+
+from econkd.sweep import sweep_distiller
+
+SPACE = {'temperature': [1.0, 2.0, 4.0], 'alpha': [0.3, 0.5, 0.7]}
+
+
+@pytest.fixture
+def data(rng):
+    X = rng.normal(size=(400, 5))
+    y = (rng.random(400) < expit(X[:, 0] - X[:, 1])).astype(int)
+    teacher_probs = expit(0.8 * (X[:, 0] - X[:, 1]))
+    return X[:300], y[:300], teacher_probs[:300], {'val': (X[300:], y[300:])}
+
+
+def test_halving_warns_when_rungs_collapse(data):
+    X, y, teacher_probs, eval_sets = data
+    # 300 rows starting at 10 * p = 50 leave room for two of the three rungs
+    with pytest.warns(UserWarning, match='allow only 2'):
+        result = sweep_distiller(X, y, teacher_probs, eval_sets, space=SPACE,
+                                 search='halving', n_jobs=1, random_state=0)
+    assert result.resources == [50, 300]
+    assert len(result.final) == 3
+
+
+def test_halving_with_min_resources(data):
+    X, y, teacher_probs, eval_sets = data
+    result = sweep_distiller(X, y, teacher_probs, eval_sets, space=SPACE, search='halving',
+                             min_resources=30, n_jobs=1, random_state=0)
+    assert result.n_rungs == 3
+    assert result.resources == [30, 90, 300]
+    assert len(result.final) == 1
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+)
+
+from econkd.teacher_inference import SMALL_BATCH, compile_teacher, teacher_probabilities
+
+TEACHERS = {
+    'gbm': lambda: GradientBoostingClassifier(n_estimators=30, max_depth=3, subsample=0.8,
+                                              random_state=0),
+    'forest': lambda: RandomForestClassifier(n_estimators=20, max_depth=6, random_state=0),
+    'extra_trees': lambda: ExtraTreesClassifier(n_estimators=20, max_depth=6, random_state=0),
+}
+
+
+@pytest.fixture(scope='module', params=sorted(TEACHERS))
+def fitted(request, credit_design):
+    _, X_scaled, y = credit_design
+    return TEACHERS[request.param]().fit(X_scaled, y), X_scaled
+
+
+@pytest.mark.parametrize('backend', ['vectorized', 'native'])
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_compiled_teacher_matches_predict_proba(fitted, backend, n_jobs):
+    teacher, X_scaled = fitted
+    compiled = compile_teacher(teacher)
+    np.testing.assert_allclose(compiled.predict_proba(X_scaled, backend, n_jobs),
+                               teacher.predict_proba(X_scaled), atol=1e-12)
+
+
+def test_teacher_probabilities_small_and_large_batches(fitted):
+    teacher, X_scaled = fitted
+    expected = teacher.predict_proba(X_scaled)[:, 1]
+    for rows in (slice(0, SMALL_BATCH), slice(None)):
+        np.testing.assert_allclose(teacher_probabilities(teacher, X_scaled[rows], n_jobs=1),
+                                   expected[rows], atol=1e-12)
+
+
+def test_missing_values_are_rejected(fitted):
+    teacher, X_scaled = fitted
+    X = X_scaled.to_numpy().copy()[:10]
+    X[0, 0] = np.nan
+    with pytest.raises(ValueError):
+        compile_teacher(teacher).predict_proba(X, 'vectorized')
@@ -111,55 +111,20 @@ print_success "Directories ready"
 
 print_step "Step 3/5: Running Experiments"
 
-cd experiments
-
-# Check if experiment runner exists
-if [ ! -f "run_all_experiments.sh" ]; then
-    print_warning "Experiment runner script not found"
-    print_warning "Running experiments individually..."
-
-    # Run experiment 1
-    if [ -f "01_german_credit_experiment.py" ]; then
-        echo ""
-        echo "Running Experiment 1: German Credit Dataset..."
-        python3 01_german_credit_experiment.py 2>&1 | tee logs/german_credit_$(date +%Y%m%d_%H%M%S).log
-        print_success "German Credit experiment completed"
-    else
-        print_error "Experiment 1 not found!"
-    fi
-
-    # Run experiment 2
-    if [ -f "02_adult_income_experiment.py" ]; then
-        echo ""
-        echo "Running Experiment 2: Adult Income Dataset..."
-        python3 02_adult_income_experiment.py 2>&1 | tee logs/adult_income_$(date +%Y%m%d_%H%M%S).log
-        print_success "Adult Income experiment completed"
-    else
-        print_error "Experiment 2 not found!"
-    fi
+# German Credit and Adult Income run concurrently via the pipeline runner,
+# which also regenerates the LaTeX tables once both have finished
+if python3 experiments/run_pipeline.py; then
+    print_success "All experiments completed"
 else
-    # Run the main experiment script
-    echo "Running all experiments via run_all_experiments.sh..."
-    chmod +x run_all_experiments.sh
-    ./run_all_experiments.sh
+    print_error "Experiment pipeline failed (see experiments/logs/)"
+    exit 1
 fi
 
-cd "$PROJECT_ROOT"
-
-print_success "All experiments completed"
-
 ################################################################################
 # Step 4: Generate Paper Artifacts
 ################################################################################
 
-print_step "Step 4/5: Generating Paper Tables and Figures"
-
-if [ -f "experiments/generate_latex_tables.py" ]; then
-    python3 experiments/generate_latex_tables.py
-    print_success "LaTeX tables generated"
-else
-    print_warning "Table generation script not found (optional)"
-fi
+print_step "Step 4/5: Collecting Paper Tables and Figures"
 
 # Check for results
 if [ -d "experiments/results" ] && [ "$(ls -A experiments/results)" ]; then